@@ -0,0 +1,3 @@
+"""
+Benchmarks for python-gql, run with `python -m benchmarks`.
+"""
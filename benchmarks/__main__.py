@@ -0,0 +1,97 @@
+"""Run the benchmarks.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --compare baseline.json --threshold 1.2
+    python -m benchmarks --filter execute
+
+Results are written as JSON: `{"benchmarks": {name: {"min": ..., "median": ..., ...}}}`.
+When `--compare` is given, every benchmark slower than `threshold` times its baseline
+median is reported and the exit code is 1.
+"""
+import argparse
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+from typing import Any, Dict
+
+from . import suite  # noqa: F401 (registers the benchmarks)
+from .registry import benchmarks
+
+
+def run_benchmark(setup, rounds: int) -> Dict[str, Any]:
+    func = setup()
+    func()  # warm up
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'rounds': rounds,
+        'min': min(timings),
+        'max': max(timings),
+        'mean': statistics.mean(timings),
+        'median': statistics.median(timings),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    regressions = 0
+    print(f"\n{'benchmark':<50} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f'{name:<50} {"-":>12} {result["median"]:>12.6f} {"new":>8}')
+            continue
+        ratio = result['median'] / base['median'] if base['median'] else float('inf')
+        flag = ''
+        if ratio > threshold:
+            regressions += 1
+            flag = ' REGRESSION'
+        print(f'{name:<50} {base["median"]:>12.6f} {result["median"]:>12.6f} {ratio:>8.2f}{flag}')
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--output', '-o', help='write results to this JSON file')
+    parser.add_argument('--compare', '-c', help='compare against this saved JSON file')
+    parser.add_argument('--threshold', '-t', type=float, default=1.2)
+    parser.add_argument('--filter', '-f', help='only run benchmarks matching this regex')
+    parser.add_argument('--rounds', '-r', type=int, help='override the number of rounds')
+    args = parser.parse_args(argv)
+
+    pattern = re.compile(args.filter) if args.filter else None
+    results = {}
+    for name, (setup, rounds) in benchmarks.items():
+        if pattern and not pattern.search(name):
+            continue
+        result = run_benchmark(setup, args.rounds or rounds)
+        results[name] = result
+        print(f'{name:<50} median {result["median"]:.6f}s  min {result["min"]:.6f}s')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(
+                {
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'benchmarks': results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['benchmarks']
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
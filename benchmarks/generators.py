@@ -0,0 +1,205 @@
+"""Synthetic schemas, operations and values used by the benchmarks."""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+
+def wide_schema(fields: int = 1000) -> str:
+    """One `Query` type with a lot of scalar fields."""
+    lines = '\n'.join(f'    field{i}(arg: Int): String' for i in range(fields))
+    return f'type Query {{\n{lines}\n}}\n'
+
+
+def deep_schema(depth: int = 50) -> str:
+    """A chain of `depth` object types, each one pointing to the next."""
+    types = []
+    for i in range(depth):
+        child = f'    child: Level{i + 1}\n' if i + 1 < depth else ''
+        types.append(f'type Level{i} {{\n    id: ID!\n    name: String\n{child}}}')
+    types.append('type Query {\n    root: Level0\n}')
+    return '\n\n'.join(types) + '\n'
+
+
+def many_types_schema(types: int = 10000, fields: int = 5) -> str:
+    """A lot of small object types, all reachable from `Query`."""
+    chunks = []
+    for i in range(types):
+        body = '\n'.join(f'    field{j}: String' for j in range(fields))
+        chunks.append(f'type Type{i} {{\n    id: ID!\n{body}\n}}')
+    root = '\n'.join(f'    type{i}: Type{i}' for i in range(types))
+    chunks.append(f'type Query {{\n{root}\n}}')
+    return '\n\n'.join(chunks) + '\n'
+
+
+def federation_schema(entities: int = 1000) -> str:
+    """A lot of `@key` entities with custom directives to purge."""
+    chunks = ['directive @custom(value: String) on FIELD_DEFINITION | OBJECT']
+    for i in range(entities):
+        chunks.append(
+            f'type Entity{i} @key(fields: "id") {{\n'
+            f'    id: ID!\n'
+            f'    name: String @custom(value: "name{i}")\n'
+            f'    value: Int\n'
+            f'}}'
+        )
+    root = '\n'.join(f'    entity{i}(id: ID!): Entity{i}' for i in range(entities))
+    chunks.append(f'type Query {{\n{root}\n}}')
+    return '\n\n'.join(chunks) + '\n'
+
+
+def directive_schema(fields: int = 1000) -> str:
+    """A wide schema with a schema directive on every field."""
+    lines = '\n'.join(f'    field{i}: String @upper' for i in range(fields))
+    return f'directive @upper on FIELD_DEFINITION\n\ntype Query {{\n{lines}\n}}\n'
+
+
+list_schema = """
+enum Status { ACTIVE, INACTIVE }
+
+type Author {
+    id: ID!
+    name: String!
+}
+
+type Item {
+    id: ID!
+    name: String!
+    price: Float!
+    count: Int!
+    tags: [String!]!
+    status: Status!
+    author: Author!
+}
+
+input ItemInput {
+    name: String!
+    price: Float!
+    count: Int!
+    tags: [String!]!
+}
+
+type Query {
+    items: [Item!]!
+    numbers: [Int!]!
+    floats: [Float!]!
+}
+
+type Mutation {
+    createItems(items: [ItemInput!]!): Int!
+}
+"""
+
+
+def list_value(items: int = 10000) -> Dict[str, Any]:
+    return {
+        'items': [
+            {
+                'id': str(i),
+                'name': f'item{i}',
+                'price': i * 1.5,
+                'count': i,
+                'tags': ['a', 'b', 'c'],
+                'status': 'ACTIVE',
+                'author': {'id': str(i % 10), 'name': f'author{i % 10}'},
+            }
+            for i in range(items)
+        ],
+        'numbers': list(range(items)),
+        'floats': [i * 0.5 for i in range(items)],
+        'createItems': lambda info, items: len(items),
+    }
+
+
+list_query = """
+query Items {
+    items {
+        id
+        name
+        price
+        count
+        tags
+        status
+        author { id name }
+    }
+}
+"""
+
+scalar_list_query = """
+query Numbers {
+    numbers
+    floats
+}
+"""
+
+
+timestamp_schema = """
+scalar Timestamp
+
+type Query {
+    points: [Timestamp!]!
+}
+"""
+
+timestamp_query = '{ points }'
+
+
+def timestamp_value(points: int = 100000) -> Dict[str, Any]:
+    start = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    return {'points': [start + timedelta(seconds=i) for i in range(points)]}
+
+
+def deep_query(depth: int = 50) -> str:
+    query = 'id name'
+    for _ in range(depth - 1):
+        query = f'id name child {{ {query} }}'
+    return f'query Deep {{ root {{ {query} }} }}'
+
+
+def deep_value(depth: int = 50) -> Dict[str, Any]:
+    value: Dict[str, Any] = {'id': str(depth - 1), 'name': 'leaf'}
+    for i in reversed(range(depth - 1)):
+        value = {'id': str(i), 'name': f'level{i}', 'child': value}
+    return {'root': value}
+
+
+def fragments_query(fragments: int = 200) -> str:
+    """A query on `list_schema` spreading a lot of (nested) fragments."""
+    definitions = [
+        f'fragment item{i} on Item {{ id name ...item{i + 1} author {{ ...author }} }}'
+        for i in range(fragments - 1)
+    ]
+    definitions.append(f'fragment item{fragments - 1} on Item {{ price count tags }}')
+    definitions.append('fragment author on Author { id name }')
+    return 'query Fragments { items { ...item0 } }\n' + '\n'.join(definitions)
+
+
+create_items_query = """
+mutation CreateItems($items: [ItemInput!]!) {
+    createItems(items: $items)
+}
+"""
+
+
+def create_items_variables(items: int = 10000) -> Dict[str, Any]:
+    return {
+        'items': [
+            {'name': f'item{i}', 'price': i * 1.5, 'count': i, 'tags': ['a', 'b']}
+            for i in range(items)
+        ]
+    }
+
+
+def entity_representations(entities: int = 1000, count: int = 10000) -> List[Dict[str, Any]]:
+    return [
+        {'__typename': f'Entity{i % entities}', 'id': str(i), 'name': f'entity{i}'}
+        for i in range(count)
+    ]
+
+
+def file_operations(files: int = 1000):
+    operations = {
+        'query': 'mutation Upload($files: [Upload!]!) { upload(files: $files) }',
+        'variables': {'files': [None] * files},
+    }
+    files_map = {str(i): [f'variables.files.{i}'] for i in range(files)}
+    form = {str(i): object() for i in range(files)}
+    return operations, files_map, form
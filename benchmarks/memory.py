@@ -0,0 +1,195 @@
+"""Memory benchmarks, Linux only (they read /proc/<pid>/smaps_rollup).
+
+    python -m benchmarks.memory prefork --workers 4 --types 2000
+    python -m benchmarks.memory compact --types 10000
+    python -m benchmarks.memory encode --items 100000
+
+`prefork` reports the memory of each worker when workers build their own schema, share
+the schema of the parent, and share a frozen schema of the parent (`gql.prefork`). USS is
+the memory private to a worker, PSS adds its share of the pages shared with the others.
+
+`compact` reports the memory held by a schema built with and without `no_location` and
+`compact` (traced by `tracemalloc`). The RSS of the process stays at the peak of the build,
+the memory released by `compact` is reused by the next allocations.
+
+`encode` reports the peak memory of encoding a result at once, and in chunks, with every
+installed JSON codec (traced by `tracemalloc`).
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tracemalloc
+from typing import Callable, Dict, List
+
+import graphql
+
+from gql import make_schema
+from gql.prefork import fork_workers, wait_workers
+from . import generators as g
+
+
+def memory_usage(pid: str = 'self') -> Dict[str, int]:
+    """Return the Rss, Pss and Uss of a process, in kB."""
+    usage: Dict[str, int] = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                usage[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': usage['Rss'],
+        'pss': usage['Pss'],
+        'uss': usage['Private_Clean'] + usage['Private_Dirty'],
+    }
+
+
+def serve(schema: graphql.GraphQLSchema, query: str, requests: int) -> None:
+    for _ in range(requests):
+        result = graphql.graphql_sync(schema, query, root_value={})
+        assert not result.errors, result.errors
+    # a full collection, like the ones of a long running worker
+    gc.collect()
+
+
+def run_workers(workers: int, fork: Callable, target: Callable[[], None]) -> List[Dict]:
+    read_fd, write_fd = os.pipe()
+
+    def worker(index: int) -> None:
+        os.close(read_fd)
+        target()
+        os.write(write_fd, (json.dumps(memory_usage()) + '\n').encode())
+
+    pids = fork(workers, worker)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        results = [json.loads(line) for line in f]
+    codes = wait_workers(pids)
+    if any(codes.values()):
+        raise Exception(f'workers failed: {codes}')
+    return results
+
+
+def fork_unfrozen(workers: int, target: Callable[[int], None]) -> List[int]:
+    pids = []
+    for index in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                target(index)
+            finally:
+                os._exit(0)
+        pids.append(pid)
+    return pids
+
+
+def prefork(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    type_defs = g.many_types_schema(args.types)
+    query = '{ %s }' % ' '.join(f'type{i} {{ id }}' for i in range(0, args.types, 10))
+
+    def own() -> None:
+        serve(make_schema(type_defs), query, args.requests)
+
+    modes = {'own': run_workers(args.workers, fork_unfrozen, own)}
+
+    schema = make_schema(type_defs)
+    modes['shared'] = run_workers(
+        args.workers, fork_unfrozen, lambda: serve(schema, query, args.requests)
+    )
+    modes['shared+frozen'] = run_workers(
+        args.workers,
+        lambda workers, target: fork_workers(workers, target, [schema]),
+        lambda: serve(schema, query, args.requests),
+    )
+    gc.unfreeze()
+
+    report = {}
+    for mode, usages in modes.items():
+        report[mode] = {
+            key: statistics.mean(usage[key] for usage in usages) / 1024
+            for key in ('rss', 'pss', 'uss')
+        }
+        print(
+            f'{mode:<15} per worker: rss {report[mode]["rss"]:8.1f} MB'
+            f'  pss {report[mode]["pss"]:8.1f} MB  uss {report[mode]["uss"]:8.1f} MB'
+        )
+    return report
+
+
+def compact(args: argparse.Namespace) -> Dict[str, float]:
+    type_defs = g.many_types_schema(args.types)
+    modes = {
+        'default': {},
+        'no_location': {'no_location': True},
+        'compact': {'compact': True},
+        'no_location+compact': {'no_location': True, 'compact': True},
+    }
+
+    report = {}
+    for mode, kwargs in modes.items():
+        gc.collect()
+        tracemalloc.start()
+        schema = make_schema(type_defs, **kwargs)
+        gc.collect()
+        held, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del schema
+        report[mode] = held / 2 ** 20
+        print(f'{mode:<20} held: {report[mode]:8.1f} MB  peak: {peak / 2 ** 20:8.1f} MB')
+    return report
+
+
+def encode(args: argparse.Namespace) -> Dict[str, float]:
+    from gql import codec
+    from .suite import list_result
+
+    result = list_result(args.items)
+    current = codec.codec
+    report = {}
+    for name, factory in codec.codec_factories.items():
+        try:
+            codec.set_codec(factory())
+        except ImportError:
+            continue
+        modes = {
+            'encode_result': lambda: [codec.encode_result(result)],
+            'iter_encode_result': lambda: codec.iter_encode_result(result, args.chunk_size),
+        }
+        for mode, encode_chunks in modes.items():
+            gc.collect()
+            tracemalloc.start()
+            size = sum(len(chunk) for chunk in encode_chunks())
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            report[f'{name}-{mode}'] = peak / 2 ** 20
+            print(
+                f'{name:<8} {mode:<20} body: {size / 2 ** 20:6.1f} MB  peak: {peak / 2 ** 20:6.1f} MB'
+            )
+    codec.set_codec(current)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.memory')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    prefork_parser = subparsers.add_parser('prefork', help='memory of forked workers')
+    prefork_parser.add_argument('--workers', type=int, default=4)
+    prefork_parser.add_argument('--types', type=int, default=2000)
+    prefork_parser.add_argument('--requests', type=int, default=20)
+    prefork_parser.set_defaults(run=prefork)
+    compact_parser = subparsers.add_parser('compact', help='memory of compact schemas')
+    compact_parser.add_argument('--types', type=int, default=10000)
+    compact_parser.set_defaults(run=compact)
+    encode_parser = subparsers.add_parser('encode', help='memory of result encoding')
+    encode_parser.add_argument('--items', type=int, default=100000)
+    encode_parser.add_argument('--chunk-size', type=int, default=65536)
+    encode_parser.set_defaults(run=encode)
+    args = parser.parse_args(argv)
+    args.run(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,17 @@
+from typing import Callable, Dict, Tuple
+
+Setup = Callable[[], Callable[[], object]]
+
+benchmarks: Dict[str, Tuple[Setup, int]] = {}
+
+
+def benchmark(name: str, rounds: int = 5):
+    """Register a setup function, which returns the function to be timed."""
+
+    def wrap(setup: Setup) -> Setup:
+        if name in benchmarks:
+            raise Exception(f'benchmark {name} is already registered.')
+        benchmarks[name] = (setup, rounds)
+        return setup
+
+    return wrap
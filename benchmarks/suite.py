@@ -0,0 +1,348 @@
+import asyncio
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
+
+import graphql
+
+from gql import (
+    ExecutionContext,
+    Registry,
+    SchemaDirectiveVisitor,
+    make_schema,
+    make_schema_from_path,
+)
+from gql.codec import codec_factories
+from gql.federation import resolve_entities
+from gql.parser import parse_info
+from gql.schema_loader import cpu_count, find_schema_files, load_type_defs
+from gql.subscription import MemoryTransport, MessageType, SubscriptionServer
+from gql.tenant import derive_schema
+from gql.utils import place_files_in_operations
+from . import generators as g
+from .registry import benchmark
+
+# Schema build
+
+
+@benchmark('make_schema[wide-1000]')
+def make_schema_wide():
+    type_defs = g.wide_schema(1000)
+    return lambda: make_schema(type_defs)
+
+
+@benchmark('make_schema[deep-50]')
+def make_schema_deep():
+    type_defs = g.deep_schema(50)
+    return lambda: make_schema(type_defs)
+
+
+@benchmark('make_schema[types-10000]', rounds=3)
+def make_schema_many_types():
+    type_defs = g.many_types_schema(10000)
+    return lambda: make_schema(type_defs)
+
+
+@benchmark('make_schema[types-1000]')
+def make_schema_types_1000():
+    type_defs = g.many_types_schema(1000)
+    return lambda: make_schema(type_defs)
+
+
+@benchmark('derive_schema[types-1000]')
+def derive_schema_types_1000():
+    base = make_schema(g.many_types_schema(1000))
+    extension = 'extend type Type1 {\n    extra: String\n}\n\ntype TenantType {\n    id: ID!\n}'
+    return lambda: derive_schema(base, extension)
+
+
+@benchmark('make_schema[federation-1000]', rounds=3)
+def make_schema_federation():
+    type_defs = g.federation_schema(1000)
+    return lambda: make_schema(type_defs, federation=True)
+
+
+def write_schema_files(files: int, types_per_file: int) -> Path:
+    directory = Path(tempfile.mkdtemp(prefix='gql-benchmark-'))
+    for i in range(files):
+        chunks = [
+            f'type File{i}Type{j} {{\n    id: ID!\n    name: String\n}}'
+            for j in range(types_per_file)
+        ]
+        fields = '\n'.join(f'    file{i}Type{j}: File{i}Type{j}' for j in range(types_per_file))
+        chunks.append(f'extend type Query {{\n{fields}\n}}')
+        (directory / f'file{i}.graphql').write_text('\n\n'.join(chunks))
+    (directory / 'query.graphql').write_text('type Query {\n    version: String\n}')
+    return directory
+
+
+@benchmark('make_schema_from_path[files-120]', rounds=3)
+def make_schema_from_path_120():
+    directory = write_schema_files(120, 20)
+
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    return lambda: make_schema_from_path(str(directory))
+
+
+@benchmark('make_schema_from_path[files-120,cached]', rounds=3)
+def make_schema_from_path_120_cached():
+    directory = write_schema_files(120, 20)
+    cache_dir = directory / '.cache'
+    make_schema_from_path(str(directory), cache_dir=cache_dir)
+
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    return lambda: make_schema_from_path(str(directory), cache_dir=cache_dir)
+
+
+def load_schema_files(workers: int):
+    def setup():
+        directory = write_schema_files(480, 20)
+        files = find_schema_files(directory)
+
+        atexit.register(shutil.rmtree, directory, ignore_errors=True)
+        return lambda: load_type_defs(files, workers=workers)
+
+    return setup
+
+
+# Parsing scales with the workers, schema validation which follows does not.
+for workers in sorted({1, 2, cpu_count()}):
+    benchmark(f'load_type_defs[files-480,workers-{workers}]', rounds=3)(load_schema_files(workers))
+
+
+class UpperDirective(SchemaDirectiveVisitor):
+    def visit_field_definition(self, field, object_type):
+        resolve = field.resolve or graphql.default_field_resolver
+
+        def resolve_upper(obj, info, **kwargs):
+            result = resolve(obj, info, **kwargs)
+            return result.upper() if isinstance(result, str) else result
+
+        field.resolve = resolve_upper
+        return field
+
+
+@benchmark('visit_schema_directives[fields-1000]')
+def visit_schema_directives():
+    type_defs = g.directive_schema(1000)
+
+    def run():
+        schema = make_schema(type_defs)
+        SchemaDirectiveVisitor.visit_schema_directives(schema, {'upper': UpperDirective})
+
+    return run
+
+
+# Execution
+
+
+def executor(schema, query: str, root_value, variables=None, is_async: bool = False):
+    document = graphql.parse(query)
+    errors = graphql.validate(schema, document)
+    assert not errors, errors
+
+    def execute():
+        return graphql.execute(
+            schema,
+            document,
+            root_value=root_value,
+            context_value={},
+            variable_values=variables,
+            execution_context_class=ExecutionContext,
+        )
+
+    if not is_async:
+
+        def run():
+            result = execute()
+            assert not result.errors, result.errors
+
+        return run
+
+    loop = asyncio.new_event_loop()
+
+    async def execute_async():
+        result = execute()
+        if graphql.pyutils.is_awaitable(result):
+            result = await result
+        assert not result.errors, result.errors
+
+    return lambda: loop.run_until_complete(execute_async())
+
+
+def async_list_value(items: int):
+    value = g.list_value(items)
+    sync_items = value['items']
+
+    async def resolve_items(info):
+        return sync_items
+
+    value['items'] = resolve_items
+    return value
+
+
+for mode in ('sync', 'async'):
+    is_async = mode == 'async'
+
+    def list_setup(is_async=is_async):
+        schema = make_schema(g.list_schema)
+        value = async_list_value(10000) if is_async else g.list_value(10000)
+        return executor(schema, g.list_query, value, is_async=is_async)
+
+    def scalar_list_setup(is_async=is_async):
+        schema = make_schema(g.list_schema)
+        return executor(schema, g.scalar_list_query, g.list_value(100000), is_async=is_async)
+
+    def deep_setup(is_async=is_async):
+        schema = make_schema(g.deep_schema(50))
+        return executor(schema, g.deep_query(50), g.deep_value(50), is_async=is_async)
+
+    def fragments_setup(is_async=is_async):
+        schema = make_schema(g.list_schema)
+        value = async_list_value(1000) if is_async else g.list_value(1000)
+        return executor(schema, g.fragments_query(200), value, is_async=is_async)
+
+    def input_setup(is_async=is_async):
+        schema = make_schema(g.list_schema)
+        return executor(
+            schema,
+            g.create_items_query,
+            g.list_value(0),
+            g.create_items_variables(10000),
+            is_async=is_async,
+        )
+
+    def timestamp_setup(is_async=is_async):
+        schema = make_schema(g.timestamp_schema)
+        return executor(schema, g.timestamp_query, g.timestamp_value(100000), is_async=is_async)
+
+    benchmark(f'execute[{mode}-list-10000]')(list_setup)
+    benchmark(f'execute[{mode}-scalar-list-100000]')(scalar_list_setup)
+    benchmark(f'execute[{mode}-deep-50]')(deep_setup)
+    benchmark(f'execute[{mode}-fragments-200]')(fragments_setup)
+    benchmark(f'execute[{mode}-input-10000]')(input_setup)
+    benchmark(f'execute[{mode}-timestamps-100000]')(timestamp_setup)
+
+
+# Helpers
+
+
+def capture_info(schema, query: str) -> graphql.GraphQLResolveInfo:
+    infos = []
+
+    def resolve_items(info):
+        infos.append(info)
+        return []
+
+    result = graphql.graphql_sync(schema, query, root_value={'items': resolve_items})
+    assert not result.errors, result.errors
+    return infos[0]
+
+
+@benchmark('parse_info[fragments-200]', rounds=20)
+def parse_info_fragments():
+    info = capture_info(make_schema(g.list_schema), g.fragments_query(200))
+
+    def run():
+        # every request comes with a new context.
+        parse_info(info._replace(context={}), depth=3)
+
+    return run
+
+
+@benchmark('parse_info[simple]', rounds=20)
+def parse_info_simple():
+    info = capture_info(make_schema(g.list_schema), g.list_query)
+
+    def run():
+        for _ in range(1000):
+            parse_info(info._replace(context={}))
+
+    return run
+
+
+@benchmark('resolve_entities[10000]')
+def resolve_entities_10000():
+    schema = make_schema(g.federation_schema(1000), federation=True)
+    info = graphql.GraphQLResolveInfo(
+        '_entities', [], None, None, None, schema, {}, None, None, {}, {}, None
+    )
+    representations = g.entity_representations(1000, 10000)
+    return lambda: resolve_entities(None, info, representations=representations)
+
+
+@benchmark('place_files_in_operations[1000]')
+def place_files_in_operations_1000():
+    operations, files_map, form = g.file_operations(1000)
+    return lambda: place_files_in_operations(operations, files_map, form)
+
+
+# JSON codecs
+
+
+def list_result(items: int) -> graphql.ExecutionResult:
+    schema = make_schema(g.list_schema)
+    return graphql.execute(
+        schema,
+        graphql.parse(g.list_query),
+        root_value=g.list_value(items),
+        context_value={},
+        execution_context_class=ExecutionContext,
+    )
+
+
+for name, factory in codec_factories.items():
+
+    def encode_setup(factory=factory):
+        json_codec = factory()
+        result = list_result(10000)
+        return lambda: json_codec.encode(result.formatted)
+
+    def decode_setup(factory=factory):
+        json_codec = factory()
+        data = json_codec.encode(list_result(10000).formatted)
+        return lambda: json_codec.loads(data)
+
+    try:
+        factory()
+    except ImportError:
+        continue
+    benchmark(f'codec[{name}-encode-10000]', rounds=20)(encode_setup)
+    benchmark(f'codec[{name}-decode-10000]', rounds=20)(decode_setup)
+
+
+# Subscriptions
+
+
+@benchmark('subscription[connections-100-events-100]')
+def subscription_connections():
+    registry = Registry()
+
+    @registry.subscribe('count')
+    async def count(parent, info, to):
+        for i in range(to):
+            yield {'count': i}
+
+    type_defs = 'type Query { hello: String }\ntype Subscription { count(to: Int!): Int! }'
+    schema = make_schema(type_defs, registry=registry)
+    server = SubscriptionServer(schema, keep_alive=None)
+    loop = asyncio.new_event_loop()
+
+    async def client():
+        transport = MemoryTransport()
+        handler = asyncio.ensure_future(server.handle(transport.send, transport.receive))
+        await transport.client_send(MessageType.GQL_CONNECTION_INIT)
+        await transport.client_receive()
+        await transport.client_send(
+            MessageType.GQL_START, '1', {'query': 'subscription { count(to: 100) }'}
+        )
+        while (await transport.client_receive())['type'] != 'complete':
+            pass
+        await transport.close()
+        await handler
+
+    async def run():
+        await asyncio.gather(*(client() for _ in range(100)))
+
+    return lambda: loop.run_until_complete(run())
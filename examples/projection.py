@@ -0,0 +1,119 @@
+import sqlite3
+
+from graphql import graphql_sync
+
+from gql import gql, make_schema, query
+from gql.projection import Projection, Relation
+
+COLUMNS = 60
+ROWS = 5000
+
+type_defs = gql(
+    """
+type User {
+    id: ID!
+    name: String!
+}
+
+type Post {
+    id: ID!
+    title: String!
+    summary: String!
+    author: User!
+"""
+    + '\n'.join(f'    extra{i}: String' for i in range(COLUMNS))
+    + """
+}
+
+type Query {
+    posts: [Post!]!
+}
+"""
+)
+
+user_projection = Projection(columns=['id', 'name'], always=['id'])
+post_projection = Projection(
+    columns=['id', 'title'] + [f'extra{i}' for i in range(COLUMNS)],
+    # summary is computed from the body, which is not a GraphQL field.
+    computed={'summary': ['body']},
+    relations={'author': Relation('users', columns='author_id', projection=user_projection)},
+    always=['id'],
+)
+
+db = sqlite3.connect(':memory:')
+db.row_factory = sqlite3.Row
+extra_columns = ', '.join(f'extra{i} TEXT' for i in range(COLUMNS))
+db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+db.execute(
+    f'CREATE TABLE posts (id INTEGER PRIMARY KEY, title TEXT, body TEXT, author_id INTEGER,'
+    f' {extra_columns})'
+)
+db.executemany('INSERT INTO users VALUES (?, ?)', [(i, f'user{i}') for i in range(100)])
+db.executemany(
+    f'INSERT INTO posts VALUES (?, ?, ?, ?, {", ".join("?" * COLUMNS)})',
+    [
+        (i, f'title{i}', 'body ' * 50, i % 100, *(f'value {i} {j}' * 4 for j in range(COLUMNS)))
+        for i in range(ROWS)
+    ],
+)
+
+stats = {'bytes': 0}
+
+
+def fetch(sql: str):
+    rows = [dict(row) for row in db.execute(sql)]
+    stats['bytes'] += sum(len(str(value)) for row in rows for value in row.values())
+    return rows
+
+
+def to_post(row: dict) -> dict:
+    post = {key: value for key, value in row.items() if not key.startswith('author_')}
+    if 'body' in row:
+        post['summary'] = row['body'][:20]
+    post['author'] = {
+        key[len('author_') :]: value for key, value in row.items() if key.startswith('author_')
+    }
+    return post
+
+
+@query
+def posts(parent, info):
+    if not info.context.get('projection'):
+        sql = (
+            'SELECT posts.*, users.id AS author_id, users.name AS author_name'
+            ' FROM posts JOIN users ON users.id = posts.author_id'
+        )
+        return [to_post(row) for row in fetch(sql)]
+
+    result = post_projection.project(info)
+    columns = [f'posts.{column}' for column in result.columns]
+    sql = 'FROM posts'
+    if 'users' in result.joins:
+        columns.extend(
+            f'users.{column} AS author_{column}' for column in result.relations['author'].columns
+        )
+        sql += ' JOIN users ON users.id = posts.author_id'
+    return [to_post(row) for row in fetch(f"SELECT {', '.join(columns)} {sql}")]
+
+
+schema = make_schema(type_defs)
+
+q = """
+query {
+    posts {
+        id
+        title
+        summary
+        author {
+            name
+        }
+    }
+}
+"""
+
+if __name__ == '__main__':
+    for projection in (False, True):
+        stats['bytes'] = 0
+        result = graphql_sync(schema, q, context_value={'projection': projection})
+        assert not result.errors, result.errors
+        print(f"projection={projection}: fetched {stats['bytes']} bytes")
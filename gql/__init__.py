@@ -1,21 +1,66 @@
 """
 Python schema-first GraphQL library based on GraphQL-core.
 """
-from .enum import enum_type  # noqa
-from .execute import ExecutionContext  # noqa
-from .middleware import MiddlewareManager  # noqa
-from .parser import parse_info, FieldMeta, parse_node  # noqa
-from .resolver import (  # noqa
-    field_resolver,
-    mutate,
-    query,
-    reference_resolver,
-    subscribe,
-    type_resolver,
-)
-from .scalar import scalar_type  # noqa
-from .schema import make_schema, make_schema_from_file, make_schema_from_path  # noqa
-from .schema_visitor import SchemaDirectiveVisitor  # noqa
-from .utils import gql  # noqa
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
 
 __version__ = '0.3.0'
+
+# Public names and their modules, which are imported on first access (PEP 562).
+_lazy_names = {
+    'enum_type': '.enum',
+    'ExecutionContext': '.execute',
+    'ResolverMetrics': '.metrics',
+    'MiddlewareManager': '.middleware',
+    'parse_info': '.parser',
+    'FieldMeta': '.parser',
+    'parse_node': '.parser',
+    'Registry': '.registry',
+    'field_resolver': '.resolver',
+    'mutate': '.resolver',
+    'query': '.resolver',
+    'reference_resolver': '.resolver',
+    'subscribe': '.resolver',
+    'type_resolver': '.resolver',
+    'scalar_type': '.scalar',
+    'make_schema': '.schema',
+    'make_schema_from_file': '.schema',
+    'make_schema_from_path': '.schema',
+    'SchemaDirectiveVisitor': '.schema_visitor',
+    'gql': '.utils',
+}
+
+__all__ = list(_lazy_names)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .enum import enum_type  # noqa
+    from .execute import ExecutionContext  # noqa
+    from .metrics import ResolverMetrics  # noqa
+    from .middleware import MiddlewareManager  # noqa
+    from .parser import FieldMeta, parse_info, parse_node  # noqa
+    from .registry import Registry  # noqa
+    from .resolver import (  # noqa
+        field_resolver,
+        mutate,
+        query,
+        reference_resolver,
+        subscribe,
+        type_resolver,
+    )
+    from .scalar import scalar_type  # noqa
+    from .schema import make_schema, make_schema_from_file, make_schema_from_path  # noqa
+    from .schema_visitor import SchemaDirectiveVisitor  # noqa
+    from .utils import gql  # noqa
+
+
+def __getattr__(name: str) -> Any:
+    module = _lazy_names.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
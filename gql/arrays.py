@@ -0,0 +1,88 @@
+import sys
+from array import array
+from math import isfinite
+from typing import Any
+
+from graphql import GraphQLFloat, GraphQLInt, GraphQLScalarType
+from graphql.pyutils import Undefined
+from graphql.type.scalars import MAX_INT, MIN_INT
+
+# `array.array` type codes of integers and floats.
+INT_TYPECODES = 'bBhHiIlLqQ'
+FLOAT_TYPECODES = 'fd'
+
+
+def is_array(value: Any) -> bool:
+    """Return whether value is an `array.array`, a `memoryview` or a NumPy array."""
+    if isinstance(value, (array, memoryview)):
+        return True
+    # NumPy is an optional dependency, its arrays can only exist once it is imported.
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def complete_array(value: Any, leaf_type: GraphQLScalarType) -> Any:
+    """Return a one dimensional array of valid `Int` or `Float` values as is.
+
+    A `memoryview` is copied to an `array.array`. The values are checked without a list of
+    Python objects, with NumPy functions for NumPy arrays. Return `Undefined` when the value
+    is not such an array, or has values the type cannot represent (or masked values), which
+    are then completed one by one.
+    """
+    is_int = leaf_type.serialize is GraphQLInt.serialize
+    if not is_int and leaf_type.serialize is not GraphQLFloat.serialize:
+        return Undefined
+
+    if isinstance(value, memoryview):
+        typecode = value.format.lstrip('@')
+        if (
+            value.ndim != 1
+            or not value.c_contiguous
+            or len(typecode) != 1
+            or typecode not in INT_TYPECODES + FLOAT_TYPECODES
+        ):
+            return Undefined
+        buffer = array(typecode)
+        buffer.frombytes(value.cast('B'))
+        value = buffer
+
+    if isinstance(value, array):
+        if is_int and value.typecode in INT_TYPECODES:
+            # signed integers of at most 32 bits are always valid
+            if value.itemsize < 4 or (value.itemsize == 4 and value.typecode.islower()):
+                return value
+            if not value or (MIN_INT <= min(value) and max(value) <= MAX_INT):
+                return value
+        elif not is_int and value.typecode in FLOAT_TYPECODES:
+            if all(map(isfinite, value)):
+                return value
+        return Undefined
+
+    numpy = sys.modules.get('numpy')
+    if numpy is None or not isinstance(value, numpy.ndarray) or value.ndim != 1:
+        return Undefined
+    if isinstance(value, numpy.ma.MaskedArray):
+        if numpy.ma.getmaskarray(value).any():
+            return Undefined
+        value = numpy.ma.getdata(value)
+    kind = value.dtype.kind
+    if is_int and kind in 'iu':
+        if not value.size or (MIN_INT <= value.min() and value.max() <= MAX_INT):
+            return value
+    elif not is_int and kind == 'f':
+        if numpy.isfinite(value).all():
+            return value
+    return Undefined
+
+
+def json_default(value: Any) -> Any:
+    """`default` of `json.dumps` for results with arrays.
+
+        json.dumps(result.data, default=json_default)
+
+    With orjson, pass `option=orjson.OPT_SERIALIZE_NUMPY` too: NumPy arrays are then
+    encoded without Python objects.
+    """
+    if is_array(value):
+        return value.tolist()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
@@ -0,0 +1,198 @@
+import json
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Sequence, Tuple, Type, Union
+
+from graphql import ExecutionResult
+
+from .arrays import json_default
+
+
+class Codec(NamedTuple):
+    """A JSON codec: `dumps` returns a str, `encode` UTF-8 bytes, `loads` takes either.
+
+    Every codec writes compact JSON, without escaping non ASCII characters. orjson writes NaN
+    and infinities as null, the others as NaN and Infinity like the standard library.
+    """
+
+    name: str
+    dumps: Callable[[Any], str]
+    encode: Callable[[Any], bytes]
+    loads: Callable[[Union[str, bytes]], Any]
+
+
+def orjson_codec() -> Codec:
+    import orjson
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def encode(value: Any) -> bytes:
+        return orjson.dumps(value, default=json_default, option=option)
+
+    def dumps(value: Any) -> str:
+        return encode(value).decode()
+
+    return with_fallback(Codec('orjson', dumps, encode, orjson.loads), (TypeError, ValueError))
+
+
+def ujson_codec() -> Codec:
+    import ujson
+
+    def dumps(value: Any) -> str:
+        return ujson.dumps(
+            value, ensure_ascii=False, escape_forward_slashes=False, default=json_default
+        )
+
+    def encode(value: Any) -> bytes:
+        return dumps(value).encode()
+
+    return with_fallback(
+        Codec('ujson', dumps, encode, ujson.loads), (TypeError, ValueError, OverflowError)
+    )
+
+
+def json_codec() -> Codec:
+    # `json.dumps` with options builds an encoder at every call.
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=json_default).encode
+
+    def encode(value: Any) -> bytes:
+        return dumps(value).encode()
+
+    return Codec('json', dumps, encode, json.loads)
+
+
+def with_fallback(codec: Codec, errors: Tuple[Type[Exception], ...]) -> Codec:
+    """Return a codec which uses the standard library for the values `codec` rejects.
+
+    Like integers beyond 64 bits, or NaN and Infinity in the input.
+    """
+    fallback = json_codec()
+
+    def fall_back(function: Callable[[Any], Any], fallback_function: Callable[[Any], Any]):
+        def call(value: Any) -> Any:
+            try:
+                return function(value)
+            except errors:
+                return fallback_function(value)
+
+        return call
+
+    return Codec(
+        codec.name,
+        fall_back(codec.dumps, fallback.dumps),
+        fall_back(codec.encode, fallback.encode),
+        fall_back(codec.loads, fallback.loads),
+    )
+
+
+# Codec factories by name, which raise ImportError when the library is not installed.
+codec_factories: Dict[str, Callable[[], Codec]] = {
+    'orjson': orjson_codec,
+    'ujson': ujson_codec,
+    'json': json_codec,
+}
+
+
+def load_codec(names: Sequence[str] = ('orjson', 'ujson', 'json')) -> Codec:
+    """Return the codec of the first installed library of `names`."""
+    for name in names:
+        try:
+            return codec_factories[name]()
+        except ImportError:
+            continue
+    raise Exception(f'None of the JSON libraries {", ".join(names)} is installed.')
+
+
+# The codec of `JSONString`, subscription messages and `encode_result`.
+codec = load_codec()
+
+
+def set_codec(value: Union[str, Codec]) -> Codec:
+    """Use a codec, or the codec of a library by name, like `set_codec('json')`."""
+    global codec
+    codec = codec_factories[value]() if isinstance(value, str) else value
+    return codec
+
+
+def dumps(value: Any) -> str:
+    return codec.dumps(value)
+
+
+def encode(value: Any) -> bytes:
+    return codec.encode(value)
+
+
+def loads(value: Union[str, bytes]) -> Any:
+    return codec.loads(value)
+
+
+def encode_result(result: ExecutionResult) -> bytes:
+    """Encode an execution result to the body of a GraphQL response."""
+    return codec.encode(result.formatted)
+
+
+def iter_pieces(value: Any, chunk_size: int) -> Iterator[bytes]:
+    """Encode a value in pieces: objects key by key, arrays by slices of about `chunk_size`.
+
+    The slice length adapts to the size of the encoded items. An array whose items are each
+    larger than `chunk_size` is encoded item by item, walking into the items.
+    """
+    encode = codec.encode
+    if isinstance(value, dict):
+        if not value:
+            yield b'{}'
+            return
+        separator = b'{'
+        for key, item in value.items():
+            yield separator + encode(key if isinstance(key, str) else str(key)) + b':'
+            yield from iter_pieces(item, chunk_size)
+            separator = b','
+        yield b'}'
+    elif isinstance(value, (list, tuple)):
+        if not value:
+            yield b'[]'
+            return
+        yield b'['
+        index, count, walk = 0, 1, False
+        while index < len(value):
+            if index:
+                yield b','
+            if walk:
+                yield from iter_pieces(value[index], chunk_size)
+                index += 1
+                continue
+            # the brackets of the encoded slice are stripped
+            encoded = encode(value[index : index + count])[1:-1]
+            yield encoded
+            index += count
+            if count == 1 and len(encoded) > chunk_size:
+                walk = True
+            else:
+                count = max(1, min(count * 8, count * chunk_size // (len(encoded) or 1)))
+        yield b']'
+    else:
+        yield encode(value)
+
+
+def iter_encode(value: Any, chunk_size: int = 65536) -> Iterator[bytes]:
+    """Encode a value to chunks of about `chunk_size` bytes."""
+    chunk = []
+    size = 0
+    for piece in iter_pieces(value, chunk_size):
+        chunk.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield b''.join(chunk)
+            chunk.clear()
+            size = 0
+    if chunk:
+        yield b''.join(chunk)
+
+
+def iter_encode_result(result: ExecutionResult, chunk_size: int = 65536) -> Iterator[bytes]:
+    """Encode an execution result to chunks of a GraphQL response body.
+
+        return StreamingResponse(iter_encode_result(result), media_type='application/json')
+
+    The memory used is about `chunk_size` plus the largest value of the result, instead of
+    the size of the whole body.
+    """
+    return iter_encode(result.formatted, chunk_size)
@@ -0,0 +1,96 @@
+from typing import Any, Iterable, List, Optional, Tuple
+
+from graphql import (
+    DirectiveNode,
+    GraphQLSchema,
+    Node,
+    is_enum_type,
+    is_input_object_type,
+    is_interface_type,
+    is_object_type,
+    is_union_type,
+)
+from graphql.pyutils import FrozenList
+
+# Key of the directives of a schema element in its `extensions`, once its AST is released.
+DIRECTIVES_EXTENSION = 'directives'
+
+
+def copy_node(node: Any) -> Any:
+    """Copy an AST node without its location, which links all the tokens of the source."""
+    if isinstance(node, list):
+        return FrozenList(copy_node(item) for item in node)
+    if not isinstance(node, Node):
+        return node
+    return type(node)(**{key: copy_node(getattr(node, key)) for key in node.keys if key != 'loc'})
+
+
+def ast_directives(element: Any) -> List[DirectiveNode]:
+    directives: List[DirectiveNode] = []
+    for ast_node in getattr(element, 'extension_ast_nodes', None) or ():
+        directives.extend(ast_node.directives or ())
+    ast_node = getattr(element, 'ast_node', None)
+    if ast_node is not None and getattr(ast_node, 'directives', None):
+        directives.extend(ast_node.directives)
+    return directives
+
+
+def get_directives(element: Any) -> Tuple[DirectiveNode, ...]:
+    """Return the directive nodes of a schema element, compacted or not."""
+    directives = ast_directives(element)
+    if directives:
+        return tuple(directives)
+    return (element.extensions or {}).get(DIRECTIVES_EXTENSION, ())
+
+
+def iter_elements(schema: GraphQLSchema) -> Iterable[Any]:
+    yield schema
+    yield from schema.directives
+    for name, type_ in schema.type_map.items():
+        if name.startswith('__'):
+            continue
+        yield type_
+        if is_object_type(type_) or is_interface_type(type_):
+            for field in type_.fields.values():
+                yield field
+                yield from field.args.values()
+        elif is_input_object_type(type_):
+            yield from type_.fields.values()
+        elif is_enum_type(type_):
+            yield from type_.values.values()
+
+
+def resolve_thunks(schema: GraphQLSchema) -> None:
+    """Replace the field, interface and member thunks of the types by their values.
+
+    The thunks of a built schema are closures over the type definition nodes.
+    """
+    for type_ in schema.type_map.values():
+        if is_object_type(type_) or is_interface_type(type_):
+            type_._fields = type_.fields
+            type_._interfaces = type_.interfaces
+        elif is_input_object_type(type_):
+            type_._fields = type_.fields
+        elif is_union_type(type_):
+            type_._types = type_.types
+
+
+def compact_schema(schema: GraphQLSchema) -> GraphQLSchema:
+    """Release the SDL AST of a built schema.
+
+    The directives of every element are kept, without locations, in its `extensions`,
+    where `gather_directives` and `SchemaDirectiveVisitor` find them.
+    """
+    resolve_thunks(schema)
+    for element in iter_elements(schema):
+        directives = ast_directives(element)
+        if directives:
+            extensions: Optional[dict] = element.extensions
+            element.extensions = {
+                **(extensions or {}),
+                DIRECTIVES_EXTENSION: tuple(copy_node(node) for node in directives),
+            }
+        element.ast_node = None
+        if hasattr(element, 'extension_ast_nodes'):
+            element.extension_ast_nodes = None
+    return schema
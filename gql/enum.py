@@ -1,38 +1,121 @@
 from enum import Enum
 from inspect import isclass
-from typing import Dict, Type
+from typing import Any, Dict, Optional, Type
 
-from graphql import GraphQLEnumValue, GraphQLSchema, assert_enum_type, is_enum_type
+from graphql import (
+    GraphQLEnumType,
+    GraphQLEnumValue,
+    GraphQLInputType,
+    GraphQLSchema,
+    get_nullable_type,
+    is_enum_type,
+    is_input_object_type,
+    is_interface_type,
+    is_list_type,
+    is_object_type,
+)
+from graphql.pyutils import Undefined
 
 EnumTypeMap = Dict[str, Type[Enum]]
 
 enum_type_map: EnumTypeMap = {}
 
 
-def enum_type(_cls):
+def enum_type(_cls, *, type_map: EnumTypeMap = None):
+    if type_map is None:
+        type_map = enum_type_map
+
     # if _cls is a class, use _cls name.
     if isclass(_cls):
-        enum_type_map[_cls.__name__] = _cls
+        type_map[_cls.__name__] = _cls
         return _cls
 
     # if not, _cls is type name.
     def wrap(cls):
         if isinstance(cls, Enum):
             raise Exception('enum_resolver must resolve a Enum class.')
-        enum_type_map[_cls] = cls
+        type_map[_cls] = cls
         return cls
 
     return wrap
 
 
-def register_enums(schema: GraphQLSchema):
+def enum_value(type_: GraphQLEnumType, name: str, value: Any) -> GraphQLEnumValue:
+    """Return the value `name` of the type with `value`, keeping its description."""
+    old = type_.values.get(name)
+    if old is None:
+        return GraphQLEnumValue(value)
+    return GraphQLEnumValue(**{**old.to_kwargs(), 'value': value})
+
+
+def set_enum_values(type_: GraphQLEnumType, _enum_type: Optional[Type[Enum]]):
+    """Set the values of the type to the members of `_enum_type`, or to their names.
+
+    Arguments are parsed to the members. The serialize table maps the members and their
+    values to the names, so resolvers can return either.
+    """
+    if not _enum_type:
+        type_.values = {name: enum_value(type_, name, name) for name in type_.values}
+    else:
+        type_.values = {
+            member.name: enum_value(type_, member.name, member) for member in _enum_type
+        }
+
+    lookup: Dict[Any, str] = {}
+    for name, value in type_.values.items():
+        keys = [value.value]
+        if isinstance(value.value, Enum):
+            keys.append(value.value.value)
+        for key in keys:
+            try:
+                lookup.setdefault(key, name)
+            except TypeError:  # unhashable, found by `serialize` with a scan of the values
+                pass
+    # the cached table `GraphQLEnumType.serialize` reads
+    type_._value_lookup = lookup
+
+
+def default_value(value: Any, type_: GraphQLInputType) -> Any:
+    """Return a default value with the names of enum values replaced by the values."""
+    type_ = get_nullable_type(type_)
+    if is_list_type(type_):
+        if isinstance(value, list):
+            return [default_value(item, type_.of_type) for item in value]
+        return default_value(value, type_.of_type)
+    if is_enum_type(type_):
+        if isinstance(value, str) and value in type_.values:
+            return type_.values[value].value
+        return value
+    if is_input_object_type(type_) and isinstance(value, dict):
+        fields = {field.out_name or name: field for name, field in type_.fields.items()}
+        return {
+            key: default_value(item, fields[key].type) if key in fields else item
+            for key, item in value.items()
+        }
+    return value
+
+
+def set_default_values(schema: GraphQLSchema):
+    """Set the enum values of the default values of arguments and input fields.
+
+    The schema parsed them to the names, before the values of the enums were set.
+    """
     for type_name, type_ in schema.type_map.items():
-        if not is_enum_type(type_) or type_name.startswith('__'):
+        if type_name.startswith('__'):
             continue
-
-        type_ = assert_enum_type(type_)
-        _enum_type = enum_type_map.get(type_name)
-        if not _enum_type:
-            type_.values = {value: GraphQLEnumValue(value) for value in type_.values}
+        if is_object_type(type_) or is_interface_type(type_):
+            inputs = [arg for field in type_.fields.values() for arg in field.args.values()]
+        elif is_input_object_type(type_):
+            inputs = list(type_.fields.values())
         else:
-            type_.values = {value.name: GraphQLEnumValue(value.value) for value in _enum_type}
+            continue
+        for input_ in inputs:
+            if input_.default_value not in (None, Undefined):
+                input_.default_value = default_value(input_.default_value, input_.type)
+
+
+def register_enums(schema: GraphQLSchema):
+    """Set the values of the enums of the schema, to the members of the registered Enums."""
+    from .registry import default_registry
+
+    default_registry.register(schema, kinds=('enums',))
@@ -1,18 +1,148 @@
-from typing import Any, Callable, Dict, List, Optional, Union
+from copy import copy
+from math import isfinite
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 import graphql
-from graphql import located_error
-from graphql.execution.execute import get_field_def
-from graphql.execution.values import get_argument_values, get_variable_values
+from graphql import (
+    GraphQLBoolean,
+    GraphQLError,
+    GraphQLFloat,
+    GraphQLID,
+    GraphQLInt,
+    GraphQLString,
+    is_enum_type,
+    is_leaf_type,
+    is_list_type,
+    is_non_null_type,
+    is_scalar_type,
+    located_error,
+    type_from_ast,
+)
+from graphql.execution.execute import (
+    assert_valid_execution_arguments,
+    get_field_def,
+    get_field_entry_key,
+)
+from graphql.execution.values import get_argument_values, get_directive_values, get_variable_values
+from graphql.type.scalars import MAX_INT, MIN_INT
 
 from graphql.pyutils import AwaitableOrValue, FrozenList, Path, Undefined, inspect
 
+from .arrays import complete_array, is_array
+from .incremental import (
+    CollectedFields,
+    DeferredFragment,
+    IncrementalDeferResult,
+    IncrementalExecutionResults,
+    IncrementalPublisher,
+    IncrementalStreamResult,
+    InitialIncrementalExecutionResult,
+)
+from .lookahead import get_prefetched
 from .middleware import MiddlewareManager
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .profiling import OperationProfiler
+
+
+def default_field_resolver(source: Any, info: graphql.GraphQLResolveInfo, **args: Any) -> Any:
+    """`graphql.default_field_resolver`, which returns the values prefetched by `Lookahead`."""
+    prefetched = get_prefetched(source, info)
+    if prefetched is not Undefined:
+        return prefetched
+    return graphql.default_field_resolver(source, info, **args)
+
+
+def all_int32(values: Sequence[int]) -> bool:
+    return MIN_INT <= min(values) and max(values) <= MAX_INT
+
+
+def all_finite(values: Sequence[float]) -> bool:
+    return all(map(isfinite, values))
+
+
+# The serializers of the built-in scalars, with the type of the values they return unchanged
+# and a check of a list of values of this type.
+builtin_serializers: Dict[Callable, Tuple[type, Optional[Callable[[Sequence[Any]], bool]]]] = {
+    GraphQLInt.serialize: (int, all_int32),
+    GraphQLFloat.serialize: (float, all_finite),
+    GraphQLString.serialize: (str, None),
+    GraphQLID.serialize: (str, None),
+    GraphQLBoolean.serialize: (bool, None),
+}
+
+
+def get_list_hook(type_: Any, name: str) -> Optional[Callable[[List[Any]], List[Any]]]:
+    """Return the batch hook `name` of the scalar items of a list type, if it has one."""
+    if is_non_null_type(type_):
+        type_ = type_.of_type
+    if not is_list_type(type_):
+        return None
+    item_type = type_.of_type
+    if is_non_null_type(item_type):
+        item_type = item_type.of_type
+    return getattr(item_type, name, None) if is_scalar_type(item_type) else None
+
+
+def coerce_list_variables(
+    schema: graphql.GraphQLSchema,
+    definitions: List[graphql.VariableDefinitionNode],
+    inputs: Dict[str, Any],
+) -> Tuple[List[graphql.VariableDefinitionNode], Dict[str, Any]]:
+    """Coerce the list variables of scalars with a `parse_many` hook, one call per list.
+
+    Return the other definitions, for `get_variable_values`, and the coerced values. When
+    `parse_many` raises, the variable is left to `get_variable_values`, which reports errors.
+    """
+    remaining = []
+    coerced = {}
+    for definition in definitions:
+        name = definition.variable.name.value
+        value = inputs.get(name)
+        if isinstance(value, list):
+            parse_many = get_list_hook(type_from_ast(schema, definition.type), 'parse_many')
+            if parse_many is not None:
+                try:
+                    coerced[name] = parse_many(value)
+                    continue
+                except Exception:
+                    pass
+        remaining.append(definition)
+    return remaining, coerced
+
 
 class ExecutionContext(graphql.ExecutionContext):
     # custom Middleware Manager
     middleware_manager: MiddlewareManager
+    # opt-in sampled profiling, see `with_profiler`
+    profiler: Optional['OperationProfiler'] = None
+    # deferred fragments and streamed items, set by `execute_incremental`
+    incremental: Optional[IncrementalPublisher] = None
+
+    @classmethod
+    def with_profiler(cls, profiler: 'OperationProfiler') -> Type["ExecutionContext"]:
+        """Return a subclass which profiles executions sampled by the given profiler."""
+        return cast(
+            Type["ExecutionContext"],
+            type(f'Profiling{cls.__name__}', (cls,), {'profiler': profiler}),
+        )
 
     @classmethod
     def build(
@@ -73,15 +203,17 @@ class ExecutionContext(graphql.ExecutionContext):
                 return [graphql.GraphQLError(f"Unknown operation named '{operation_name}'.")]
             return [graphql.GraphQLError("Must provide an operation.")]
 
+        raw_variable_values = raw_variable_values or {}
+        variable_definitions, coerced_lists = coerce_list_variables(
+            schema, operation.variable_definitions or FrozenList(), raw_variable_values
+        )
         coerced_variable_values = get_variable_values(
-            schema,
-            operation.variable_definitions or FrozenList(),
-            raw_variable_values or {},
-            max_errors=50,
+            schema, FrozenList(variable_definitions), raw_variable_values, max_errors=50
         )
 
         if isinstance(coerced_variable_values, list):
             return coerced_variable_values  # errors
+        coerced_variable_values.update(coerced_lists)
 
         return cls(
             schema,
@@ -90,13 +222,39 @@ class ExecutionContext(graphql.ExecutionContext):
             context_value,
             operation,
             coerced_variable_values,  # coerced values
-            field_resolver or graphql.default_field_resolver,
+            field_resolver or default_field_resolver,
             type_resolver or graphql.default_type_resolver,
             [],
             middleware_manager,
             is_awaitable,
         )
 
+    def execute_operation(
+        self, operation: graphql.OperationDefinitionNode, root_value: Any
+    ) -> Optional[AwaitableOrValue[Any]]:
+        session = self.profiler.start(operation) if self.profiler else None
+        if session is None:
+            return super().execute_operation(operation, root_value)
+
+        try:
+            result = super().execute_operation(operation, root_value)
+        except Exception:
+            session.stop()
+            raise
+
+        if self.is_awaitable(result):
+
+            async def await_result() -> Any:
+                try:
+                    return await result
+                finally:
+                    session.stop()
+
+            return await_result()
+
+        session.stop()
+        return result
+
     def resolve_field(
         self,
         parent_type: graphql.GraphQLObjectType,
@@ -174,3 +332,403 @@ class ExecutionContext(graphql.ExecutionContext):
             error = located_error(raw_error, field_nodes, path.as_list())
             self.handle_field_error(error, return_type)
             return None
+
+    def complete_list_value(
+        self,
+        return_type: graphql.GraphQLList[graphql.GraphQLOutputType],
+        field_nodes: List[graphql.FieldNode],
+        info: graphql.GraphQLResolveInfo,
+        path: Path,
+        result: Iterable[Any],
+    ) -> AwaitableOrValue[List[Any]]:
+        """Complete a list value, the items after `initialCount` later with `@stream`."""
+        incremental = self.incremental
+        if (
+            incremental is not None
+            and incremental.stream_directive is not None
+            and field_nodes[0].directives
+        ):
+            stream = get_directive_values(
+                incremental.stream_directive, field_nodes[0], self.variable_values
+            )
+            if stream and stream['if']:
+                return self.complete_stream_list(
+                    return_type, field_nodes, info, path, result, stream
+                )
+        return self.complete_list_items(return_type, field_nodes, info, path, result)
+
+    def complete_list_items(
+        self,
+        return_type: graphql.GraphQLList[graphql.GraphQLOutputType],
+        field_nodes: List[graphql.FieldNode],
+        info: graphql.GraphQLResolveInfo,
+        path: Path,
+        result: Iterable[Any],
+    ) -> AwaitableOrValue[List[Any]]:
+        """Complete a list of leaf values without calling `complete_value` for every item.
+
+        Arrays of valid `Int` or `Float` values (`array.array`, `memoryview` or NumPy) are
+        returned as is, see `complete_array`. Lists of scalars with a `serialize_many` hook
+        are serialized in one call, lists of built-in scalars and enums by
+        `complete_leaf_list`. `serialize_many` raises for values it cannot serialize, nulls
+        and awaitables among them, the list is then completed item by item, which locates the
+        errors.
+        """
+        item_type = return_type.of_type
+        leaf_type = item_type.of_type if is_non_null_type(item_type) else item_type
+        if (
+            not is_leaf_type(leaf_type)
+            or not isinstance(result, Iterable)
+            or isinstance(result, str)
+        ):
+            return super().complete_list_value(return_type, field_nodes, info, path, result)
+
+        if is_array(result):
+            completed = complete_array(result, leaf_type)
+            if completed is not Undefined:
+                return completed
+            result = result.tolist()  # type: ignore
+
+        items = result if isinstance(result, (list, tuple)) else list(result)
+        serialize_many = getattr(leaf_type, 'serialize_many', None)
+        if serialize_many is not None:
+            try:
+                return serialize_many(items)
+            except Exception:
+                pass
+        elif is_enum_type(leaf_type) or leaf_type.serialize in builtin_serializers:
+            return self.complete_leaf_list(return_type, field_nodes, info, path, items)
+        return super().complete_list_value(return_type, field_nodes, info, path, items)
+
+    def complete_leaf_list(
+        self,
+        return_type: graphql.GraphQLList[graphql.GraphQLOutputType],
+        field_nodes: List[graphql.FieldNode],
+        info: graphql.GraphQLResolveInfo,
+        path: Path,
+        items: Sequence[Any],
+    ) -> AwaitableOrValue[List[Any]]:
+        """Complete a list of built-in scalars or enums in one loop.
+
+        A list whose items all have the type the scalar returns unchanged is copied as is.
+        Only the items the serializer rejects go through `complete_value`, and a list with
+        awaitable items goes through the generic path.
+        """
+        item_type = return_type.of_type
+        nullable = not is_non_null_type(item_type)
+        serialize = (item_type if nullable else item_type.of_type).serialize
+        builtin = builtin_serializers.get(serialize)
+        if builtin is not None and items:
+            valid_type, check = builtin
+            if set(map(type, items)) == {valid_type} and (check is None or check(items)):
+                return list(items)
+
+        completed: List[Any] = []
+        append = completed.append
+        checked_awaitables = False
+        for index, item in enumerate(items):
+            if item is None and nullable:
+                append(None)
+                continue
+            try:
+                append(serialize(item))
+                continue
+            except Exception:
+                pass
+
+            if not checked_awaitables:
+                checked_awaitables = True
+                if any(map(self.is_awaitable, items)):
+                    return super().complete_list_value(return_type, field_nodes, info, path, items)
+            item_path = path.add_key(index, None)
+            try:
+                append(self.complete_value(item_type, field_nodes, info, item_path, item))
+            except Exception as raw_error:
+                error = located_error(raw_error, field_nodes, item_path.as_list())
+                self.handle_field_error(error, item_type)
+                append(None)
+        return completed
+
+    def fork(self) -> 'ExecutionContext':
+        """Return a copy with its own errors, for a deferred fragment or a streamed item."""
+        context = copy(self)
+        context.errors = []
+        return context
+
+    def collect_fields(
+        self,
+        runtime_type: graphql.GraphQLObjectType,
+        selection_set: graphql.SelectionSetNode,
+        fields: Dict[str, List[graphql.FieldNode]],
+        visited_fragment_names: Set[str],
+    ) -> Dict[str, List[graphql.FieldNode]]:
+        """Collect fields, and the fragments deferred by `@defer` in `fields.deferred`."""
+        incremental = self.incremental
+        if incremental is None or incremental.defer_directive is None:
+            return super().collect_fields(
+                runtime_type, selection_set, fields, visited_fragment_names
+            )
+
+        if not isinstance(fields, CollectedFields):
+            fields = CollectedFields(fields)
+        for selection in selection_set.selections:
+            if not self.should_include_node(selection):
+                continue
+            if isinstance(selection, graphql.FieldNode):
+                fields.setdefault(get_field_entry_key(selection), []).append(selection)
+                continue
+
+            fragment: Union[graphql.InlineFragmentNode, graphql.FragmentDefinitionNode, None]
+            if isinstance(selection, graphql.InlineFragmentNode):
+                fragment = selection
+            else:
+                name = selection.name.value
+                if name in visited_fragment_names:
+                    continue
+                visited_fragment_names.add(name)
+                fragment = self.fragments.get(name)
+            if not fragment or not self.does_fragment_condition_match(fragment, runtime_type):
+                continue
+
+            defer = get_directive_values(
+                incremental.defer_directive, selection, self.variable_values
+            )
+            if defer and defer['if']:
+                fields.deferred.append(DeferredFragment(defer.get('label'), fragment.selection_set))
+            else:
+                self.collect_fields(
+                    runtime_type, fragment.selection_set, fields, visited_fragment_names
+                )
+        return fields
+
+    def execute_fields(
+        self,
+        parent_type: graphql.GraphQLObjectType,
+        source_value: Any,
+        path: Optional[Path],
+        fields: Dict[str, List[graphql.FieldNode]],
+    ) -> AwaitableOrValue[Dict[str, Any]]:
+        self.defer_fragments(parent_type, source_value, path, fields)
+        return super().execute_fields(parent_type, source_value, path, fields)
+
+    def execute_fields_serially(
+        self,
+        parent_type: graphql.GraphQLObjectType,
+        source_value: Any,
+        path: Optional[Path],
+        fields: Dict[str, List[graphql.FieldNode]],
+    ) -> AwaitableOrValue[Dict[str, Any]]:
+        self.defer_fragments(parent_type, source_value, path, fields)
+        return super().execute_fields_serially(parent_type, source_value, path, fields)
+
+    def defer_fragments(
+        self,
+        parent_type: graphql.GraphQLObjectType,
+        source_value: Any,
+        path: Optional[Path],
+        fields: Dict[str, List[graphql.FieldNode]],
+    ) -> None:
+        if self.incremental is None or not isinstance(fields, CollectedFields):
+            return
+        for fragment in fields.deferred:
+            self.incremental.add(
+                self.fork().execute_deferred_fragment(fragment, parent_type, source_value, path)
+            )
+
+    async def execute_deferred_fragment(
+        self,
+        fragment: DeferredFragment,
+        parent_type: graphql.GraphQLObjectType,
+        source_value: Any,
+        path: Optional[Path],
+    ) -> IncrementalDeferResult:
+        fields = self.collect_fields(parent_type, fragment.selection_set, {}, set())
+        data: Optional[Dict[str, Any]]
+        try:
+            data = self.execute_fields(parent_type, source_value, path, fields)
+            if self.is_awaitable(data):
+                data = await data  # type: ignore
+        except GraphQLError as error:
+            self.errors.append(error)
+            data = None
+        return IncrementalDeferResult(
+            data, path.as_list() if path else [], fragment.label, self.errors or None
+        )
+
+    def complete_stream_list(
+        self,
+        return_type: graphql.GraphQLList[graphql.GraphQLOutputType],
+        field_nodes: List[graphql.FieldNode],
+        info: graphql.GraphQLResolveInfo,
+        path: Path,
+        result: Any,
+        stream: Dict[str, Any],
+    ) -> AwaitableOrValue[List[Any]]:
+        """Complete the first `initialCount` items, stream the others.
+
+        The result can be an async iterable, like an async generator.
+        """
+        label, initial_count = stream.get('label'), stream['initialCount']
+        if initial_count < 0:
+            raise GraphQLError('initialCount must be a positive integer.', field_nodes)
+
+        if isinstance(result, AsyncIterable):
+            iterator = result.__aiter__()
+
+            async def complete_initial_items() -> List[Any]:
+                items = []
+                while len(items) < initial_count:
+                    try:
+                        items.append(await iterator.__anext__())
+                    except StopAsyncIteration:
+                        return await self.complete_awaitable_list(
+                            return_type, field_nodes, info, path, items
+                        )
+                completed = await self.complete_awaitable_list(
+                    return_type, field_nodes, info, path, items
+                )
+                self.stream_items(
+                    iterator, initial_count, return_type, field_nodes, info, path, label
+                )
+                return completed
+
+            return complete_initial_items()
+
+        if not isinstance(result, Iterable) or isinstance(result, str):
+            return self.complete_list_items(return_type, field_nodes, info, path, result)
+        items = list(result)
+        completed = self.complete_list_items(
+            return_type, field_nodes, info, path, items[:initial_count]
+        )
+        if len(items) > initial_count:
+            self.stream_items(
+                iter(items[initial_count:]),
+                initial_count,
+                return_type,
+                field_nodes,
+                info,
+                path,
+                label,
+            )
+        return completed
+
+    async def complete_awaitable_list(
+        self,
+        return_type: graphql.GraphQLList[graphql.GraphQLOutputType],
+        field_nodes: List[graphql.FieldNode],
+        info: graphql.GraphQLResolveInfo,
+        path: Path,
+        items: List[Any],
+    ) -> List[Any]:
+        completed = self.complete_list_items(return_type, field_nodes, info, path, items)
+        if self.is_awaitable(completed):
+            return await completed  # type: ignore
+        return completed  # type: ignore
+
+    def stream_items(
+        self,
+        iterator: Union[Iterator[Any], AsyncIterator[Any]],
+        index: int,
+        return_type: graphql.GraphQLList[graphql.GraphQLOutputType],
+        field_nodes: List[graphql.FieldNode],
+        info: graphql.GraphQLResolveInfo,
+        path: Path,
+        label: Optional[str],
+    ) -> None:
+        """Stream the items of the iterator from `index`, one after the other."""
+        self.incremental.add(  # type: ignore
+            self.fork().execute_stream_item(
+                iterator, index, return_type, field_nodes, info, path, label
+            )
+        )
+
+    async def execute_stream_item(
+        self,
+        iterator: Union[Iterator[Any], AsyncIterator[Any]],
+        index: int,
+        return_type: graphql.GraphQLList[graphql.GraphQLOutputType],
+        field_nodes: List[graphql.FieldNode],
+        info: graphql.GraphQLResolveInfo,
+        path: Path,
+        label: Optional[str],
+    ) -> Optional[IncrementalStreamResult]:
+        item_type = return_type.of_type
+        item_path = path.add_key(index, None)
+        items: Optional[List[Any]]
+        try:
+            if isinstance(iterator, AsyncIterator):
+                item = await iterator.__anext__()
+            else:
+                item = next(iterator)
+        except (StopIteration, StopAsyncIteration):
+            return None
+        except Exception as raw_error:
+            # the source failed, the list streams no more items
+            self.errors.append(located_error(raw_error, field_nodes, item_path.as_list()))
+            return IncrementalStreamResult(None, item_path.as_list(), label, self.errors)
+
+        try:
+            if self.is_awaitable(item):
+                item = await item
+            completed = self.complete_value(item_type, field_nodes, info, item_path, item)
+            if self.is_awaitable(completed):
+                completed = await completed
+            items = [completed]
+        except Exception as raw_error:
+            error = located_error(raw_error, field_nodes, item_path.as_list())
+            try:
+                self.handle_field_error(error, item_type)
+                items = [None]
+            except GraphQLError:
+                # a null item of a non null type nulls the payload
+                self.errors.append(error)
+                items = None
+
+        self.stream_items(iterator, index + 1, return_type, field_nodes, info, path, label)
+        return IncrementalStreamResult(items, item_path.as_list(), label, self.errors or None)
+
+
+async def execute_incremental(
+    schema: graphql.GraphQLSchema,
+    document: graphql.DocumentNode,
+    root_value: Any = None,
+    context_value: Any = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+    operation_name: Optional[str] = None,
+    field_resolver: Optional[graphql.GraphQLFieldResolver] = None,
+    type_resolver: Optional[graphql.GraphQLTypeResolver] = None,
+    middleware: Optional[graphql.Middleware] = None,
+    execution_context_class: Type[ExecutionContext] = ExecutionContext,
+) -> Union[graphql.ExecutionResult, IncrementalExecutionResults]:
+    """Execute an operation with `@defer` and `@stream`, like `graphql.execute`.
+
+    Return an `ExecutionResult` when nothing is deferred or streamed. The schema must
+    define the directives, see `gql.incremental.incremental_type_defs`.
+    """
+    assert_valid_execution_arguments(schema, document, variable_values)
+    context = execution_context_class.build(
+        schema,
+        document,
+        root_value,
+        context_value,
+        variable_values,
+        operation_name,
+        field_resolver,
+        type_resolver,
+        middleware,
+    )
+    if isinstance(context, list):
+        return graphql.ExecutionResult(data=None, errors=context)
+
+    publisher = context.incremental = IncrementalPublisher(
+        schema.get_directive('defer'), schema.get_directive('stream')
+    )
+    data = context.execute_operation(context.operation, root_value)
+    if context.is_awaitable(data):
+        data = await data  # type: ignore
+    result = cast(graphql.ExecutionResult, context.build_response(data))
+    if not publisher.pending:
+        return result
+    return IncrementalExecutionResults(
+        InitialIncrementalExecutionResult(result.data, result.errors), publisher
+    )
@@ -9,8 +9,11 @@ from graphql import (
     GraphQLObjectType,
     GraphQLResolveInfo,
     GraphQLSchema,
+    parse,
 )
 
+from .compact import DIRECTIVES_EXTENSION
+
 federation_service_type_defs = """
     scalar _Any
 
@@ -31,6 +34,8 @@ federation_service_type_defs = """
     directive @extends on OBJECT | INTERFACE
 """
 
+federation_service_document = parse(federation_service_type_defs, no_location=True)
+
 federation_entity_type_defs = """
     # a union of all types that use the @key directive
     union _Entity
@@ -40,6 +45,8 @@ federation_entity_type_defs = """
     }
 """
 
+federation_entity_document = parse(federation_entity_type_defs, no_location=True)
+
 _i_token_delimiter = r"(?:^|[\s\r\n]+|$)"
 _i_token_name = "[_A-Za-z][_0-9A-Za-z]*"
 _i_token_arguments = r"\([^)]*\)"
@@ -106,6 +113,10 @@ def gather_directives(type_object: GraphQLNamedType,) -> List[DirectiveNode]:
         if type_object.ast_node and type_object.ast_node.directives:
             directives.extend(type_object.ast_node.directives)
 
+    # Schemas built with `compact` keep the directives in the extensions.
+    if not directives and type_object.extensions:
+        directives.extend(type_object.extensions.get(DIRECTIVES_EXTENSION, ()))
+
     return directives
 
 
@@ -0,0 +1,161 @@
+import asyncio
+from typing import Any, Coroutine, Dict, List, NamedTuple, Optional, Set, Union
+
+from graphql import GraphQLDirective, GraphQLError, SelectionSetNode
+
+# Add them to the type definitions of a schema to enable `@defer` and `@stream`.
+DEFER_DIRECTIVE_SDL = """
+directive @defer(label: String, if: Boolean! = true) on FRAGMENT_SPREAD | INLINE_FRAGMENT
+"""
+
+STREAM_DIRECTIVE_SDL = """
+directive @stream(label: String, initialCount: Int! = 0, if: Boolean! = true) on FIELD
+"""
+
+incremental_type_defs = DEFER_DIRECTIVE_SDL + STREAM_DIRECTIVE_SDL
+
+
+class DeferredFragment(NamedTuple):
+    label: Optional[str]
+    selection_set: SelectionSetNode
+
+
+class CollectedFields(dict):
+    """The fields collected by `ExecutionContext.collect_fields`, and the deferred fragments."""
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.deferred: List[DeferredFragment] = []
+
+
+def format_errors(errors: Optional[List[GraphQLError]], formatted: Dict[str, Any]) -> None:
+    if errors:
+        formatted['errors'] = [error.formatted for error in errors]
+
+
+class IncrementalDeferResult(NamedTuple):
+    data: Optional[Dict[str, Any]]
+    path: List[Union[str, int]]
+    label: Optional[str] = None
+    errors: Optional[List[GraphQLError]] = None
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        formatted: Dict[str, Any] = {'data': self.data, 'path': self.path}
+        if self.label is not None:
+            formatted['label'] = self.label
+        format_errors(self.errors, formatted)
+        return formatted
+
+
+class IncrementalStreamResult(NamedTuple):
+    items: Optional[List[Any]]
+    path: List[Union[str, int]]
+    label: Optional[str] = None
+    errors: Optional[List[GraphQLError]] = None
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        formatted: Dict[str, Any] = {'items': self.items, 'path': self.path}
+        if self.label is not None:
+            formatted['label'] = self.label
+        format_errors(self.errors, formatted)
+        return formatted
+
+
+IncrementalResult = Union[IncrementalDeferResult, IncrementalStreamResult]
+
+
+class InitialIncrementalExecutionResult(NamedTuple):
+    data: Optional[Dict[str, Any]]
+    errors: Optional[List[GraphQLError]] = None
+    has_next: bool = True
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        formatted: Dict[str, Any] = {'data': self.data}
+        format_errors(self.errors, formatted)
+        formatted['hasNext'] = self.has_next
+        return formatted
+
+
+class SubsequentIncrementalExecutionResult(NamedTuple):
+    incremental: List[IncrementalResult]
+    has_next: bool
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        formatted: Dict[str, Any] = {}
+        if self.incremental:
+            formatted['incremental'] = [result.formatted for result in self.incremental]
+        formatted['hasNext'] = self.has_next
+        return formatted
+
+
+class IncrementalExecutionResults(NamedTuple):
+    """The result of an execution with deferred fragments or streamed items.
+
+    `initial_result` is the result without them, `subsequent_results` yields them as they
+    complete, the last one with `has_next` False. When they are not iterated to the end, for
+    example because the client went away, call `await subsequent_results.aclose()` to cancel
+    the jobs still running.
+    """
+
+    initial_result: InitialIncrementalExecutionResult
+    subsequent_results: 'IncrementalPublisher'
+
+
+class IncrementalPublisher:
+    """Run the deferred fragments and streamed items of an execution, publish their results.
+
+    The jobs start as they are added, while the initial result is built. The publisher is the
+    async iterator of the subsequent results. The directives are the ones of the schema, None
+    when the schema does not define them.
+    """
+
+    def __init__(
+        self,
+        defer_directive: Optional[GraphQLDirective],
+        stream_directive: Optional[GraphQLDirective],
+    ) -> None:
+        self.defer_directive = defer_directive
+        self.stream_directive = stream_directive
+        self.pending: Set['asyncio.Future[Optional[IncrementalResult]]'] = set()
+        self.closed = False
+
+    def add(self, job: Coroutine[Any, Any, Optional[IncrementalResult]]) -> None:
+        """Start a job, which returns a result or None when it has nothing to publish."""
+        if self.closed:
+            job.close()
+            return
+        self.pending.add(asyncio.ensure_future(job))
+
+    def __aiter__(self) -> 'IncrementalPublisher':
+        return self
+
+    async def __anext__(self) -> SubsequentIncrementalExecutionResult:
+        if self.closed or not self.pending:
+            raise StopAsyncIteration
+        try:
+            while True:
+                done, _ = await asyncio.wait(self.pending, return_when=asyncio.FIRST_COMPLETED)
+                self.pending.difference_update(done)
+                results = (job.result() for job in done)
+                incremental = [result for result in results if result is not None]
+                if not self.pending:
+                    self.closed = True
+                    return SubsequentIncrementalExecutionResult(incremental, False)
+                if incremental:
+                    return SubsequentIncrementalExecutionResult(incremental, True)
+        except BaseException:
+            # cancelled, or a job failed
+            await self.aclose()
+            raise
+
+    async def aclose(self) -> None:
+        """Cancel the jobs which are still running."""
+        self.closed = True
+        jobs, self.pending = self.pending, set()
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
@@ -0,0 +1,137 @@
+from inspect import isawaitable
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Mapping, Optional, Sequence, Tuple
+
+import graphql
+from graphql.pyutils import Undefined
+
+from .utils import to_camel_case
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .parser import FieldMeta, Selection
+
+# Key of the prefetched values in the request context.
+PREFETCH_KEY = '__prefetched__'
+
+Loader = Callable[[Sequence[Any]], Any]
+PrefetchMap = Dict[Tuple[int, str], Tuple[Any, Any]]
+
+
+class Lookahead:
+    """Look at the fields selected below the current field and prefetch them.
+
+        @query
+        def posts(parent, info):
+            rows = load_posts()
+            lookahead = Lookahead(info)
+            if lookahead.selects('author'):
+                lookahead.prefetch('author', rows, load_authors)  # one query for all rows
+            return rows
+
+        @field_resolver('Post', 'author')
+        def author(parent, info):
+            return load_author(parent['author_id'])  # not called when prefetched
+
+    `load_authors(rows)` returns a list aligned with `rows`, or a mapping when `key` is
+    given to `prefetch`. Resolvers registered by the decorators of this library, and the
+    default field resolvers of `gql.resolver` and `gql.ExecutionContext`, find prefetched
+    values in the request context, which must be a dict, without being called.
+    """
+
+    def __init__(self, info: graphql.GraphQLResolveInfo, index: int = 0) -> None:
+        # the resolvers import this module for `get_prefetched`, the parser is loaded on use.
+        from .parser import parse_info
+
+        self.info = info
+        self.field_meta = parse_info(info, depth=None, index=index)
+
+    def selection(self, *path: str) -> Optional['FieldMeta']:
+        """Return the selection of the sub field at the path of snake case names.
+
+        The selections of a field in inline fragments, whatever their type, are merged.
+        """
+        from .parser import FieldMeta
+
+        field_meta = self.field_meta
+        for name in path:
+            selection = field_meta.selection
+            selection_sets = selection.child_selection_sets(name)
+            if not selection_sets:
+                return None
+            field_meta = FieldMeta(name, None, selection.document.get(selection_sets))
+        return field_meta
+
+    def selects(self, *path: str) -> bool:
+        """Return True if the field at the path of snake case names is selected."""
+        if not path:
+            return True
+        parent = self.selection(*path[:-1])
+        if parent is None:
+            return False
+        return selects_field(parent.selection, path[-1])
+
+    def prefetch(
+        self,
+        field_name: str,
+        parents: Sequence[Any],
+        loader: Loader,
+        key: Callable[[Any], Hashable] = None,
+    ) -> Optional[Any]:
+        """Load `field_name` of all parents at once and store it for the child resolvers.
+
+        Returns an awaitable when the loader does.
+        """
+        parents = list(parents)
+        values = loader(parents)
+        if isawaitable(values):
+
+            async def store_async() -> None:
+                store_prefetched(self.info, field_name, parents, await values, key)
+
+            return store_async()
+
+        store_prefetched(self.info, field_name, parents, values, key)
+        return None
+
+
+def selects_field(selection: 'Selection', name: str) -> bool:
+    if name in selection.sections or name in selection.children:
+        return True
+    return any(selects_field(fragment, name) for fragment in selection.inline_fragments.values())
+
+
+def store_prefetched(
+    info: graphql.GraphQLResolveInfo,
+    field_name: str,
+    parents: Sequence[Any],
+    values: Any,
+    key: Callable[[Any], Hashable] = None,
+) -> None:
+    prefetched: PrefetchMap = info.context.setdefault(PREFETCH_KEY, {})
+    field_name = to_camel_case(field_name)
+    if key is not None:
+        values = [values.get(key(parent)) for parent in parents]
+    elif isinstance(values, Mapping):
+        raise TypeError('prefetch loader returned a mapping, key function is required.')
+    elif len(values) != len(parents):
+        raise ValueError(
+            f'prefetch loader of {field_name} returned {len(values)} values'
+            f' for {len(parents)} parents.'
+        )
+
+    for parent, value in zip(parents, values):
+        # keep the parent with the value, so its id can not be reused during the request.
+        prefetched[(id(parent), field_name)] = (parent, value)
+
+
+def get_prefetched(parent: Any, info: graphql.GraphQLResolveInfo) -> Any:
+    """Return the value prefetched for this field of the parent, or Undefined."""
+    context = info.context
+    if not isinstance(context, dict):
+        return Undefined
+    prefetched: Optional[PrefetchMap] = context.get(PREFETCH_KEY)
+    if not prefetched:
+        return Undefined
+    entry = prefetched.get((id(parent), info.field_name))
+    if entry is None:
+        return Undefined
+    return entry[1]
@@ -0,0 +1,203 @@
+import random
+import time
+from bisect import bisect_left
+from inspect import isawaitable
+from typing import Any, Collection, Dict, List, Sequence, Tuple
+
+from graphql import GraphQLField, GraphQLSchema, is_interface_type, is_object_type
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+FieldKey = Tuple[str, str]
+
+
+class FieldStats:
+    __slots__ = ('calls', 'errors', 'samples', 'sum', 'buckets')
+
+    def __init__(self, size: int) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.samples = 0
+        self.sum = 0.0
+        # The last bucket is +Inf.
+        self.buckets = [0] * (size + 1)
+
+
+class ResolverMetrics:
+    """Record call count, error count and latency histogram per `Type.field`.
+
+    Instrumentation happens once, when the schema is built:
+
+        metrics = ResolverMetrics(sample_rate=0.1)
+        schema = make_schema(type_defs, metrics=metrics)
+        ...
+        metrics.snapshot()
+        metrics.to_prometheus()
+
+    Calls and errors are always counted, latency is only measured for sampled calls.
+    Counters are plain integers updated under the GIL, so they may be slightly off when
+    the same field is resolved from many threads at once.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        sample_rate: float = 1.0,
+        namespace: str = 'graphql',
+        include_default_resolvers: bool = False,
+    ) -> None:
+        assert 0.0 <= sample_rate <= 1.0, 'sample_rate must be between 0 and 1.'
+        self.buckets = tuple(sorted(buckets))
+        self.sample_rate = sample_rate
+        self.namespace = namespace
+        self.include_default_resolvers = include_default_resolvers
+        self.fields: Dict[FieldKey, FieldStats] = {}
+
+    def instrument(
+        self, schema: GraphQLSchema, type_names: Collection[str] = None
+    ) -> GraphQLSchema:
+        """Wrap the resolvers of the object and interface fields, of `type_names` if given."""
+        for type_name, type_ in schema.type_map.items():
+            if type_name.startswith('__') or (
+                type_names is not None and type_name not in type_names
+            ):
+                continue
+            if not is_object_type(type_) and not is_interface_type(type_):
+                continue
+            for field_name, field in type_.fields.items():
+                self.instrument_field(type_name, field_name, field)
+        return schema
+
+    def instrument_field(self, type_name: str, field_name: str, field: GraphQLField) -> None:
+        resolve = field.resolve
+        if resolve is None:
+            if not self.include_default_resolvers:
+                return
+            from .resolver import default_field_resolver
+
+            resolve = default_field_resolver
+        if getattr(resolve, '__metrics__', None) is self:
+            return
+        field.resolve = self.wrap(resolve, self.get_stats(type_name, field_name))
+
+    def get_stats(self, type_name: str, field_name: str) -> FieldStats:
+        key = (type_name, field_name)
+        stats = self.fields.get(key)
+        if stats is None:
+            stats = self.fields[key] = FieldStats(len(self.buckets))
+        return stats
+
+    def wrap(self, resolve, stats: FieldStats):
+        buckets = self.buckets
+        sample_rate = self.sample_rate
+        perf_counter = time.perf_counter
+
+        def observe(start: float) -> None:
+            duration = perf_counter() - start
+            stats.samples += 1
+            stats.sum += duration
+            stats.buckets[bisect_left(buckets, duration)] += 1
+
+        async def await_result(result, start):
+            try:
+                return await result
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                if start is not None:
+                    observe(start)
+
+        def resolver(parent, info, **kwargs):
+            stats.calls += 1
+            sampled = sample_rate >= 1.0 or random.random() < sample_rate
+            start = perf_counter() if sampled else None
+            try:
+                result = resolve(parent, info, **kwargs)
+            except Exception:
+                stats.errors += 1
+                if sampled:
+                    observe(start)
+                raise
+            if isawaitable(result):
+                return await_result(result, start)
+            if sampled:
+                observe(start)
+            return result
+
+        resolver.__metrics__ = self
+        resolver.__wrapped__ = resolve
+        return resolver
+
+    def reset(self) -> None:
+        size = len(self.buckets)
+        for stats in self.fields.values():
+            stats.calls = stats.errors = stats.samples = 0
+            stats.sum = 0.0
+            stats.buckets = [0] * (size + 1)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the current values as `{'Type.field': {...}}`, buckets are cumulative."""
+        result = {}
+        for (type_name, field_name), stats in self.fields.items():
+            result[f'{type_name}.{field_name}'] = {
+                'calls': stats.calls,
+                'errors': stats.errors,
+                'samples': stats.samples,
+                'sum': stats.sum,
+                'buckets': dict(zip(self.bucket_labels(), cumulative(stats.buckets))),
+            }
+        return result
+
+    def bucket_labels(self) -> List[str]:
+        return [format_float(bound) for bound in self.buckets] + ['+Inf']
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        prefix = f'{self.namespace}_resolver'
+        labels = self.bucket_labels()
+        items = sorted(self.fields.items())
+
+        lines = [
+            f'# HELP {prefix}_calls_total Number of resolver calls.',
+            f'# TYPE {prefix}_calls_total counter',
+        ]
+        for (type_name, field_name), stats in items:
+            lines.append(
+                f'{prefix}_calls_total{{type="{type_name}",field="{field_name}"}} {stats.calls}'
+            )
+
+        lines.append(f'# HELP {prefix}_errors_total Number of resolver errors.')
+        lines.append(f'# TYPE {prefix}_errors_total counter')
+        for (type_name, field_name), stats in items:
+            lines.append(
+                f'{prefix}_errors_total{{type="{type_name}",field="{field_name}"}} {stats.errors}'
+            )
+
+        lines.append(f'# HELP {prefix}_duration_seconds Sampled resolver latency.')
+        lines.append(f'# TYPE {prefix}_duration_seconds histogram')
+        for (type_name, field_name), stats in items:
+            field_labels = f'type="{type_name}",field="{field_name}"'
+            for label, count in zip(labels, cumulative(stats.buckets)):
+                lines.append(
+                    f'{prefix}_duration_seconds_bucket{{{field_labels},le="{label}"}} {count}'
+                )
+            lines.append(
+                f'{prefix}_duration_seconds_sum{{{field_labels}}} {format_float(stats.sum)}'
+            )
+            lines.append(f'{prefix}_duration_seconds_count{{{field_labels}}} {stats.samples}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def cumulative(buckets: List[int]) -> List[int]:
+    total = 0
+    result = []
+    for count in buckets:
+        total += count
+        result.append(total)
+    return result
+
+
+def format_float(value: float) -> str:
+    return repr(float(value))
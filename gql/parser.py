@@ -1,122 +1,406 @@
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Union
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Hashable, List, Mapping, Optional, Set, Tuple, Union
 
 import graphql
+from graphql.execution.values import get_directive_values
 
-from .utils import to_snake_case
+from .utils import LRUCache, to_snake_case
 
-GraphQLNode = Union[graphql.FieldNode, graphql.FragmentDefinitionNode]
+GraphQLNode = Union[graphql.FieldNode, graphql.FragmentDefinitionNode, graphql.InlineFragmentNode]
+SelectionSets = Tuple[graphql.SelectionSetNode, ...]
+
+# FieldMeta trees and document selections are shared by all requests of the same document.
+field_meta_cache = LRUCache(4096)
+document_cache = LRUCache(512)
+# Names of the variables used by @skip and @include, per document.
+directive_variables_cache = LRUCache(512)
+
+EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
+
+def should_include_node(node: graphql.SelectionNode, variables: Dict[str, Any] = None) -> bool:
+    """Evaluate @skip and @include of the node, @skip has higher precedence."""
+    if not node.directives:
+        return True
+
+    skip = get_directive_values(graphql.GraphQLSkipDirective, node, variables)
+    if skip and skip['if']:
+        return False
+
+    include = get_directive_values(graphql.GraphQLIncludeDirective, node, variables)
+    if include and not include['if']:
+        return False
+
+    return True
+
+
+class Flattened:
+    """Selection sets flattened into leaf names and selection sets per child field."""
+
+    __slots__ = ('sections', 'children', 'inline_fragments', 'fragments')
+
+    def __init__(self) -> None:
+        self.sections: Dict[str, None] = {}  # ordered set
+        self.children: Dict[str, List[graphql.SelectionSetNode]] = {}
+        self.inline_fragments: Dict[str, List[graphql.SelectionSetNode]] = {}
+        self.fragments: Set[str] = set()
+
+    def merge(self, other: 'Flattened') -> None:
+        self.sections.update(other.sections)
+        for name, selection_sets in other.children.items():
+            self.children.setdefault(name, []).extend(selection_sets)
+        for name, selection_sets in other.inline_fragments.items():
+            self.inline_fragments.setdefault(name, []).extend(selection_sets)
+        self.fragments.update(other.fragments)
+
+
+class Selection:
+    """The immutable selection of one or more selection sets, with fragments expanded.
+
+    Child selections are built lazily on first access and shared: selecting the same
+    selection sets (for example through one fragment used at several places) always
+    returns the same `Selection` object.
+    """
+
+    __slots__ = (
+        'document',
+        'sections',
+        'fragments',
+        '_child_sets',
+        '_inline_sets',
+        '_children',
+        '_inline_fragments',
+    )
+
+    def __init__(self, document: 'DocumentSelections', flattened: Flattened) -> None:
+        self.document = document
+        self.sections: Tuple[str, ...] = tuple(flattened.sections)
+        # names of the spread fragments which are not defined in the document
+        self.fragments: FrozenSet[str] = frozenset(flattened.fragments)
+        self._child_sets = {name: tuple(sets) for name, sets in flattened.children.items()}
+        self._inline_sets = {name: tuple(sets) for name, sets in flattened.inline_fragments.items()}
+        self._children: Optional[Mapping[str, 'Selection']] = None
+        self._inline_fragments: Optional[Mapping[str, 'Selection']] = None
+
+    @property
+    def children(self) -> Mapping[str, 'Selection']:
+        if self._children is None:
+            self._children = MappingProxyType(
+                {name: self.document.get(sets) for name, sets in self._child_sets.items()}
+            )
+        return self._children
+
+    @property
+    def inline_fragments(self) -> Mapping[str, 'Selection']:
+        if self._inline_fragments is None:
+            self._inline_fragments = MappingProxyType(
+                {name: self.document.get(sets) for name, sets in self._inline_sets.items()}
+            )
+        return self._inline_fragments
+
+    def child_selection_sets(self, name: str) -> SelectionSets:
+        """Return the selection sets of a child field, here and in the inline fragments."""
+        selection_sets = self._child_sets.get(name, ())
+        for fragment in self.inline_fragments.values():
+            selection_sets += fragment.child_selection_sets(name)
+        return selection_sets
+
+
+class DocumentSelections:
+    """Selections of one document for one set of @skip/@include variable values.
+
+    Every fragment is flattened once, however often and deep it is spread.
+    """
+
+    def __init__(
+        self,
+        fragments: Mapping[str, graphql.FragmentDefinitionNode] = None,
+        variables: Dict[str, Any] = None,
+    ) -> None:
+        self.fragment_nodes = fragments or {}
+        self.variables = variables
+        self.selections: Dict[Tuple[Hashable, ...], Tuple[SelectionSets, Selection]] = {}
+        self.fragments: Dict[str, Flattened] = {}
+        self._expanding: Set[str] = set()
+        self._lock = threading.RLock()
+
+    def get(self, selection_sets: SelectionSets) -> Selection:
+        # keyed by source offset, so the same selection of another request of the document
+        # (parsed again) finds the entry
+        key = tuple(map(node_key, selection_sets))
+        entry = self.selections.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self.selections.get(key)
+                if entry is None:
+                    # keep the selection sets with the entry, so ids used as keys can not be reused.
+                    entry = (selection_sets, Selection(self, self.flatten(selection_sets)))
+                    self.selections[key] = entry
+        return entry[1]
+
+    def flatten(self, selection_sets: SelectionSets) -> Flattened:
+        flattened = Flattened()
+        for selection_set in selection_sets:
+            self.flatten_into(selection_set, flattened)
+        return flattened
+
+    def flatten_into(self, selection_set: graphql.SelectionSetNode, flattened: Flattened) -> None:
+        variables = self.variables
+        for node in selection_set.selections:
+            if not should_include_node(node, variables):
+                continue
+
+            if isinstance(node, graphql.FieldNode):
+                name = node.name.value
+                if not node.selection_set:
+                    if not name.startswith('__'):
+                        flattened.sections[to_snake_case(name)] = None
+                    continue
+                flattened.children.setdefault(to_snake_case(name), []).append(node.selection_set)
+            elif isinstance(node, graphql.InlineFragmentNode):
+                if node.type_condition is None:
+                    self.flatten_into(node.selection_set, flattened)
+                    continue
+                flattened.inline_fragments.setdefault(node.type_condition.name.value, []).append(
+                    node.selection_set
+                )
+            elif isinstance(node, graphql.FragmentSpreadNode):
+                fragment = self.get_fragment(node.name.value)
+                if fragment is None:
+                    flattened.fragments.add(node.name.value)
+                else:
+                    flattened.merge(fragment)
+
+    def get_fragment(self, name: str) -> Optional[Flattened]:
+        fragment = self.fragments.get(name)
+        if fragment is not None:
+            return fragment
+
+        node = self.fragment_nodes.get(name)
+        # Fragment cycles are invalid, but do not recurse forever on unvalidated documents.
+        if node is None or name in self._expanding:
+            return None
+        self._expanding.add(name)
+        try:
+            fragment = self.fragments[name] = self.flatten((node.selection_set,))
+        finally:
+            self._expanding.discard(name)
+        return fragment
 
 
-@dataclass
 class FieldMeta:
-    name: str
-    depth: int
-    sections: List[str] = field(default_factory=list)
-    sub_fields: Dict[str, 'FieldMeta'] = field(default_factory=dict)
-    fragments: Set[str] = field(default_factory=set)
-    inline_fragments: Dict[str, 'FieldMeta'] = field(default_factory=dict)
+    """Immutable view of the selection of a field, up to `depth` levels.
+
+    `sections` are the (snake case) names of the selected leaf fields, `sub_fields` the
+    selected object fields, as long as `depth` is greater than 1. The underlying selection
+    is expanded lazily to any depth, use `expand` to look deeper without parsing again.
+    """
+
+    __slots__ = ('name', 'depth', 'selection', '_sub_fields', '_inline_fragments')
+
+    def __init__(self, name: str, depth: Optional[int], selection: Selection) -> None:
+        object.__setattr__(self, 'name', name)
+        # None means unlimited.
+        object.__setattr__(self, 'depth', depth)
+        object.__setattr__(self, 'selection', selection)
+        object.__setattr__(self, '_sub_fields', None)
+        object.__setattr__(self, '_inline_fragments', None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f'{self.__class__.__name__} is immutable.')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{self.__class__.__name__} is immutable.')
+
+    def __repr__(self) -> str:
+        return (
+            f'FieldMeta(name={self.name!r}, depth={self.depth!r}, sections={self.sections!r},'
+            f' sub_fields={list(self.sub_fields)!r},'
+            f' inline_fragments={list(self.inline_fragments)!r})'
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, FieldMeta):
+            return NotImplemented
+        return (
+            self.name == other.name
+            and self.depth == other.depth
+            and self.sections == other.sections
+            and dict(self.sub_fields) == dict(other.sub_fields)
+            and dict(self.inline_fragments) == dict(other.inline_fragments)
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.depth, id(self.selection)))
+
+    @property
+    def sections(self) -> Tuple[str, ...]:
+        return self.selection.sections
+
+    @property
+    def fragments(self) -> FrozenSet[str]:
+        """Names of spread fragments which could not be expanded."""
+        return self.selection.fragments
+
+    @property
+    def sub_fields(self) -> Mapping[str, 'FieldMeta']:
+        sub_fields = self._sub_fields
+        if sub_fields is None:
+            if self.depth is not None and self.depth <= 1:
+                sub_fields = EMPTY_MAPPING
+            else:
+                depth = self.depth - 1 if self.depth is not None else None
+                sub_fields = MappingProxyType(
+                    {
+                        name: FieldMeta(name, depth, selection)
+                        for name, selection in self.selection.children.items()
+                    }
+                )
+            object.__setattr__(self, '_sub_fields', sub_fields)
+        return sub_fields
+
+    @property
+    def inline_fragments(self) -> Mapping[str, 'FieldMeta']:
+        inline_fragments = self._inline_fragments
+        if inline_fragments is None:
+            inline_fragments = MappingProxyType(
+                {
+                    name: FieldMeta(name, self.depth, selection)
+                    for name, selection in self.selection.inline_fragments.items()
+                }
+            )
+            object.__setattr__(self, '_inline_fragments', inline_fragments)
+        return inline_fragments
 
     def get_sub_field(self, name) -> Optional['FieldMeta']:
         return self.sub_fields.get(name)
 
-    def add_section_or_sub_field(self, field_: 'FieldMeta') -> None:
-        if not field_:
-            return None
-
-        if field_.sections or field_.sub_fields or field_.fragments:
-            self.sub_fields[field_.name] = field_
-        else:
-            self.sections.append(field_.name)
+    def expand(self, depth: Optional[int] = None) -> 'FieldMeta':
+        """Return the same selection with another depth, None means unlimited."""
+        if depth == self.depth:
+            return self
+        return FieldMeta(self.name, depth, self.selection)
 
-    def replace_fragments(self, fragments: Dict[str, 'FieldMeta']) -> None:
-        if not self.fragments and not self.sub_fields:
-            return None
 
-        for name in self.fragments:
-            # In the real case, name in fragments surely.
-            fragment = fragments[name]
-            if fragment.fragments:
-                fragment.replace_fragments(fragments)
-            self.sections.extend(fragment.sections)
-
-            for field_name, field_ in fragment.sub_fields.items():
-                if field_.fragments:
-                    field_.replace_fragments(fragments)
-                self.sub_fields[field_name] = field_
-        if self.depth > 1:
-            for sub_field in self.sub_fields.values():
-                if sub_field.fragments:
-                    sub_field.replace_fragments(fragments)
-        else:
-            # clear sub fields if depth less than 1
-            self.sub_fields = {}
-
-        self.fragments = set()
-
-
-def parse_fragment_nodes(nodes: Dict[str, graphql.FragmentDefinitionNode]) -> Dict[str, FieldMeta]:
-    fragments = {name: parse_node(node, depth=2) for name, node in nodes.items()}
-    for fragment in fragments.values():
-        if fragment.fragments:
-            fragment.replace_fragments(fragments)
-    return fragments
-
-
-def parse_node(node: GraphQLNode, depth: int = 2) -> Optional[FieldMeta]:
+def parse_node(
+    node: GraphQLNode,
+    depth: Optional[int] = 2,
+    variables: Dict[str, Any] = None,
+    fragments: Mapping[str, graphql.FragmentDefinitionNode] = None,
+) -> Optional[FieldMeta]:
+    """Parse the selection of a node, expanding the given fragment definitions."""
     if depth == 0:
         return None
+    return node_field_meta(node, depth, DocumentSelections(fragments, variables))
 
+
+def node_field_meta(
+    node: GraphQLNode, depth: Optional[int], document: DocumentSelections
+) -> FieldMeta:
     if isinstance(node, graphql.InlineFragmentNode):
-        name = node.type_condition.name.value
+        name = node.type_condition.name.value if node.type_condition else ''
     else:
         name = to_snake_case(node.name.value)
-    field_meta = FieldMeta(name=name, depth=depth)
-    if not node.selection_set:
-        return field_meta
+    selection_sets = (node.selection_set,) if node.selection_set else ()
+    return FieldMeta(name, depth, document.get(selection_sets))
 
-    depth -= 1
-    for field_node in node.selection_set.selections:
-        if isinstance(field_node, graphql.FragmentSpreadNode):
-            field_meta.fragments.add(to_snake_case(field_node.name.value))
-            continue
 
-        if isinstance(field_node, graphql.InlineFragmentNode):
-            meta = parse_node(field_node, depth=depth + 1)
-            field_meta.inline_fragments[meta.name] = meta
-            continue
+def document_key(info: graphql.GraphQLResolveInfo) -> Tuple[Hashable, Any]:
+    """Return a cache key of the document executed and an object to keep alive with it.
 
-        if not field_node.selection_set:
-            name = field_node.name.value
-            if not name.startswith('__'):
-                field_meta.sections.append(to_snake_case(name))
-            continue
+    Documents parsed with locations are keyed by their source, so the same query parsed
+    again for every request still hits the cache. Otherwise the operation itself is the
+    key, it is kept alive by the cache entry so its id can not be reused.
+    """
+    operation = info.operation
+    if operation.loc is not None:
+        return operation.loc.source.body, None
+    return id(operation), operation
 
-        if depth == 0:
-            continue
 
-        field_meta.add_section_or_sub_field(parse_node(field_node, depth=depth))
+def node_key(node: graphql.Node) -> Hashable:
+    return node.loc.start if node.loc is not None else id(node)
 
-    return field_meta
 
+def collect_directive_variables(
+    selection_set: Optional[graphql.SelectionSetNode], names: Set[str]
+) -> Set[str]:
+    if not selection_set:
+        return names
+    for selection in selection_set.selections:
+        for directive in selection.directives or ():
+            if directive.name.value not in ('skip', 'include'):
+                continue
+            for argument in directive.arguments or ():
+                if isinstance(argument.value, graphql.VariableNode):
+                    names.add(argument.value.name.value)
+        collect_directive_variables(getattr(selection, 'selection_set', None), names)
+    return names
 
-def parse_info(info: graphql.GraphQLResolveInfo, depth: int = 2, index: int = 0) -> 'FieldMeta':
-    if 'fragments' not in info.context:
-        fragments = parse_fragment_nodes(info.fragments)
-        info.context['fragments'] = fragments
-    else:
-        fragments = info.context['fragments']
 
-    field_metas = info.context.get('field_metas') or {}
-    if index not in field_metas:
-        field_meta = parse_node(info.field_nodes[index], depth=depth)
-        field_meta.replace_fragments(fragments)
-        field_metas[index] = field_meta
+def get_variables_signature(info: graphql.GraphQLResolveInfo) -> Tuple[Any, ...]:
+    """Return the values of the variables which @skip and @include depend on.
+
+    Selections are only cached per value of these variables, any other variable does
+    not change the parsed selection.
+    """
+    key, owner = document_key(info)
+    entry = directive_variables_cache.get(key)
+    if entry is None:
+        names: Set[str] = set()
+        collect_directive_variables(info.operation.selection_set, names)
+        for fragment in info.fragments.values():
+            collect_directive_variables(fragment.selection_set, names)
+        entry = (owner, tuple(sorted(names)))
+        directive_variables_cache.set(key, entry)
+
+    names = entry[1]
+    if not names:
+        return ()
+    variables = info.variable_values or {}
+    return tuple(bool(variables.get(name)) for name in names)
+
+
+def get_document_selections(
+    info: graphql.GraphQLResolveInfo, signature: Tuple[Any, ...] = ()
+) -> DocumentSelections:
+    document, owner = document_key(info)
+    key = (document, signature)
+    entry = document_cache.get(key)
+    if entry is None:
+        entry = (owner, DocumentSelections(info.fragments, info.variable_values))
+        document_cache.set(key, entry)
+    return entry[1]
+
+
+def parse_info(
+    info: graphql.GraphQLResolveInfo, depth: Optional[int] = 2, index: int = 0
+) -> FieldMeta:
+    """Parse the selection of the field being resolved.
+
+    Fields turned off by @skip or @include are left out. The result is cached across
+    requests by (document, field node, depth, values of the @skip/@include variables).
+    """
+    field_node = info.field_nodes[index]
+    document, owner = document_key(info)
+    signature = get_variables_signature(info)
+    key = (document, node_key(field_node), depth, signature)
+    entry = field_meta_cache.get(key)
+    if entry is None:
+        field_meta = node_field_meta(field_node, depth, get_document_selections(info, signature))
+        entry = (owner, field_node if owner is not None else None, field_meta)
+        field_meta_cache.set(key, entry)
+    return entry[2]
+
 
-    return field_metas[index]
+def clear_caches() -> None:
+    field_meta_cache.clear()
+    document_cache.clear()
+    directive_variables_cache.clear()
 
 
-def fake_info(query) -> graphql.GraphQLResolveInfo:
+def fake_info(query, variables: Dict[str, Any] = None) -> graphql.GraphQLResolveInfo:
     from unittest.mock import MagicMock
 
     doc = graphql.parse(query)
@@ -124,4 +408,6 @@ def fake_info(query) -> graphql.GraphQLResolveInfo:
         context={},
         field_nodes=doc.definitions[0].selection_set.selections,
         fragments={node.name.value: node for node in doc.definitions[1:]},
+        operation=doc.definitions[0],
+        variable_values=variables or {},
     )
@@ -0,0 +1,83 @@
+import gc
+import os
+import traceback
+from typing import Any, Callable, Dict, Iterable, List
+
+from graphql import (
+    GraphQLSchema,
+    is_input_object_type,
+    is_interface_type,
+    is_object_type,
+    is_union_type,
+    validate_schema,
+)
+
+
+def warm_schema(schema: GraphQLSchema) -> GraphQLSchema:
+    """Compute everything a schema builds lazily, so forked workers do not write it.
+
+    Fields, interfaces and members of the types are thunks resolved on first access, the
+    sub types of abstract types and the validation result are cached on first execution.
+    """
+    for type_ in schema.type_map.values():
+        if is_object_type(type_) or is_interface_type(type_):
+            type_.fields  # noqa
+            type_.interfaces  # noqa
+        elif is_input_object_type(type_):
+            type_.fields  # noqa
+    for type_ in schema.type_map.values():
+        if is_union_type(type_) or is_interface_type(type_):
+            schema.is_sub_type(type_, type_)
+    validate_schema(schema)
+    return schema
+
+
+def freeze(schemas: Iterable[GraphQLSchema] = ()) -> None:
+    """Warm the schemas, then move every object to the permanent GC generation.
+
+    Call it in the parent process right before forking: the collector of the workers never
+    visits the frozen objects, so it does not touch (and copy) the shared pages.
+    """
+    for schema in schemas:
+        warm_schema(schema)
+    gc.collect()
+    gc.freeze()
+
+
+def fork_workers(
+    workers: int, target: Callable[[int], Any], schemas: Iterable[GraphQLSchema] = ()
+) -> List[int]:
+    """Freeze the parent and fork `workers` processes running `target(index)`.
+
+        schema = make_schema_from_path('./schema')
+        pids = fork_workers(8, lambda index: serve(schema), [schema])
+        wait_workers(pids)
+
+    A worker exits with 0 when target returns, 1 when it raises. With servers which fork
+    themselves, like gunicorn with `preload_app`, call `freeze` at the end of the app module
+    instead.
+    """
+    freeze(schemas)
+    pids = []
+    for index in range(workers):
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover, the child never returns
+            code = 0
+            try:
+                target(index)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        pids.append(pid)
+    return pids
+
+
+def wait_workers(pids: Iterable[int]) -> Dict[int, int]:
+    """Wait for the workers, return their exit codes by pid."""
+    codes = {}
+    for pid in pids:
+        _, status = os.waitpid(pid, 0)
+        codes[pid] = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+    return codes
@@ -0,0 +1,163 @@
+import cProfile
+import os
+import re
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import graphql
+
+_r_unsafe = re.compile(r'[^0-9A-Za-z_.-]+')
+
+
+class ProfileSession:
+    """A running profile of one operation execution."""
+
+    def __init__(self, profiler: 'OperationProfiler', label: str, root_fields: List[str]) -> None:
+        self.profiler = profiler
+        self.label = label
+        self.root_fields = root_fields
+        self.cpu: Optional[cProfile.Profile] = None
+        self.started_tracemalloc = False
+        self.memory_start: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> 'ProfileSession':
+        if self.profiler.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.profiler.memory_frames)
+                self.started_tracemalloc = True
+            else:
+                self.memory_start = tracemalloc.take_snapshot()
+        if self.profiler.cpu:
+            self.cpu = cProfile.Profile()
+            self.cpu.enable()
+        return self
+
+    def stop(self) -> None:
+        try:
+            if self.cpu:
+                self.cpu.disable()
+            if self.profiler.memory:
+                snapshot = tracemalloc.take_snapshot()
+                if self.started_tracemalloc:
+                    tracemalloc.stop()
+                self.write_collapsed(snapshot)
+            if self.cpu:
+                self.cpu.dump_stats(str(self.profiler.new_file(self.label, 'pstats')))
+        finally:
+            self.profiler.finish()
+
+    def write_collapsed(self, snapshot: tracemalloc.Snapshot) -> None:
+        """Write allocations as collapsed stacks, `root;frame;...;frame bytes` per line.
+
+        The GraphQL operation and its root fields are used as the root frames, so flame
+        graphs of different operations can be merged without losing their origin.
+        """
+        snapshot = snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+        if self.memory_start is not None:
+            stats = snapshot.compare_to(self.memory_start, 'traceback')
+            sizes = ((stat.traceback, stat.size_diff) for stat in stats)
+        else:
+            sizes = ((stat.traceback, stat.size) for stat in snapshot.statistics('traceback'))
+
+        root = f"{self.label};{','.join(self.root_fields)}"
+        path = self.profiler.new_file(self.label, 'collapsed')
+        with path.open('w') as f:
+            for traceback, size in sizes:
+                if size <= 0:
+                    continue
+                frames = ';'.join(f'{frame.filename}:{frame.lineno}' for frame in traceback)
+                f.write(f'{root};{frames} {size}\n')
+
+
+class OperationProfiler:
+    """Profile every Nth execution of the selected operations.
+
+    CPU profiles are written with `cProfile` as `.pstats` files, allocations are
+    traced with `tracemalloc` and written as `.collapsed` stack files. Only the
+    newest `max_files` files are kept in `directory`.
+
+        profiler = OperationProfiler('/tmp/profiles', operation_names=['GetPosts'], every=100)
+        graphql(schema, source, execution_context_class=ExecutionContext.with_profiler(profiler))
+
+    Only one execution is profiled at a time. For async executions the profile covers
+    everything the event loop runs until the operation completes.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        operation_names: Iterable[str] = None,
+        every: int = 100,
+        cpu: bool = True,
+        memory: bool = False,
+        max_files: int = 100,
+        memory_frames: int = 32,
+    ) -> None:
+        assert every >= 1, 'every must be greater than 0.'
+        self.directory = Path(directory)
+        self.operation_names = set(operation_names) if operation_names is not None else None
+        self.every = every
+        self.cpu = cpu
+        self.memory = memory
+        self.max_files = max_files
+        self.memory_frames = memory_frames
+        self.counters: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._busy = False
+
+    def start(self, operation: graphql.OperationDefinitionNode) -> Optional[ProfileSession]:
+        """Return a started session if this execution is sampled, otherwise None."""
+        operation_name = operation.name.value if operation.name else ''
+        if self.operation_names is not None and operation_name not in self.operation_names:
+            return None
+
+        with self._lock:
+            self.counters[operation_name] += 1
+            if self.counters[operation_name] % self.every or self._busy:
+                return None
+            self._busy = True
+
+        label = f'{operation.operation.value}:{operation_name or "anonymous"}'
+        root_fields = [
+            selection.name.value
+            for selection in operation.selection_set.selections
+            if isinstance(selection, graphql.FieldNode)
+        ]
+        try:
+            return ProfileSession(self, label, root_fields).start()
+        except Exception:
+            self.finish()
+            raise
+
+    def finish(self) -> None:
+        with self._lock:
+            self._busy = False
+        self.rotate()
+
+    def new_file(self, label: str, suffix: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = _r_unsafe.sub('_', label)
+        return self.directory / f'{time.time_ns()}-{os.getpid()}-{name}.{suffix}'
+
+    def rotate(self) -> None:
+        try:
+            files = [f for f in self.directory.iterdir() if f.suffix in ('.pstats', '.collapsed')]
+        except FileNotFoundError:
+            return
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=lambda f: f.name)
+        for f in files[: len(files) - self.max_files]:
+            try:
+                f.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,165 @@
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+import graphql
+
+from .parser import FieldMeta, Selection, parse_info
+from .utils import LRUCache
+
+Columns = Union[str, Iterable[str]]
+
+
+def as_tuple(columns: Optional[Columns]) -> Tuple[str, ...]:
+    if columns is None:
+        return ()
+    if isinstance(columns, str):
+        return (columns,)
+    return tuple(columns)
+
+
+class Relation:
+    """A GraphQL field loaded through a join.
+
+    `columns` are the local columns needed to load the relation, for example a foreign
+    key. When `projection` is given, the columns of the related table are projected too.
+    """
+
+    def __init__(self, join: str, columns: Columns = None, projection: 'Projection' = None) -> None:
+        self.join = join
+        self.columns = as_tuple(columns)
+        self.projection = projection
+
+
+class ProjectionResult(NamedTuple):
+    columns: Tuple[str, ...]
+    joins: Tuple[str, ...]
+    relations: Mapping[str, 'ProjectionResult']
+
+
+def merge_results(results: List[ProjectionResult]) -> ProjectionResult:
+    if len(results) == 1:
+        return results[0]
+    columns: Dict[str, None] = {}
+    joins: Dict[str, None] = {}
+    relations: Dict[str, List[ProjectionResult]] = {}
+    for result in results:
+        columns.update(dict.fromkeys(result.columns))
+        joins.update(dict.fromkeys(result.joins))
+        for name, relation in result.relations.items():
+            relations.setdefault(name, []).append(relation)
+    return ProjectionResult(
+        tuple(columns),
+        tuple(joins),
+        {name: merge_results(value) for name, value in relations.items()},
+    )
+
+
+class Projection:
+    """Map the selection of a GraphQL type to the columns and joins needed to resolve it.
+
+        user = Projection(columns=['id', 'name'], always=['id'])
+        post = Projection(
+            columns={'id': 'id', 'title': 'title', 'created_at': 'created'},
+            computed={'summary': ['body']},
+            relations={'author': Relation('users', columns='author_id', projection=user)},
+            always=['id'],
+        )
+
+        @query
+        def posts(parent, info):
+            result = post.project(info)
+            sql = f"SELECT {', '.join(result.columns)} FROM posts"
+
+    Field names are the snake case names used by `parse_info`. Selected fields which are
+    not declared are ignored, unless `default_columns` is True, then they are mapped to
+    the column of the same name. Results are cached per selection.
+
+    The fields of inline fragments are projected too. `types` are the names of the GraphQL
+    types of the rows, the object type and its interfaces: when given, inline fragments on
+    other types are left out.
+    """
+
+    def __init__(
+        self,
+        columns: Union[Iterable[str], Mapping[str, Columns]] = (),
+        computed: Mapping[str, Columns] = None,
+        relations: Mapping[str, Relation] = None,
+        always: Columns = (),
+        default_columns: bool = False,
+        cache_size: int = 1024,
+        types: Columns = (),
+    ) -> None:
+        if isinstance(columns, Mapping):
+            self.columns = {name: as_tuple(value) for name, value in columns.items()}
+        else:
+            self.columns = {name: (name,) for name in columns}
+        for name, value in (computed or {}).items():
+            self.columns[name] = as_tuple(value)
+        self.relations: Dict[str, Relation] = dict(relations or {})
+        self.always = as_tuple(always)
+        self.default_columns = default_columns
+        self.types = frozenset(as_tuple(types))
+        self.cache = LRUCache(cache_size)
+
+    def project(
+        self, selection: Union[graphql.GraphQLResolveInfo, FieldMeta, Selection]
+    ) -> ProjectionResult:
+        """Return the minimal columns and joins for the selection."""
+        if isinstance(selection, FieldMeta):
+            selection = selection.selection
+        elif not isinstance(selection, Selection):
+            selection = parse_info(selection).selection
+
+        # Selections are shared by all requests of a document, keep it with the result
+        # so its id can not be reused.
+        entry = self.cache.get(id(selection))
+        if entry is None:
+            entry = (selection, self.build(selection))
+            self.cache.set(id(selection), entry)
+        return entry[1]
+
+    def build(self, selection: Selection) -> ProjectionResult:
+        columns: Dict[str, None] = dict.fromkeys(self.always)
+        joins: Dict[str, None] = {}
+        relation_results: Dict[str, List[ProjectionResult]] = {}
+
+        for selection in self.iter_selections(selection):
+            for name in selection.sections:
+                self.add_field(name, columns)
+
+            for name, child in selection.children.items():
+                relation = self.relations.get(name)
+                if relation is None:
+                    self.add_field(name, columns)
+                    continue
+
+                columns.update(dict.fromkeys(relation.columns))
+                joins[relation.join] = None
+                if relation.projection is not None:
+                    relation_results.setdefault(name, []).append(relation.projection.project(child))
+
+        relations: Dict[str, ProjectionResult] = {}
+        for name, results in relation_results.items():
+            result = relations[name] = merge_results(results)
+            for join in result.joins:
+                joins[f'{self.relations[name].join}.{join}'] = None
+
+        return ProjectionResult(tuple(columns), tuple(joins), relations)
+
+    def iter_selections(self, selection: Selection) -> Iterator[Selection]:
+        """Yield the selection and its inline fragments on the projected types."""
+        yield selection
+        for type_name, fragment in selection.inline_fragments.items():
+            if not self.types or type_name in self.types:
+                yield from self.iter_selections(fragment)
+
+    def add_field(self, name: str, columns: Dict[str, None]) -> None:
+        if name in self.columns:
+            columns.update(dict.fromkeys(self.columns[name]))
+        elif name in self.relations:
+            relation = self.relations[name]
+            columns.update(dict.fromkeys(relation.columns))
+        elif self.default_columns:
+            columns[name] = None
+
+    def clear_cache(self) -> None:
+        self.cache.clear()
@@ -0,0 +1,150 @@
+from typing import Any, Collection, Union
+
+from graphql import (
+    GraphQLFieldResolver,
+    GraphQLSchema,
+    assert_scalar_type,
+    is_enum_type,
+    is_interface_type,
+    is_object_type,
+    is_scalar_type,
+    is_union_type,
+)
+
+from . import enum, resolver, scalar
+
+# What `Registry.register` registers.
+KINDS = ('field_resolvers', 'type_resolvers', 'reference_resolvers', 'enums', 'scalars')
+
+
+class Registry:
+    """Resolvers, enums and scalars of the schemas built with it.
+
+        registry = Registry()
+
+        @registry.query
+        def hello(parent, info, name: str) -> str:
+            return name
+
+        schema = make_schema(type_defs, registry=registry)
+
+    The module level decorators, like `gql.query`, register in `default_registry`, which is
+    used when `make_schema` is not given a registry. Schemas built with different registries
+    do not share resolvers and can be built concurrently.
+    """
+
+    def __init__(
+        self,
+        field_resolvers: resolver.FieldResolverMap = None,
+        type_resolvers: resolver.TypeResolverMap = None,
+        reference_resolvers: resolver.ReferenceResolverMap = None,
+        enum_types: enum.EnumTypeMap = None,
+        scalar_types: scalar.ScalarTypeMap = None,
+    ) -> None:
+        self.field_resolvers = {} if field_resolvers is None else field_resolvers
+        self.type_resolvers = {} if type_resolvers is None else type_resolvers
+        self.reference_resolvers = {} if reference_resolvers is None else reference_resolvers
+        self.enum_types = {} if enum_types is None else enum_types
+        self.scalar_types = (
+            dict(scalar.builtin_scalar_types) if scalar_types is None else scalar_types
+        )
+
+    def field_resolver(
+        self,
+        type_name: str,
+        func_or_field: Union[GraphQLFieldResolver, str] = None,
+        print_exc: bool = True,
+        snake_argument: bool = True,
+    ):
+        return resolver.field_resolver(
+            type_name,
+            func_or_field,
+            print_exc,
+            snake_argument,
+            resolver_map=self.field_resolvers,
+        )
+
+    def query(self, func_or_field: Union[GraphQLFieldResolver, str] = None, **kwargs: Any):
+        return self.field_resolver('Query', func_or_field, **kwargs)
+
+    def mutate(self, func_or_field: Union[GraphQLFieldResolver, str] = None, **kwargs: Any):
+        return self.field_resolver('Mutation', func_or_field, **kwargs)
+
+    def subscribe(self, func_or_field: Union[GraphQLFieldResolver, str] = None, **kwargs: Any):
+        return self.field_resolver('Subscription', func_or_field, **kwargs)
+
+    def type_resolver(self, type_name: str):
+        return resolver.type_resolver(type_name, resolver_map=self.type_resolvers)
+
+    def reference_resolver(self, type_name: str):
+        return resolver.reference_resolver(type_name, resolver_map=self.reference_resolvers)
+
+    def enum_type(self, _cls):
+        return enum.enum_type(_cls, type_map=self.enum_types)
+
+    def scalar_type(self, _cls):
+        return scalar.scalar_type(_cls, type_map=self.scalar_types)
+
+    def register(
+        self,
+        schema: GraphQLSchema,
+        type_names: Collection[str] = None,
+        overwrite: bool = True,
+        kinds: Collection[str] = KINDS,
+    ) -> GraphQLSchema:
+        """Register on the types of the schema, or on `type_names` only, in one pass.
+
+        Without `overwrite`, only fields which have no resolver yet are registered. `kinds`
+        selects what is registered, among `KINDS`.
+        """
+        type_map = schema.type_map
+        if type_names is None:
+            types = type_map.items()
+        else:
+            types = [(name, type_map[name]) for name in type_names if name in type_map]
+        field_resolvers = self.field_resolvers if 'field_resolvers' in kinds else {}
+        reference_resolvers = self.reference_resolvers if 'reference_resolvers' in kinds else {}
+        type_resolvers = self.type_resolvers if 'type_resolvers' in kinds else {}
+        enums = 'enums' in kinds
+        scalar_types = self.scalar_types if 'scalars' in kinds else {}
+
+        has_enum_types = False
+        for type_name, type_ in types:
+            if type_name.startswith('__'):
+                continue
+
+            if is_object_type(type_) or is_interface_type(type_):
+                type_field_resolvers = field_resolvers.get(type_name)
+                if type_field_resolvers:
+                    resolver.set_field_resolvers(type_, type_field_resolvers, overwrite)
+                reference_resolver = reference_resolvers.get(type_name)
+                if reference_resolver:
+                    type_.__resolve_reference__ = reference_resolver
+
+            if is_interface_type(type_) or is_union_type(type_):
+                type_resolver = type_resolvers.get(type_name)
+                if type_resolver:
+                    type_.resolve_type = type_resolver
+            elif is_enum_type(type_):
+                if enums:
+                    enum_type = self.enum_types.get(type_name)
+                    enum.set_enum_values(type_, enum_type)
+                    has_enum_types = has_enum_types or enum_type is not None
+            elif type_name in scalar_types:
+                if not is_scalar_type(type_):
+                    raise Exception(f'{type_name} is not a scalar type.')
+                scalar.set_scalar(assert_scalar_type(type_), scalar_types[type_name])
+
+        if has_enum_types:
+            enum.set_default_values(schema)
+        return schema
+
+
+# The registry of the module level decorators.
+default_registry = Registry(
+    resolver.field_resolver_map,
+    resolver.type_resolver_map,
+    resolver.reference_resolver_map,
+    enum.enum_type_map,
+    scalar.scalar_type_map,
+)
@@ -0,0 +1,163 @@
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from graphql import GraphQLSchema
+
+from .schema import make_schema
+from .schema_loader import SchemaLoadError, find_schema_files, read_type_defs
+from .utils import TypeDefs
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[GraphQLSchema], Any]
+
+
+class SchemaFile(NamedTuple):
+    mtime_ns: int
+    size: int
+    digest: str
+    type_defs: TypeDefs
+
+
+class SchemaManager:
+    """Keep a schema built from a path up to date with its files.
+
+        manager = SchemaManager('./schema', recursive=True)
+        manager.start(interval=1.0)  # or call manager.check() when convenient
+
+        graphql(manager.schema, query)
+
+    Files are polled by mtime and size, then compared by content hash. Only the changed
+    files are parsed again, the schema is rebuilt from the cached documents and swapped in
+    at once: executions which already got the previous schema finish with it. When the
+    rebuild fails, the previous schema is kept and the error is kept in `error`.
+
+    The parse_info caches are cleared on every swap, listeners are called with the new
+    schema to clear other caches, for example `Projection.clear_cache`.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        include: Sequence[str] = ('*.graphql',),
+        exclude: Sequence[str] = (),
+        recursive: bool = False,
+        **options: Any,
+    ) -> None:
+        self.path = Path(path)
+        self.include = include
+        self.exclude = exclude
+        self.recursive = recursive
+        # keyword arguments of `make_schema`
+        self.options = options
+        self.listeners: List[Listener] = []
+        self.files: Dict[Path, SchemaFile] = {}
+        self.error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._schema: Optional[GraphQLSchema] = None
+
+        self.check()
+        if self._schema is None:
+            raise self.error  # type: ignore
+
+    @property
+    def schema(self) -> GraphQLSchema:
+        return self._schema  # type: ignore
+
+    def add_listener(self, listener: Listener) -> None:
+        self.listeners.append(listener)
+
+    def find_files(self) -> List[Path]:
+        if self.path.is_file():
+            return [self.path]
+        return find_schema_files(self.path, self.include, self.exclude, self.recursive)
+
+    def scan(self) -> Tuple[Dict[Path, SchemaFile], bool]:
+        """Return the files and whether their contents changed since the last scan."""
+        files: Dict[Path, SchemaFile] = {}
+        errors = []
+        changed = False
+        for path in self.find_files():
+            stat = path.stat()
+            cached = self.files.get(path)
+            if cached and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+                files[path] = cached
+                continue
+
+            content = path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if cached and cached.digest == digest:
+                files[path] = cached._replace(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                continue
+
+            type_defs, error = read_type_defs(str(path))
+            if type_defs is None:
+                errors.append((str(path), error))
+                continue
+            files[path] = SchemaFile(stat.st_mtime_ns, stat.st_size, digest, type_defs)
+            changed = True
+
+        if errors:
+            raise SchemaLoadError(errors)
+        # files were removed or renamed
+        changed = changed or list(files) != list(self.files)
+        return files, changed
+
+    def check(self) -> bool:
+        """Rebuild and swap the schema if the files changed, return True if swapped."""
+        with self._lock:
+            try:
+                files, changed = self.scan()
+                # a schema which fails to build is not rebuilt until the files change again
+                self.files = files
+                if not changed and self._schema is not None:
+                    return False
+                schema = make_schema(
+                    [schema_file.type_defs for schema_file in files.values()], **self.options
+                )
+            except Exception as e:
+                if str(e) != str(self.error):  # log once while the files are broken
+                    logger.exception(f'Failed to reload schema from {self.path}.')
+                self.error = e
+                return False
+
+            self.error = None
+            self.swap(schema)
+            return True
+
+    def swap(self, schema: GraphQLSchema) -> None:
+        from .parser import clear_caches
+
+        self._schema = schema
+        clear_caches()
+        for listener in self.listeners:
+            try:
+                listener(schema)
+            except Exception:
+                logger.exception('Schema reload listener failed.')
+
+    def start(self, interval: float = 1.0) -> None:
+        """Poll the files in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name='gql-schema-reload', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.check()
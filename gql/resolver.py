@@ -9,18 +9,19 @@ from typing import Any, Callable, Dict, Mapping, Union
 
 from graphql import (
     GraphQLFieldResolver,
+    GraphQLInterfaceType,
+    GraphQLObjectType,
+    GraphQLOutputType,
     GraphQLResolveInfo,
     GraphQLSchema,
     GraphQLTypeResolver,
-    assert_interface_type,
-    assert_object_type,
-    assert_union_type,
-    is_interface_type,
-    is_object_type,
-    is_union_type,
+    get_nullable_type,
+    is_enum_type,
 )
+from graphql.pyutils import Undefined
 
 from .depends import ResolverDepends
+from .lookahead import get_prefetched
 from .utils import execute_async_function, recursive_to_snake_case, to_camel_case, to_snake_case
 
 
@@ -43,10 +44,12 @@ def print_resolver_error(info: GraphQLResolveInfo):
     )
 
 
-def reference_resolver(type_name: str):
-    if type_name in reference_resolver_map:
+def reference_resolver(type_name: str, *, resolver_map: ReferenceResolverMap = None):
+    if resolver_map is None:
+        resolver_map = reference_resolver_map
+    if type_name in resolver_map:
         raise Exception(
-            f"{type_name} is already registered by " f"{reference_resolver_map[type_name].__code__}"
+            f"{type_name} is already registered by " f"{resolver_map[type_name].__code__}"
         )
 
     def wrap(func: ReferenceResolver):
@@ -79,22 +82,24 @@ def reference_resolver(type_name: str):
                 raise exc
 
         if iscoroutinefunction(func):
-            reference_resolver_map[type_name] = async_resolver
+            resolver_map[type_name] = async_resolver
             return async_resolver
-        reference_resolver_map[type_name] = sync_resolver
+        resolver_map[type_name] = sync_resolver
         return sync_resolver
 
     return wrap
 
 
-def type_resolver(type_name: str):
-    if type_name in type_resolver_map:
+def type_resolver(type_name: str, *, resolver_map: TypeResolverMap = None):
+    if resolver_map is None:
+        resolver_map = type_resolver_map
+    if type_name in resolver_map:
         raise Exception(
-            f"{type_name} is already registered by " f"{type_resolver_map[type_name].__code__}"
+            f"{type_name} is already registered by " f"{resolver_map[type_name].__code__}"
         )
 
     def wrap(func):
-        type_resolver_map[type_name] = func
+        resolver_map[type_name] = func
         return func
 
     return wrap
@@ -105,10 +110,19 @@ def field_resolver(
     func_or_field: Union[GraphQLFieldResolver, str] = None,
     print_exc: bool = True,
     snake_argument: bool = True,
+    *,
+    resolver_map: FieldResolverMap = None,
 ):
+    if resolver_map is None:
+        resolver_map = field_resolver_map
+
     def wrap(func: GraphQLFieldResolver):
         @wraps(func)
         def sync_resolver(parent, info, **kwargs):
+            prefetched = get_prefetched(parent, info)
+            if prefetched is not Undefined:
+                return prefetched
+
             if snake_argument:
                 kwargs = recursive_to_snake_case(kwargs)
 
@@ -128,6 +142,10 @@ def field_resolver(
 
         @wraps(func)
         async def async_resolver(parent, info, **kwargs):
+            prefetched = get_prefetched(parent, info)
+            if prefetched is not Undefined:
+                return prefetched
+
             if snake_argument:
                 kwargs = recursive_to_snake_case(kwargs)
 
@@ -150,17 +168,17 @@ def field_resolver(
         else:
             name = to_camel_case(func.__name__)
 
-        if type_name in field_resolver_map and name in field_resolver_map[type_name]:
+        type_resolvers = resolver_map.setdefault(type_name, {})
+        if name in type_resolvers:
             raise Exception(
-                f"{type_name}.{name} is already registered by "
-                f"{field_resolver_map[type_name][name].__code__}"
+                f"{type_name}.{name} is already registered by {type_resolvers[name].__code__}"
             )
 
         if iscoroutinefunction(func):
-            field_resolver_map[type_name][name] = async_resolver
+            type_resolvers[name] = async_resolver
             return async_resolver
 
-        field_resolver_map[type_name][name] = sync_resolver
+        type_resolvers[name] = sync_resolver
         return sync_resolver
 
     if isfunction(func_or_field):
@@ -174,48 +192,50 @@ query = partial(field_resolver, 'Query')
 subscribe = partial(field_resolver, 'Subscription')
 
 
+def set_field_resolvers(
+    type_: Union[GraphQLObjectType, GraphQLInterfaceType],
+    field_resolvers: Mapping[str, GraphQLFieldResolver],
+    overwrite: bool = True,
+):
+    for name, field_resolver in field_resolvers.items():
+        field = type_.fields.get(name)
+        if not field:
+            continue
+        if type_.name == 'Subscription':
+            if overwrite or field.subscribe is None:
+                field.subscribe = field_resolver
+        elif overwrite or field.resolve is None:
+            field.resolve = field_resolver
+
+
 def register_reference_resolvers(schema: GraphQLSchema):
-    for type_name, resolver in reference_resolver_map.items():
-        type_ = schema.get_type(type_name)
-        type_.__resolve_reference__ = resolver
+    """Set the reference resolvers of the module level decorators on the schema."""
+    from .registry import default_registry
+
+    default_registry.register(schema, kinds=('reference_resolvers',))
 
 
 def register_type_resolvers(schema: GraphQLSchema):
-    for type_name, type_resolver in type_resolver_map.items():
-        type_ = schema.get_type(type_name)
-        if is_interface_type(type_):
-            type_ = assert_interface_type(type_)
-        elif is_union_type(type_):
-            type_ = assert_union_type(type_)
-        else:
-            continue
-        type_.resolve_type = type_resolver
+    """Set the type resolvers of the module level decorators on the schema."""
+    from .registry import default_registry
+
+    default_registry.register(schema, kinds=('type_resolvers',))
 
 
 def register_field_resolvers(schema: GraphQLSchema):
-    for type_name, field_resolvers in field_resolver_map.items():
-        type_ = schema.get_type(type_name)
-        if is_object_type(type_):
-            type_ = assert_object_type(type_)
-        elif is_interface_type(type_):
-            type_ = assert_interface_type(type_)
-        else:
-            continue
+    """Set the field resolvers of the module level decorators on the schema."""
+    from .registry import default_registry
 
-        for name, field_resolver in field_resolvers.items():
-            field = type_.fields.get(name)
-            if not field:
-                continue
-            if type_name == 'Subscription':
-                field.subscribe = field_resolver
-            else:
-                field.resolve = field_resolver
+    default_registry.register(schema, kinds=('field_resolvers',))
 
 
 def register_resolvers(schema: GraphQLSchema):
-    register_field_resolvers(schema)
-    register_type_resolvers(schema)
-    register_reference_resolvers(schema)
+    """Set the field, type and reference resolvers of the module level decorators."""
+    from .registry import default_registry
+
+    default_registry.register(
+        schema, kinds=('field_resolvers', 'type_resolvers', 'reference_resolvers')
+    )
 
 
 def get_field_value(source, field_name):
@@ -235,6 +255,10 @@ def default_field_resolver(source, info, **args):
     For dictionaries, the field names are used as keys, for all other objects they are
     used as attribute names.
     """
+    prefetched = get_prefetched(source, info)
+    if prefetched is not Undefined:
+        return prefetched
+
     # Ensure source is a value for which property access is acceptable.
     value = get_field_value(source, to_snake_case(info.field_name))
     if value is None:
@@ -242,6 +266,17 @@ def default_field_resolver(source, info, **args):
 
     if callable(value):
         return value(info, **args)
-    if isinstance(value, Enum):
+    if isinstance(value, Enum) and not is_enum_member_of(value, info.return_type):
         return value.value
     return value
+
+
+def is_enum_member_of(value: Enum, type_: GraphQLOutputType) -> bool:
+    """Return whether the value is a member of the Python Enum registered for the type."""
+    type_ = get_nullable_type(type_)
+    if not is_enum_type(type_):
+        return False
+    try:
+        return value in type_._value_lookup
+    except TypeError:
+        return False
@@ -1,55 +1,59 @@
-import json
 from datetime import datetime, timezone
 from inspect import isclass
 from numbers import Number
-from typing import Any, Dict
-
-from graphql import (
-    INVALID,
-    GraphQLSchema,
-    IntValueNode,
-    StringValueNode,
-    assert_scalar_type,
-    is_scalar_type,
-)
+from typing import Any, Dict, List, Sequence
+
+from graphql import INVALID, GraphQLScalarType, GraphQLSchema, IntValueNode, StringValueNode
 from graphql.pyutils import inspect, is_integer
 
+from . import codec
+
 ScalarTypeMap = Dict[str, Any]
 
 scalar_type_map: ScalarTypeMap = {}
 
 
-def scalar_type(_cls):
+def scalar_type(_cls, *, type_map: ScalarTypeMap = None):
+    if type_map is None:
+        type_map = scalar_type_map
+
     # if _cls is a class, use _cls name.
     if isclass(_cls):
-        scalar_type_map[_cls.__name__] = _cls
+        type_map[_cls.__name__] = _cls
         return _cls
 
     # if not, _cls is type name.
     def wrap(cls):
-        scalar_type_map[_cls] = cls
+        type_map[_cls] = cls
         return cls
 
     return wrap
 
 
+def set_scalar(type_: GraphQLScalarType, _scalar_type: Any):
+    serialize = getattr(_scalar_type, 'serialize', None)
+    if serialize:
+        type_.serialize = serialize
+    # batch hooks, called with the whole list of a list type
+    serialize_many = getattr(_scalar_type, 'serialize_many', None)
+    if serialize_many:
+        type_.serialize_many = serialize_many
+    parse_many = getattr(_scalar_type, 'parse_many', None)
+    if parse_many:
+        type_.parse_many = parse_many
+    parse_value = getattr(_scalar_type, 'parse_value', None)
+    if parse_value:
+        type_.parse_value = parse_value
+    parse_literal = getattr(_scalar_type, 'parse_literal', None)
+    if parse_literal:
+        type_.parse_literal = parse_literal
+
+
 def register_scalars(schema: GraphQLSchema):
-    for type_name, _scalar_type in scalar_type_map.items():
-        type_ = schema.get_type(type_name)
-        if not type_:
-            continue
-        if not is_scalar_type(type_):
-            raise Exception(f'{type_name} is not a scalar type.')
-        type_ = assert_scalar_type(type_)
-        serialize = getattr(_scalar_type, 'serialize', None)
-        if serialize:
-            type_.serialize = serialize
-        parse_value = getattr(_scalar_type, 'parse_value', None)
-        if parse_value:
-            type_.parse_value = parse_value
-        parse_literal = getattr(_scalar_type, 'parse_literal', None)
-        if parse_literal:
-            type_.parse_literal = parse_literal
+    """Set the functions of the registered scalar types on the schema."""
+    from .registry import default_registry
+
+    default_registry.register(schema, kinds=('scalars',))
 
 
 @scalar_type
@@ -85,12 +89,27 @@ class Timestamp:
             raise TypeError(f'Timestamp cannot represent non datetime value: {inspect(value)}')
         return int(value.timestamp() * 1000)
 
+    @staticmethod
+    def serialize_many(values: Sequence[Any]) -> List[int]:
+        types = set(map(type, values))
+        if types <= {datetime}:
+            return [int(value.timestamp() * 1000) for value in values]
+        if types <= {int}:
+            return list(values)
+        return [Timestamp.serialize(value) for value in values]
+
     @staticmethod
     def parse_value(value: Any) -> datetime:
         if not is_integer(value):
             raise TypeError(f'Timestamp cannot represent non datetime value: {inspect(value)}')
         return datetime.utcfromtimestamp(int(value) / 1000).replace(tzinfo=timezone.utc)
 
+    @staticmethod
+    def parse_many(values: Sequence[Any]) -> List[datetime]:
+        if set(map(type, values)) <= {int}:
+            return [datetime.fromtimestamp(value / 1000, timezone.utc) for value in values]
+        return [Timestamp.parse_value(value) for value in values]
+
     @staticmethod
     def parse_literal(ast, _variables=None):
         if isinstance(ast, IntValueNode):
@@ -99,6 +118,10 @@ class Timestamp:
         return INVALID
 
 
+# types `JSONString.serialize_many` serializes, the others are serialized one by one.
+_json_types = {str, dict, list, tuple, bool, int, float}
+
+
 @scalar_type
 class JSONString:
     description = "The `JSONString` represents a json string."
@@ -106,7 +129,7 @@ class JSONString:
     @staticmethod
     def serialize(value: Any) -> str:
         if isinstance(value, (dict, list, tuple)):
-            return json.dumps(value, ensure_ascii=False)
+            return codec.dumps(value)
 
         if isinstance(value, str):
             return value
@@ -114,15 +137,34 @@ class JSONString:
             return "true" if value else "false"
         return str(value)
 
+    @staticmethod
+    def serialize_many(values: Sequence[Any]) -> List[str]:
+        types = set(map(type, values))
+        if types <= {str}:
+            return list(values)
+        if not types <= _json_types:
+            raise TypeError(f'JSONString cannot represent values of types: {inspect(types)}')
+        return [JSONString.serialize(value) for value in values]
+
     @staticmethod
     def parse_value(value: Any) -> dict:
         if not isinstance(value, str):
             raise TypeError(f'JSONString cannot represent non string value: {inspect(value)}')
-        return json.loads(value)
+        return codec.loads(value)
+
+    @staticmethod
+    def parse_many(values: Sequence[Any]) -> List[Any]:
+        if not set(map(type, values)) <= {str}:
+            raise TypeError(f'JSONString cannot represent non string values: {inspect(values)}')
+        return [codec.loads(value) for value in values]
 
     @staticmethod
     def parse_literal(ast, _variables=None):
         if isinstance(ast, StringValueNode):
-            return json.loads(ast.value)
+            return codec.loads(ast.value)
 
         return INVALID
+
+
+# scalars of this library, in every registry.
+builtin_scalar_types: ScalarTypeMap = dict(scalar_type_map)
@@ -1,89 +1,141 @@
 from pathlib import Path
-from typing import Dict, List, Type, Union, cast
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Type, Union, cast
 
 from graphql import (
+    DocumentNode,
     GraphQLObjectType,
     GraphQLSchema,
     GraphQLUnionType,
-    build_schema,
+    build_ast_schema,
     extend_schema,
     parse,
 )
 
-from .enum import register_enums
-from .federation import (
-    federation_entity_type_defs,
-    federation_service_type_defs,
-    get_entity_types,
-    purge_schema_directives,
-    remove_subscription,
-    resolve_entities,
-)
-from .resolver import register_resolvers
-from .scalar import register_scalars
-from .schema_visitor import SchemaDirectiveVisitor
-from .utils import join_type_defs
+from .registry import Registry, default_registry
+from .schema_loader import find_schema_files, load_type_defs
+from .utils import TypeDefs, join_documents, join_type_defs, parse_type_defs
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .metrics import ResolverMetrics
+    from .schema_visitor import SchemaDirectiveVisitor
 
-def make_schema(
+# Federation, directive visitors and the schema cache are imported when they are used.
+
+
+def parse_schema_type_defs(
     type_defs: Union[str, List[str]],
-    assume_valid: bool = False,
-    assume_valid_sdl: bool = False,
     no_location: bool = False,
     experimental_fragment_variables: bool = False,
     federation: bool = False,
     add_federation_defs: bool = True,
-    directives: Dict[str, Type[SchemaDirectiveVisitor]] = None,
-) -> GraphQLSchema:
-    if isinstance(type_defs, list):
-        type_defs = join_type_defs(type_defs)
+) -> Tuple[DocumentNode, Optional[str]]:
+    """Return the merged document of the type defs and the federation service sdl.
 
+    Type defs returned by `gql` or `parse_from_file` are not parsed again.
+    """
+    if not isinstance(type_defs, list):
+        type_defs = [type_defs]
+
+    documents = [
+        parse_type_defs(t, no_location, experimental_fragment_variables)
+        for t in type_defs
+        if isinstance(t, TypeDefs) or t.strip()
+    ]
+
+    sdl = None
     if federation:
+        from .federation import federation_service_document, purge_schema_directives
+
         # Remove custom schema directives (to avoid apollo-gateway crashes).
-        sdl = purge_schema_directives(type_defs)
+        sdl = purge_schema_directives(join_type_defs(type_defs))
 
         # remove subscription because Apollo Federation not support subscription yet.
         # type_defs = remove_subscription(type_defs)
 
         if add_federation_defs:
-            type_defs = join_type_defs([type_defs, federation_service_type_defs])
-        schema = build_schema(
-            type_defs, assume_valid, assume_valid_sdl, no_location, experimental_fragment_variables
-        )
-        entity_types = get_entity_types(schema)
-        if entity_types:
-            schema = extend_schema(schema, parse(federation_entity_type_defs))
-
-            # Add _entities query.
-            entity_type = schema.get_type("_Entity")
-            if entity_type:
-                entity_type = cast(GraphQLUnionType, entity_type)
-                entity_type.types = entity_types
-
-            query_type = schema.get_type("Query")
-            if query_type:
-                query_type = cast(GraphQLObjectType, query_type)
-                query_type.fields["_entities"].resolve = resolve_entities
-
-        # Add _service query.
+            documents.append(federation_service_document)
+    return join_documents(documents), sdl
+
+
+def build_document_schema(
+    document: DocumentNode,
+    sdl: Optional[str] = None,
+    federation: bool = False,
+    assume_valid: bool = False,
+    assume_valid_sdl: bool = False,
+) -> GraphQLSchema:
+    schema = build_ast_schema(document, assume_valid, assume_valid_sdl)
+    if not federation:
+        return schema
+
+    from .federation import federation_entity_document, get_entity_types, resolve_entities
+
+    if get_entity_types(schema):
+        schema = extend_schema(schema, federation_entity_document)
+
+        # Add _entities query, with the types of the extended schema.
+        entity_type = schema.get_type("_Entity")
+        if entity_type:
+            entity_type = cast(GraphQLUnionType, entity_type)
+            entity_type.types = get_entity_types(schema)
+
         query_type = schema.get_type("Query")
         if query_type:
             query_type = cast(GraphQLObjectType, query_type)
-            query_type.fields["_service"].resolve = lambda _service, info: {"sdl": sdl}
-    else:
-        schema = build_schema(
-            type_defs, assume_valid, assume_valid_sdl, no_location, experimental_fragment_variables
-        )
+            query_type.fields["_entities"].resolve = resolve_entities
 
-    register_resolvers(schema)
-    register_enums(schema)
-    register_scalars(schema)
+    # Add _service query.
+    query_type = schema.get_type("Query")
+    if query_type:
+        query_type = cast(GraphQLObjectType, query_type)
+        query_type.fields["_service"].resolve = lambda _service, info: {"sdl": sdl}
+    return schema
+
+
+def finish_schema(
+    schema: GraphQLSchema,
+    directives: Dict[str, Type['SchemaDirectiveVisitor']] = None,
+    metrics: 'ResolverMetrics' = None,
+    registry: Registry = None,
+    compact: bool = False,
+) -> GraphQLSchema:
+    (registry or default_registry).register(schema)
 
     if directives:
+        from .schema_visitor import SchemaDirectiveVisitor
+
         SchemaDirectiveVisitor.visit_schema_directives(schema, directives)
+
+    if metrics:
+        metrics.instrument(schema)
+
+    if compact:
+        from .compact import compact_schema
+
+        compact_schema(schema)
     return schema
 
 
+def make_schema(
+    type_defs: Union[str, List[str]],
+    assume_valid: bool = False,
+    assume_valid_sdl: bool = False,
+    no_location: bool = False,
+    experimental_fragment_variables: bool = False,
+    federation: bool = False,
+    add_federation_defs: bool = True,
+    directives: Dict[str, Type['SchemaDirectiveVisitor']] = None,
+    metrics: 'ResolverMetrics' = None,
+    registry: Registry = None,
+    compact: bool = False,
+) -> GraphQLSchema:
+    document, sdl = parse_schema_type_defs(
+        type_defs, no_location, experimental_fragment_variables, federation, add_federation_defs
+    )
+    schema = build_document_schema(document, sdl, federation, assume_valid, assume_valid_sdl)
+    return finish_schema(schema, directives, metrics, registry, compact)
+
+
 def make_schema_from_file(
     file: str,
     assume_valid: bool = False,
@@ -92,7 +144,10 @@ def make_schema_from_file(
     experimental_fragment_variables: bool = False,
     federation: bool = False,
     add_federation_defs: bool = True,
-    directives: Dict[str, Type[SchemaDirectiveVisitor]] = None,
+    directives: Dict[str, Type['SchemaDirectiveVisitor']] = None,
+    metrics: 'ResolverMetrics' = None,
+    registry: Registry = None,
+    compact: bool = False,
 ) -> GraphQLSchema:
     with open(file, 'r') as f:
         schema = make_schema(
@@ -104,15 +159,17 @@ def make_schema_from_file(
             federation,
             add_federation_defs,
             directives,
+            metrics,
+            registry,
+            compact,
         )
         return schema
 
 
-def parse_from_file(file: Path):
+def parse_from_file(file: Path, no_location: bool = False) -> TypeDefs:
     with file.open('r') as f:
         type_defs = f.read()
-        parse(type_defs)
-        return type_defs
+        return TypeDefs(type_defs, parse(type_defs, no_location))
 
 
 def make_schema_from_path(
@@ -123,25 +180,76 @@ def make_schema_from_path(
     experimental_fragment_variables: bool = False,
     federation: bool = False,
     add_federation_defs: bool = True,
-    directives: Dict[str, Type[SchemaDirectiveVisitor]] = None,
+    directives: Dict[str, Type['SchemaDirectiveVisitor']] = None,
+    metrics: 'ResolverMetrics' = None,
+    cache_dir: Union[str, Path] = None,
+    include: Sequence[str] = ('*.graphql',),
+    exclude: Sequence[str] = (),
+    recursive: bool = False,
+    workers: int = None,
+    registry: Registry = None,
+    compact: bool = False,
 ):
     p = Path(path)
     if p.is_file():
-        type_defs = parse_from_file(p)
+        files = [p]
     elif p.is_dir():
-        type_defs = []
-        for file in p.glob('*.graphql'):
-            type_defs.extend([parse_from_file(file)])
+        files = find_schema_files(p, include, exclude, recursive)
     else:
         raise RuntimeError('path: expect a file or directory!')
 
-    return make_schema(
-        type_defs,
-        assume_valid,
-        assume_valid_sdl,
+    if cache_dir is None:
+        type_defs = load_type_defs(files, no_location, workers)
+        return make_schema(
+            type_defs,
+            assume_valid,
+            assume_valid_sdl,
+            no_location,
+            experimental_fragment_variables,
+            federation,
+            add_federation_defs,
+            directives,
+            metrics,
+            registry,
+            compact,
+        )
+
+    # Files are parsed only when the cache misses.
+    sources = []
+    for file in files:
+        with file.open('r') as f:
+            sources.append((file.relative_to(p).as_posix() if file != p else file.name, f.read()))
+
+    from .schema_cache import SchemaCache
+
+    cache = SchemaCache(cache_dir)
+    key = cache.key(
+        sources,
+        assume_valid=assume_valid,
+        assume_valid_sdl=assume_valid_sdl,
+        experimental_fragment_variables=experimental_fragment_variables,
+        federation=federation,
+        add_federation_defs=add_federation_defs,
+        directives=sorted(
+            (name, f'{visitor.__module__}.{visitor.__qualname__}')
+            for name, visitor in (directives or {}).items()
+        ),
+    )
+    artifacts = cache.load(key)
+    if artifacts is not None:
+        # The cached document was validated when it was built.
+        schema = build_document_schema(
+            artifacts['document'], artifacts['sdl'], federation, True, True
+        )
+        return finish_schema(schema, directives, metrics, registry, compact)
+
+    document, sdl = parse_schema_type_defs(
+        load_type_defs(files, no_location, workers),
         no_location,
         experimental_fragment_variables,
         federation,
         add_federation_defs,
-        directives,
     )
+    schema = build_document_schema(document, sdl, federation, assume_valid, assume_valid_sdl)
+    cache.dump(key, {'document': document, 'sdl': sdl})
+    return finish_schema(schema, directives, metrics, registry, compact)
@@ -0,0 +1,123 @@
+import copyreg
+import hashlib
+import io
+import logging
+import os
+import pickle
+import platform
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import graphql
+from graphql.language import Location
+from graphql.pyutils import FrozenList
+
+logger = logging.getLogger(__name__)
+
+# Bump when the format of the cached artifacts changes.
+CACHE_FORMAT = 1
+
+
+def _reduce_frozen_list(value: FrozenList):
+    return FrozenList, (list(value),)
+
+
+def _no_location() -> None:
+    return None
+
+
+def _reduce_location(_value: Location):
+    # Locations link every token of the source, they are not cached.
+    return _no_location, ()
+
+
+def _make_location(start: int, end: int, source: Any) -> Location:
+    location = Location.__new__(Location)
+    location.start = start
+    location.end = end
+    location.start_token = location.end_token = None  # type: ignore
+    location.source = source
+    return location
+
+
+def _reduce_location_range(value: Location):
+    # Keep the offsets and the source, enough to locate errors, but not the tokens.
+    return _make_location, (value.start, value.end, value.source)
+
+
+dispatch_table = copyreg.dispatch_table.copy()
+dispatch_table[FrozenList] = _reduce_frozen_list
+dispatch_table[Location] = _reduce_location
+
+location_dispatch_table = dispatch_table.copy()
+location_dispatch_table[Location] = _reduce_location_range
+
+
+def dumps(value: Any, locations: bool = False) -> bytes:
+    """Pickle graphql AST nodes, with the source ranges of the nodes if `locations`."""
+    f = io.BytesIO()
+    pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = location_dispatch_table if locations else dispatch_table
+    pickler.dump(value)
+    return f.getvalue()
+
+
+class SchemaCache:
+    """Cache the parsed (and validated) SDL of a schema on disk.
+
+    Entries are keyed by a hash of the sources, the versions of this library, graphql-core
+    and Python, the build options and the names of the schema directive visitors. Resolver,
+    enum and scalar registration still runs after loading, because those are Python objects.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+
+    def key(self, sources: Iterable[Tuple[str, str]], **options: Any) -> str:
+        from . import __version__
+
+        digest = hashlib.sha256()
+        header = (
+            CACHE_FORMAT,
+            __version__,
+            graphql.version,
+            platform.python_version(),
+            sorted((name, repr(value)) for name, value in options.items()),
+        )
+        digest.update(repr(header).encode())
+        for name, content in sources:
+            digest.update(name.encode())
+            digest.update(b'\0')
+            digest.update(content.encode())
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f'{key}.schema.pickle'
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self.path(key)
+        try:
+            with path.open('rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:  # corrupted or incompatible, it is rebuilt.
+            logger.warning(f'Failed to load schema cache {path}, ignore it.', exc_info=True)
+            return None
+
+    def dump(self, key: str, artifacts: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = dumps(artifacts)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
@@ -0,0 +1,102 @@
+import os
+from itertools import repeat
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from graphql import GraphQLError, Source, parse
+
+from .utils import TypeDefs
+
+# Files are loaded in a process pool when there are at least this many.
+PARALLEL_FILES = 200
+
+
+class SchemaLoadError(Exception):
+    """Raised with the errors of all the schema files which failed to parse."""
+
+    def __init__(self, errors: List[Tuple[str, str]]) -> None:
+        self.errors = errors
+        super().__init__('\n\n'.join(error for _, error in errors))
+
+
+def cpu_count() -> int:
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def find_schema_files(
+    path: Path,
+    include: Sequence[str] = ('*.graphql',),
+    exclude: Sequence[str] = (),
+    recursive: bool = False,
+) -> List[Path]:
+    """Return the schema files of the directory, sorted by their relative path.
+
+    Patterns are matched against the path relative to the directory, like `PurePath.match`.
+    """
+    files = []
+    for file in path.rglob('*') if recursive else path.glob('*'):
+        relative = file.relative_to(path)
+        if not any(relative.match(pattern) for pattern in include):
+            continue
+        if any(relative.match(pattern) for pattern in exclude):
+            continue
+        if file.is_file():
+            files.append(file)
+    return sorted(files, key=lambda file: file.relative_to(path).parts)
+
+
+def read_type_defs(file: str, no_location: bool = False) -> Tuple[Optional[TypeDefs], str]:
+    """Return the parsed type defs of the file, or None and the syntax error."""
+    with open(file, 'r') as f:
+        content = f.read()
+    try:
+        return TypeDefs(content, parse(Source(content, file), no_location)), ''
+    except GraphQLError as error:
+        return None, str(error)
+
+
+def _load_type_defs(file: str, no_location: bool) -> bytes:
+    # Run in the pool, AST nodes need the pickler of the schema cache.
+    from .schema_cache import dumps
+
+    type_defs, error = read_type_defs(file, no_location)
+    if type_defs is None:
+        return dumps((None, None, error))
+    return dumps((str(type_defs), type_defs.document, error), locations=not no_location)
+
+
+def load_type_defs(
+    files: Sequence[Path], no_location: bool = False, workers: int = None
+) -> List[TypeDefs]:
+    """Read and parse the files, in a process pool when `workers` is more than 1.
+
+    By default a pool of one worker per cpu is used for `PARALLEL_FILES` files or more.
+    The type defs keep the order of the files. Raise `SchemaLoadError` with the errors of
+    all the files which failed to parse.
+    """
+    if workers is None:
+        workers = cpu_count() if len(files) >= PARALLEL_FILES else 1
+    names = [str(file) for file in files]
+
+    results: List[Tuple[Optional[TypeDefs], str]] = []
+    if workers > 1 and len(names) > 1:
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = min(workers, len(names))
+        chunksize = max(1, len(names) // (workers * 4))
+        with ProcessPoolExecutor(workers) as executor:
+            for data in executor.map(
+                _load_type_defs, names, repeat(no_location), chunksize=chunksize
+            ):
+                content, document, error = pickle.loads(data)
+                results.append((None if error else TypeDefs(content, document), error))
+    else:
+        results = [read_type_defs(name, no_location) for name in names]
+
+    errors = [(name, error) for name, (_, error) in zip(names, results) if error]
+    if errors:
+        raise SchemaLoadError(errors)
+    return [type_defs for type_defs, _ in results]  # type: ignore
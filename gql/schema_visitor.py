@@ -35,6 +35,8 @@ from graphql.type import (
     GraphQLUnionType,
 )
 
+from .compact import DIRECTIVES_EXTENSION
+
 VisitableSchemaType = Union[
     GraphQLSchema,
     GraphQLObjectType,
@@ -390,7 +392,10 @@ class SchemaDirectiveVisitor(SchemaVisitor):
             type_: VisitableSchemaType, method_name: str
         ) -> List["SchemaDirectiveVisitor"]:
             visitors: List["SchemaDirectiveVisitor"] = []
-            directive_nodes = type_.ast_node.directives if type_.ast_node else None
+            if type_.ast_node:
+                directive_nodes = type_.ast_node.directives
+            else:  # compact schemas keep the directives in the extensions
+                directive_nodes = (type_.extensions or {}).get(DIRECTIVES_EXTENSION)
             if directive_nodes is None:
                 return visitors
 
@@ -1,6 +1,13 @@
+import asyncio
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, Union
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Union
+
+import graphql
+from graphql import ExecutionResult, GraphQLError, GraphQLSchema, OperationType
+
+from . import codec
+from .execute import ExecutionContext
 
 # https://github.com/apollographql/subscriptions-transport-ws/blob/master/PROTOCOL.md
 PROTOCOL = 'graphql-ws'
@@ -45,12 +52,270 @@ class OperationMessage:
     id: str = None
     payload: Union[OperationMessagePayload, dict] = None
 
+    @classmethod
+    def loads(cls, data: Union[str, bytes]) -> 'OperationMessage':
+        """Build a message from a websocket frame."""
+        return cls.build(codec.loads(data))
+
     @classmethod
     def build(cls, value: dict) -> 'OperationMessage':
         assert value is not None
-        message = cls(type=MessageType(value.get('type')), id=value.get('id'),)
+        message = cls(
+            type=MessageType(value.get('type')),
+            id=value.get('id'),
+        )
         payload = value.get('payload')
         if message.type == MessageType.GQL_START:
             payload = OperationMessagePayload.build(payload)
         message.payload = payload
         return message
+
+
+def encode_message(type_: MessageType, id_: str = None, payload: Any = None) -> str:
+    """Encode a server message to a websocket frame."""
+    message: Dict[str, Any] = {'type': type_.value}
+    if id_ is not None:
+        message['id'] = id_
+    if payload is not None:
+        message['payload'] = payload
+    return codec.dumps(message)
+
+
+# A websocket frame, and the callables of a transport: `receive` returns None once the client
+# is disconnected.
+Frame = Union[str, bytes]
+Send = Callable[[str], Awaitable[None]]
+Receive = Callable[[], Awaitable[Optional[Frame]]]
+
+
+class SubscriptionServer:
+    """Serve the graphql-ws protocol over any transport, with asyncio.
+
+        server = SubscriptionServer(schema)
+
+        async def endpoint(websocket):
+            await server.handle(websocket.send_text, receive_text_or_none)
+
+    `on_connect` is called with the payload of `connection_init` and returns the context value
+    of the connection, it rejects the connection by raising an exception. `keep_alive` is the
+    interval of the `ka` messages in seconds, None to disable them. At most `queue_size`
+    messages wait to be sent per connection: the operations wait for the client beyond.
+    """
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        root_value: Any = None,
+        on_connect: Optional[Callable[[Any], Any]] = None,
+        keep_alive: Optional[float] = 10.0,
+        queue_size: int = 100,
+        execution_context_class: type = ExecutionContext,
+    ) -> None:
+        self.schema = schema
+        self.root_value = root_value
+        self.on_connect = on_connect
+        self.keep_alive = keep_alive
+        self.queue_size = queue_size
+        self.execution_context_class = execution_context_class
+
+    async def handle(self, send: Send, receive: Receive, context_value: Any = None) -> None:
+        """Serve a connection until the client terminates it or is disconnected."""
+        await Connection(self, send, context_value).run(receive)
+
+
+class Connection:
+    """A graphql-ws connection and its operations, by id."""
+
+    def __init__(self, server: SubscriptionServer, send: Send, context_value: Any) -> None:
+        self.server = server
+        self.send = send
+        self.context_value = context_value
+        self.initialized = False
+        self.queue: 'asyncio.Queue[str]' = asyncio.Queue(server.queue_size)
+        self.operations: Dict[str, 'asyncio.Task[None]'] = {}
+        self.keep_alive: Optional['asyncio.Task[None]'] = None
+
+    async def run(self, receive: Receive) -> None:
+        sender = asyncio.ensure_future(self.send_frames())
+        receiver = asyncio.ensure_future(self.receive_messages(receive))
+        try:
+            done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            tasks = [sender, receiver, *self.operations.values()]
+            if self.keep_alive:
+                tasks.append(self.keep_alive)
+            for task in tasks:
+                task.cancel()
+            # the operations close their async generators
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for task in done:
+            if not task.cancelled() and task.exception():
+                raise task.exception()  # type: ignore
+
+    async def send_message(self, type_: MessageType, id_: str = None, payload: Any = None) -> None:
+        # wait while the queue is full, which suspends the operation
+        await self.queue.put(encode_message(type_, id_, payload))
+
+    async def send_frames(self) -> None:
+        while True:
+            frame = await self.queue.get()
+            await self.send(frame)
+
+    async def send_keep_alive(self, interval: float) -> None:
+        while True:
+            await self.send_message(MessageType.GQL_CONNECTION_KEEP_ALIVE)
+            await asyncio.sleep(interval)
+
+    async def receive_messages(self, receive: Receive) -> None:
+        while True:
+            frame = await receive()
+            if frame is None:
+                return
+            try:
+                message = OperationMessage.loads(frame)
+            except Exception as error:
+                await self.send_message(
+                    MessageType.GQL_CONNECTION_ERROR, payload={'message': str(error)}
+                )
+                continue
+
+            if message.type == MessageType.GQL_CONNECTION_INIT:
+                await self.init(message.payload)
+            elif message.type == MessageType.GQL_CONNECTION_TERMINATE:
+                return
+            elif message.type == MessageType.GQL_START:
+                await self.start(message.id, message.payload)
+            elif message.type == MessageType.GQL_STOP:
+                await self.stop(message.id)
+            else:
+                await self.send_message(
+                    MessageType.GQL_ERROR,
+                    message.id,
+                    {'message': f'Unexpected message type: {message.type.value}.'},
+                )
+
+    async def init(self, payload: Any) -> None:
+        on_connect = self.server.on_connect
+        if on_connect is not None:
+            try:
+                context_value = on_connect(payload)
+                if graphql.pyutils.is_awaitable(context_value):
+                    context_value = await context_value
+            except Exception as error:
+                await self.send_message(
+                    MessageType.GQL_CONNECTION_ERROR, payload={'message': str(error)}
+                )
+                return
+            if context_value is not None:
+                self.context_value = context_value
+
+        self.initialized = True
+        await self.send_message(MessageType.GQL_CONNECTION_ACK)
+        if self.server.keep_alive is not None and self.keep_alive is None:
+            self.keep_alive = asyncio.ensure_future(self.send_keep_alive(self.server.keep_alive))
+
+    async def start(self, id_: str, payload: OperationMessagePayload) -> None:
+        if not self.initialized:
+            await self.send_message(
+                MessageType.GQL_ERROR, id_, {'message': 'The connection is not initialized.'}
+            )
+            return
+        # a client restarts an operation with the same id
+        await self.stop(id_)
+        self.operations[id_] = asyncio.ensure_future(self.run_operation(id_, payload))
+
+    async def stop(self, id_: str) -> None:
+        task = self.operations.pop(id_, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def run_operation(self, id_: str, payload: OperationMessagePayload) -> None:
+        try:
+            result = await self.execute(payload)
+            if isinstance(result, ExecutionResult):
+                await self.send_message(MessageType.GQL_DATA, id_, result.formatted)
+            else:
+                try:
+                    async for item in result:
+                        await self.send_message(MessageType.GQL_DATA, id_, item.formatted)
+                finally:
+                    aclose = getattr(result, 'aclose', None)
+                    if aclose is not None:
+                        await aclose()
+            await self.send_message(MessageType.GQL_COMPLETE, id_)
+        except asyncio.CancelledError:
+            # an Exception before Python 3.8
+            raise
+        except GraphQLError as error:
+            await self.send_message(MessageType.GQL_ERROR, id_, error.formatted)
+        except Exception as error:
+            await self.send_message(MessageType.GQL_ERROR, id_, {'message': str(error)})
+        finally:
+            if self.operations.get(id_) is asyncio.current_task():
+                del self.operations[id_]
+
+    async def execute(
+        self, payload: OperationMessagePayload
+    ) -> Union[ExecutionResult, AsyncIterator[ExecutionResult]]:
+        """Return the result of a query or mutation, the results of a subscription."""
+        server = self.server
+        document = graphql.parse(payload.query or '')
+        errors = graphql.validate(server.schema, document)
+        if errors:
+            raise errors[0]
+
+        operation = graphql.get_operation_ast(document, payload.operation_name)
+        if operation is not None and operation.operation == OperationType.SUBSCRIPTION:
+            return await graphql.subscribe(
+                server.schema,
+                document,
+                server.root_value,
+                self.context_value,
+                payload.variables,
+                payload.operation_name,
+            )
+        result = graphql.execute(
+            server.schema,
+            document,
+            server.root_value,
+            self.context_value,
+            payload.variables,
+            payload.operation_name,
+            execution_context_class=server.execution_context_class,
+        )
+        if graphql.pyutils.is_awaitable(result):
+            result = await result  # type: ignore
+        return result  # type: ignore
+
+
+class MemoryTransport:
+    """A connection in memory, for tests and load tests.
+
+        transport = MemoryTransport()
+        task = asyncio.ensure_future(server.handle(transport.send, transport.receive))
+        await transport.client_send(MessageType.GQL_CONNECTION_INIT)
+        await transport.client_receive()  # {'type': 'connection_ack'}
+
+    `send` and `receive` are the server side, `client_send` and `client_receive` the client
+    side. `close` disconnects the client.
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self.incoming: 'asyncio.Queue[Optional[Frame]]' = asyncio.Queue(maxsize)
+        self.outgoing: 'asyncio.Queue[str]' = asyncio.Queue(maxsize)
+
+    async def send(self, frame: str) -> None:
+        await self.outgoing.put(frame)
+
+    async def receive(self) -> Optional[Frame]:
+        return await self.incoming.get()
+
+    async def client_send(self, type_: MessageType, id_: str = None, payload: Any = None) -> None:
+        await self.incoming.put(encode_message(type_, id_, payload))
+
+    async def client_receive(self) -> Dict[str, Any]:
+        return codec.loads(await self.outgoing.get())
+
+    async def close(self) -> None:
+        await self.incoming.put(None)
@@ -0,0 +1,185 @@
+import threading
+from typing import Callable, Dict, Hashable, Iterator, List, Mapping, Optional, Set, Union
+
+from graphql import (
+    GraphQLList,
+    GraphQLNamedType,
+    GraphQLNonNull,
+    GraphQLSchema,
+    TypeDefinitionNode,
+    TypeExtensionNode,
+    extend_schema,
+    get_named_type,
+    is_input_object_type,
+    is_interface_type,
+    is_list_type,
+    is_non_null_type,
+    is_object_type,
+    is_union_type,
+)
+
+from .metrics import ResolverMetrics
+from .registry import Registry, default_registry
+from .utils import join_documents, parse_type_defs
+
+TypeDefsLoader = Callable[[Hashable], Optional[Union[str, List[str]]]]
+
+
+def named_references(type_: GraphQLNamedType) -> Iterator[str]:
+    """Yield the names of the types referenced by the type."""
+    if is_object_type(type_) or is_interface_type(type_):
+        for field in type_.fields.values():
+            yield get_named_type(field.type).name
+            for arg in field.args.values():
+                yield get_named_type(arg.type).name
+        for interface in type_.interfaces:
+            yield interface.name
+    elif is_union_type(type_):
+        for member in type_.types:
+            yield member.name
+    elif is_input_object_type(type_):
+        for field in type_.fields.values():
+            yield get_named_type(field.type).name
+
+
+def replace_type(type_, type_map: Mapping[str, GraphQLNamedType]):
+    if is_list_type(type_):
+        return GraphQLList(replace_type(type_.of_type, type_map))
+    if is_non_null_type(type_):
+        return GraphQLNonNull(replace_type(type_.of_type, type_map))
+    return type_map[type_.name]
+
+
+def relink_type(type_: GraphQLNamedType, type_map: Mapping[str, GraphQLNamedType]) -> None:
+    """Point the references of a copied type to the types of the type map."""
+    if is_object_type(type_) or is_interface_type(type_):
+        for field in type_.fields.values():
+            field.type = replace_type(field.type, type_map)
+            for arg in field.args.values():
+                arg.type = replace_type(arg.type, type_map)
+        type_.interfaces = [type_map[interface.name] for interface in type_.interfaces]
+    elif is_union_type(type_):
+        type_.types = [type_map[member.name] for member in type_.types]
+    elif is_input_object_type(type_):
+        for field in type_.fields.values():
+            field.type = replace_type(field.type, type_map)
+
+
+def derive_schema(
+    base: GraphQLSchema,
+    type_defs: Union[str, List[str]],
+    metrics: ResolverMetrics = None,
+    registry: Registry = None,
+) -> GraphQLSchema:
+    """Extend a schema built by `make_schema`, sharing the types which are not affected.
+
+    Only the extended and new types, and the types referencing them, are copied. The other
+    type objects, with their resolvers, are the ones of the base schema, and are not
+    registered again. Schema directive visitors are not run on the extensions.
+    """
+    if not isinstance(type_defs, list):
+        type_defs = [type_defs]
+    document = join_documents(parse_type_defs(t) for t in type_defs)
+    extended = extend_schema(base, document)
+
+    changed = {
+        definition.name.value
+        for definition in document.definitions
+        if isinstance(definition, (TypeDefinitionNode, TypeExtensionNode))
+    }
+
+    referenced_by: Dict[str, Set[str]] = {}
+    for name, type_ in extended.type_map.items():
+        if name.startswith('__'):
+            continue
+        for reference in named_references(type_):
+            referenced_by.setdefault(reference, set()).add(name)
+
+    affected = set(changed)
+    pending = list(changed)
+    while pending:
+        for name in referenced_by.get(pending.pop(), ()):
+            if name not in affected:
+                affected.add(name)
+                pending.append(name)
+
+    type_map = {
+        name: type_ if name in affected or name not in base.type_map else base.type_map[name]
+        for name, type_ in extended.type_map.items()
+    }
+    for name in affected:
+        relink_type(type_map[name], type_map)
+    for directive in extended.directives:
+        for arg in directive.args.values():
+            arg.type = replace_type(arg.type, type_map)
+
+    def root(type_):
+        return type_map[type_.name] if type_ else None
+
+    schema = GraphQLSchema(
+        query=root(extended.query_type),
+        mutation=root(extended.mutation_type),
+        subscription=root(extended.subscription_type),
+        types=list(type_map.values()),
+        directives=extended.directives,
+        extensions=extended.extensions,
+        ast_node=extended.ast_node,
+        extension_ast_nodes=extended.extension_ast_nodes,
+    )
+
+    # Copied fields keep the resolvers of the base, only the new fields are registered.
+    (registry or default_registry).register(schema, affected, overwrite=False)
+    if metrics:
+        metrics.instrument(schema, affected)
+    return schema
+
+
+class TenantSchemas:
+    """Schemas of tenants derived from a base schema, built on their first use.
+
+        tenants = TenantSchemas(base, lambda tenant: load_tenant_type_defs(tenant))
+
+        graphql(tenants.get(tenant_id), query)
+
+    `type_defs` maps a tenant to its extensions, a tenant without extensions uses the base
+    schema. Caches keyed by documents, like `parse_info` and projections, are shared.
+    """
+
+    def __init__(
+        self,
+        base: GraphQLSchema,
+        type_defs: Union[Mapping[Hashable, Union[str, List[str]]], TypeDefsLoader],
+        metrics: ResolverMetrics = None,
+        registry: Registry = None,
+    ) -> None:
+        self.base = base
+        self.load_type_defs: TypeDefsLoader = (
+            type_defs.get if isinstance(type_defs, Mapping) else type_defs
+        )
+        self.metrics = metrics
+        self.registry = registry
+        self.schemas: Dict[Hashable, GraphQLSchema] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant: Hashable) -> GraphQLSchema:
+        schema = self.schemas.get(tenant)
+        if schema is not None:
+            return schema
+        with self._lock:
+            schema = self.schemas.get(tenant)
+            if schema is None:
+                type_defs = self.load_type_defs(tenant)
+                if type_defs:
+                    schema = derive_schema(self.base, type_defs, self.metrics, self.registry)
+                else:
+                    schema = self.base
+                self.schemas[tenant] = schema
+        return schema
+
+    def invalidate(self, tenant: Hashable = None) -> None:
+        """Drop the schema of the tenant, or of all tenants, to build it again."""
+        with self._lock:
+            if tenant is None:
+                self.schemas.clear()
+            else:
+                self.schemas.pop(tenant, None)
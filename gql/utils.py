@@ -1,14 +1,27 @@
 import re
+import threading
+from collections import OrderedDict
 from functools import wraps
 from inspect import isawaitable
-from typing import Any, Callable, List
+from typing import Any, Callable, Hashable, Iterable, List
 
-from graphql import parse
+from graphql import DocumentNode, parse
+from graphql.pyutils import FrozenList
 
 
-def gql(value: str) -> str:
-    parse(value)
-    return value
+class TypeDefs(str):
+    """Type definitions which keep the document they were parsed to."""
+
+    document: DocumentNode
+
+    def __new__(cls, value: str, document: DocumentNode = None) -> 'TypeDefs':
+        type_defs = super().__new__(cls, value)
+        type_defs.document = parse(value) if document is None else document
+        return type_defs
+
+
+def gql(value: str) -> TypeDefs:
+    return TypeDefs(value)
 
 
 # Adapted from this response in Stackoverflow
@@ -124,3 +137,57 @@ async def execute_async_function(func, *args, **kwargs):
 
 def join_type_defs(type_defs: List[str]) -> str:
     return "\n\n".join(t.strip() for t in type_defs)
+
+
+def parse_type_defs(
+    type_defs: str, no_location: bool = False, experimental_fragment_variables: bool = False
+) -> DocumentNode:
+    """Return the document of the type definitions, parsed only if `gql` did not."""
+    if isinstance(type_defs, TypeDefs):
+        return type_defs.document
+    return parse(type_defs, no_location, experimental_fragment_variables)
+
+
+def join_documents(documents: Iterable[DocumentNode]) -> DocumentNode:
+    documents = list(documents)
+    if len(documents) == 1:
+        return documents[0]
+    definitions: List[Any] = []
+    for document in documents:
+        definitions.extend(document.definitions)
+    return DocumentNode(definitions=FrozenList(definitions))
+
+
+class LRUCache:
+    """A small thread-safe LRU mapping, used by the cross-request caches."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
@@ -0,0 +1,59 @@
+import pytest
+from graphql import ExecutionResult, GraphQLError
+
+from gql import codec
+from gql.subscription import MessageType, OperationMessage, encode_message
+
+
+@pytest.fixture(params=['orjson', 'ujson', 'json'])
+def json_codec(request):
+    current = codec.codec
+    try:
+        yield codec.set_codec(request.param)
+    except ImportError:
+        pytest.skip(f'{request.param} is not installed')
+    finally:
+        codec.set_codec(current)
+
+
+def test_codecs(json_codec):
+    value = {'name': 'é/', 'items': [1, 2.5, None, True], 1: 'key'}
+    assert json_codec.dumps(value) == '{"name":"é/","items":[1,2.5,null,true],"1":"key"}'
+    assert json_codec.loads(json_codec.encode(value)) == {
+        'name': 'é/',
+        'items': [1, 2.5, None, True],
+        '1': 'key',
+    }
+
+    result = ExecutionResult({'hello': 'world'}, [GraphQLError('failed')])
+    assert codec.loads(codec.encode_result(result)) == result.formatted
+
+    frame = encode_message(MessageType.GQL_DATA, '1', {'data': None})
+    assert frame == '{"type":"data","id":"1","payload":{"data":null}}'
+    message = OperationMessage.loads('{"type":"start","id":"1","payload":{"query":"{ a }"}}')
+    assert message.payload.query == '{ a }'
+
+
+def test_iter_encode(json_codec):
+    value = {
+        'rows': [{'id': i, 'name': 'x' * (i % 50)} for i in range(200)],
+        'large': ['y' * 300, 'z' * 300],
+        'empty': [[], {}, ()],
+        1: None,
+    }
+    chunks = list(codec.iter_encode(value, chunk_size=256))
+    assert len(chunks) > 10 and max(map(len, chunks)) < 2 * 256 + 300
+    assert b''.join(chunks) == json_codec.encode(value)
+
+
+def test_values_rejected_by_the_codec(json_codec):
+    assert json_codec.dumps({'a': 2 ** 70}) == '{"a":1180591620717411303424}'
+    assert json_codec.loads('{"a": 1180591620717411303424}') == {'a': 2 ** 70}
+    loaded = json_codec.loads('{"a": NaN, "b": Infinity}')
+    assert loaded['a'] != loaded['a'] and loaded['b'] == float('inf')
+
+    nan = json_codec.dumps({'a': float('nan')})
+    assert nan == ('{"a":null}' if json_codec.name == 'orjson' else '{"a":NaN}')
+
+    with pytest.raises(TypeError):
+        json_codec.dumps({'a': object()})
@@ -0,0 +1,42 @@
+import gc
+import weakref
+
+from gql import SchemaDirectiveVisitor, gql, make_schema
+from gql.federation import get_entity_types
+
+type_defs = """
+directive @tag(name: String) on FIELD_DEFINITION
+
+type Query {
+    compactProduct: CompactProduct
+}
+
+type CompactProduct @key(fields: "id") {
+    id: ID!
+    name: String @tag(name: "public")
+}
+"""
+
+
+class TagDirective(SchemaDirectiveVisitor):
+    def visit_field_definition(self, field, object_type):
+        field.description = self.args['name']
+        return field
+
+
+def test_compact_schema():
+    type_defs_ = gql(type_defs)
+    document = weakref.ref(type_defs_.document)
+    definition = weakref.ref(type_defs_.document.definitions[-1])
+    schema = make_schema(type_defs_, federation=True, compact=True)
+    del type_defs_
+    gc.collect()
+    assert document() is None and definition() is None
+
+    product = schema.get_type('CompactProduct')
+    assert product.ast_node is None and product.fields['name'].ast_node is None
+    assert get_entity_types(schema) == [product] == schema.get_type('_Entity').types
+    assert product.extensions['directives'][0].loc is None
+
+    SchemaDirectiveVisitor.visit_schema_directives(schema, {'tag': TagDirective})
+    assert product.fields['name'].description == 'public'
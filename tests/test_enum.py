@@ -0,0 +1,111 @@
+from enum import Enum
+
+from graphql import graphql_sync
+
+from gql import Registry, make_schema
+from gql.resolver import default_field_resolver
+
+type_defs = """
+enum Size {
+    SMALL
+    "Not made anymore."
+    LARGE @deprecated
+}
+
+enum Shape {
+    ROUND
+}
+
+type Query {
+    size(size: Size!): Size!
+    sizeValue: Size!
+    shape: Shape!
+}
+"""
+
+
+class Size(Enum):
+    SMALL = 's'
+    LARGE = 'l'
+
+
+def test_enum_members():
+    registry = Registry()
+    registry.enum_type(Size)
+    arguments = []
+
+    @registry.query
+    def size(parent, info, size):
+        arguments.append(size)
+        return size
+
+    registry.field_resolver('Query', 'size_value')(lambda parent, info: 'l')
+    registry.field_resolver('Query', 'shape')(lambda parent, info: 'ROUND')
+    schema = make_schema(type_defs, registry=registry)
+
+    result = graphql_sync(schema, '{ size(size: SMALL) sizeValue shape }')
+    assert result.data == {'size': 'SMALL', 'sizeValue': 'LARGE', 'shape': 'ROUND'}
+    assert arguments == [Size.SMALL]
+
+    large = schema.get_type('Size').values['LARGE']
+    assert large.value is Size.LARGE
+    assert large.description == 'Not made anymore.' and large.deprecation_reason
+
+
+class Status(Enum):
+    ACTIVE = 'ACTIVE'
+    OFF = 'OFF'
+
+
+def test_default_resolver_unwraps_unregistered_enums():
+    type_defs = """
+    enum Status {
+        ACTIVE
+        OFF
+    }
+
+    type Query {
+        status: Status!
+        label: String!
+    }
+    """
+    schema = make_schema(type_defs, registry=Registry())
+    root_value = {'status': Status.ACTIVE, 'label': Status.OFF}
+    result = graphql_sync(
+        schema, '{ status label }', root_value, field_resolver=default_field_resolver
+    )
+    assert result.data == {'status': 'ACTIVE', 'label': 'OFF'}
+
+
+def test_enum_default_values():
+    type_defs = """
+    enum Color {
+        RED
+        BLUE
+    }
+
+    input Brush {
+        colors: [Color!] = [BLUE]
+    }
+
+    type Query {
+        paint(color: Color = RED, brush: Brush = {}): Color!
+    }
+    """
+
+    class Color(Enum):
+        RED = 'r'
+        BLUE = 'b'
+
+    registry = Registry()
+    registry.enum_type(Color)
+    arguments = []
+
+    @registry.query
+    def paint(parent, info, color, brush):
+        arguments.append((color, brush))
+        return color
+
+    schema = make_schema(type_defs, registry=registry)
+    assert graphql_sync(schema, '{ paint }').data == {'paint': 'RED'}
+    assert arguments == [(Color.RED, {'colors': [Color.BLUE]})]
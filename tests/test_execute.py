@@ -0,0 +1,94 @@
+import asyncio
+import json
+from array import array
+
+import pytest
+from graphql import graphql, graphql_sync
+
+from gql import ExecutionContext, Registry, make_schema
+from gql.arrays import json_default
+
+type_defs = """
+enum Color {
+    RED
+    GREEN
+}
+
+type Query {
+    numbers: [Int!]!
+    optionalNumbers: [Int]
+    floats: [Float!]!
+    names: [String!]!
+    colors: [Color!]!
+}
+"""
+
+schema = make_schema(type_defs, registry=Registry())
+
+
+def execute(query, root_value):
+    return graphql_sync(schema, query, root_value, execution_context_class=ExecutionContext)
+
+
+def test_leaf_lists():
+    root_value = {
+        'numbers': (i for i in range(3)),
+        'floats': [1, 2.5],
+        'names': ['a', 'b'],
+        'colors': ['RED', 'GREEN'],
+    }
+    result = execute('{ numbers floats names colors }', root_value)
+    assert result.data == {
+        'numbers': [0, 1, 2],
+        'floats': [1.0, 2.5],
+        'names': ['a', 'b'],
+        'colors': ['RED', 'GREEN'],
+    }
+
+
+def test_leaf_lists_with_invalid_items():
+    result = execute('{ optionalNumbers }', {'optionalNumbers': [1, None, 2 ** 40, 3.0]})
+    assert result.data == {'optionalNumbers': [1, None, None, 3]}
+    assert [error.path for error in result.errors] == [['optionalNumbers', 2]]
+
+    result = execute('{ numbers }', {'numbers': [1, None]})
+    assert result.data is None
+    assert result.errors[0].path == ['numbers', 1]
+
+
+def test_leaf_lists_with_awaitable_items():
+    async def two():
+        return 2
+
+    async def run():
+        return await graphql(
+            schema,
+            '{ numbers }',
+            {'numbers': [1, two()]},
+            execution_context_class=ExecutionContext,
+        )
+
+    assert asyncio.run(run()).data == {'numbers': [1, 2]}
+
+
+def test_array_lists():
+    numpy = pytest.importorskip('numpy')
+    floats = numpy.array([0.5, 1.5])
+    numbers = array('q', [1, 2])
+
+    result = execute('{ floats numbers }', {'floats': floats, 'numbers': numbers})
+    assert result.data['floats'] is floats and result.data['numbers'] is numbers
+    assert json.loads(json.dumps(result.data, default=json_default)) == {
+        'floats': [0.5, 1.5],
+        'numbers': [1, 2],
+    }
+
+    result = execute('{ floats }', {'floats': memoryview(array('d', [2.5]))})
+    assert result.data['floats'] == array('d', [2.5])
+
+    # masked values are nulls, invalid values are completed one by one
+    masked = numpy.ma.masked_array([1, 2], mask=[False, True])
+    result = execute('{ optionalNumbers }', {'optionalNumbers': masked})
+    assert result.data == {'optionalNumbers': [1, None]}
+    result = execute('{ numbers }', {'numbers': array('q', [1, 2 ** 40])})
+    assert result.errors[0].path == ['numbers', 1]
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+# Budget of the import time of the modules of this library, graphql-core not included.
+IMPORT_BUDGET_US = 100_000
+
+
+def import_times(statement: str):
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:') :].split('|')
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def test_import_is_lazy():
+    assert [name for name in import_times('import gql') if name.startswith('gql')] == ['gql']
+
+    times = import_times('from gql import make_schema, query')
+    for name in ('gql.federation', 'gql.schema_visitor', 'gql.parser', 'gql.profiling'):
+        assert name not in times
+    assert 'graphql' in times
+
+
+def test_import_time_budget():
+    times = import_times('from gql import make_schema, query, ExecutionContext, gql')
+    assert sum(us for name, us in times.items() if name.startswith('gql')) < IMPORT_BUDGET_US
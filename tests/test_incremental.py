@@ -0,0 +1,174 @@
+import asyncio
+
+from graphql import ExecutionResult, parse
+
+from gql import Registry, make_schema
+from gql.execute import execute_incremental
+from gql.incremental import IncrementalExecutionResults, incremental_type_defs
+
+type_defs = (
+    incremental_type_defs
+    + """
+type Query {
+    hero: Hero!
+    numbers: [Int!]!
+    names: [String!]!
+}
+
+type Hero {
+    name: String!
+    friends: [String!]!
+}
+"""
+)
+
+schema = make_schema(type_defs, registry=Registry())
+
+
+async def slow_friends(info):
+    await asyncio.sleep(0.01)
+    return ['Han', 'Leia']
+
+
+async def names(info):
+    for name in ('a', 'b', 'c'):
+        await asyncio.sleep(0)
+        yield name
+
+
+root_value = {
+    'hero': {'name': 'Luke', 'friends': slow_friends},
+    'numbers': [1, 2, 3],
+    'names': names,
+}
+
+
+def execute(query):
+    async def run():
+        result = await execute_incremental(schema, parse(query), root_value)
+        if isinstance(result, ExecutionResult):
+            return [result.formatted]
+        assert isinstance(result, IncrementalExecutionResults)
+        formatted = [result.initial_result.formatted]
+        async for subsequent in result.subsequent_results:
+            formatted.append(subsequent.formatted)
+        return formatted
+
+    return asyncio.run(run())
+
+
+def test_without_directives():
+    assert execute('{ hero { name } }') == [{'data': {'hero': {'name': 'Luke'}}, 'errors': None}]
+
+
+def test_defer():
+    results = execute(
+        """
+        { hero { name ... @defer(label: "friends") { friends } ...Name @defer } }
+        fragment Name on Hero { name }
+        """
+    )
+    assert results[0] == {'data': {'hero': {'name': 'Luke'}}, 'hasNext': True}
+    incremental = [payload for result in results[1:] for payload in result['incremental']]
+    assert sorted(incremental, key=len) == [
+        {'data': {'name': 'Luke'}, 'path': ['hero']},
+        {'data': {'friends': ['Han', 'Leia']}, 'path': ['hero'], 'label': 'friends'},
+    ]
+    assert results[-1]['hasNext'] is False
+
+
+def test_defer_if_false():
+    results = execute('{ hero { ... @defer(if: false) { name } } }')
+    assert results == [{'data': {'hero': {'name': 'Luke'}}, 'errors': None}]
+
+
+def test_stream():
+    results = execute('{ numbers @stream(initialCount: 1, label: "numbers") }')
+    assert results == [
+        {'data': {'numbers': [1]}, 'hasNext': True},
+        {
+            'incremental': [{'items': [2], 'path': ['numbers', 1], 'label': 'numbers'}],
+            'hasNext': True,
+        },
+        {
+            'incremental': [{'items': [3], 'path': ['numbers', 2], 'label': 'numbers'}],
+            'hasNext': False,
+        },
+    ]
+
+
+def test_stream_async_iterable():
+    results = execute('{ names @stream(initialCount: 2) }')
+    assert results[0] == {'data': {'names': ['a', 'b']}, 'hasNext': True}
+    assert results[1]['incremental'] == [{'items': ['c'], 'path': ['names', 2]}]
+    assert results[-1]['hasNext'] is False
+
+
+def test_stream_errors():
+    results = execute('{ numbers @stream(initialCount: -1) }')
+    assert results[0]['data'] is None
+    assert results[0]['errors'][0]['message'] == 'initialCount must be a positive integer.'
+
+    root_value['numbers'] = [1, None]
+    try:
+        results = execute('{ numbers @stream(initialCount: 1) }')
+    finally:
+        root_value['numbers'] = [1, 2, 3]
+    assert results[1]['incremental'][0]['items'] is None
+    assert results[1]['incremental'][0]['errors'][0]['path'] == ['numbers', 1]
+
+
+def test_close_without_iterating():
+    cancelled = []
+
+    async def never(info):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def run():
+        query = '{ hero { name ... @defer { friends } } numbers @stream(initialCount: 1) }'
+        hero = {'name': 'Luke', 'friends': never}
+        result = await execute_incremental(schema, parse(query), {**root_value, 'hero': hero})
+        assert result.initial_result.formatted['hasNext'] is True
+        # the resolver is running
+        await asyncio.sleep(0.01)
+        await result.subsequent_results.aclose()
+        assert not result.subsequent_results.pending
+        assert [item async for item in result.subsequent_results] == []
+
+    asyncio.run(run())
+    assert cancelled == [True]
+
+
+def test_stream_source_errors():
+    async def failing_names(info):
+        yield 'a'
+        yield 'b'
+        raise ValueError('source failed')
+
+    root_value['names'] = failing_names
+    try:
+        results = execute('{ names @stream(initialCount: 1) hero { ... @defer { friends } } }')
+    finally:
+        root_value['names'] = names
+    assert results[0] == {'data': {'names': ['a'], 'hero': {}}, 'hasNext': True}
+    incremental = [payload for result in results[1:] for payload in result['incremental']]
+    assert sorted(incremental, key=lambda payload: payload['path']) == [
+        {'data': {'friends': ['Han', 'Leia']}, 'path': ['hero']},
+        {'items': ['b'], 'path': ['names', 1]},
+        {
+            'items': None,
+            'path': ['names', 2],
+            'errors': [
+                {
+                    'message': 'source failed',
+                    'locations': [{'line': 1, 'column': 3}],
+                    'path': ['names', 2],
+                }
+            ],
+        },
+    ]
+    assert results[-1]['hasNext'] is False
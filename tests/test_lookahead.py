@@ -0,0 +1,97 @@
+from graphql import graphql_sync
+
+from gql import ExecutionContext, Registry, field_resolver, make_schema
+from gql.lookahead import Lookahead
+from gql.parser import fake_info
+
+type_defs = """
+type LookaheadAuthor {
+    id: ID!
+    name: String!
+}
+
+type LookaheadPost {
+    id: ID!
+    author: LookaheadAuthor!
+}
+
+type Query {
+    lookaheadPosts: [LookaheadPost!]!
+}
+"""
+
+calls = []
+
+
+def load_authors(posts):
+    calls.append('batch')
+    return {post['author_id']: {'id': post['author_id'], 'name': 'batched'} for post in posts}
+
+
+@field_resolver('Query', 'lookaheadPosts')
+def lookahead_posts(parent, info):
+    posts = [{'id': i, 'author_id': i % 2} for i in range(4)]
+    lookahead = Lookahead(info)
+    if lookahead.selects('author', 'name'):
+        lookahead.prefetch('author', posts, load_authors, key=lambda post: post['author_id'])
+    return posts
+
+
+@field_resolver('LookaheadPost', 'author')
+def lookahead_post_author(parent, info):
+    calls.append('single')
+    return {'id': parent['author_id'], 'name': 'single'}
+
+
+def test_prefetch():
+    schema = make_schema(type_defs)
+
+    calls.clear()
+    result = graphql_sync(schema, '{ lookaheadPosts { id author { name } } }', context_value={})
+    assert not result.errors
+    assert [post['author']['name'] for post in result.data['lookaheadPosts']] == ['batched'] * 4
+    assert calls == ['batch']
+
+    calls.clear()
+    result = graphql_sync(schema, '{ lookaheadPosts { id author { id } } }', context_value={})
+    assert not result.errors
+    assert calls == ['single'] * 4
+
+    calls.clear()
+    query = '{ lookaheadPosts { id ... on LookaheadPost { author { name } } } }'
+    result = graphql_sync(schema, query, context_value={})
+    assert not result.errors
+    assert [post['author']['name'] for post in result.data['lookaheadPosts']] == ['batched'] * 4
+    assert calls == ['batch']
+
+
+def test_selection_through_inline_fragments():
+    info = fake_info(
+        '{ posts { author { id } ... on Post { author { name } } ... on Node { title } } }'
+    )
+    lookahead = Lookahead(info)
+    assert lookahead.selection('author').sections == ('id', 'name')
+    assert lookahead.selects('author', 'name')
+    assert lookahead.selects('title')
+    assert not lookahead.selects('author', 'email')
+    assert lookahead.selection('comments') is None
+
+
+def test_prefetch_without_child_resolver():
+    registry = Registry()
+
+    @registry.query('lookaheadPosts')
+    def posts(parent, info):
+        posts = [{'id': i, 'author_id': i % 2} for i in range(4)]
+        Lookahead(info).prefetch('author', posts, load_authors, key=lambda post: post['author_id'])
+        return posts
+
+    schema = make_schema(type_defs, registry=registry)
+    result = graphql_sync(
+        schema,
+        '{ lookaheadPosts { author { name } } }',
+        context_value={},
+        execution_context_class=ExecutionContext,
+    )
+    assert not result.errors
+    assert [post['author']['name'] for post in result.data['lookaheadPosts']] == ['batched'] * 4
@@ -0,0 +1,51 @@
+from graphql import graphql_sync
+
+from gql import ResolverMetrics, field_resolver, make_schema
+
+type_defs = """
+type Query {
+    metricsHello(name: String!): String!
+    metricsBroken: String
+}
+"""
+
+
+@field_resolver('Query', 'metricsHello')
+def metrics_hello(parent, info, name: str) -> str:
+    return name
+
+
+@field_resolver('Query', 'metricsBroken', print_exc=False)
+def metrics_broken(parent, info):
+    raise ValueError('broken')
+
+
+def test_resolver_metrics():
+    metrics = ResolverMetrics(buckets=(0.5, 1.0))
+    schema = make_schema(type_defs, metrics=metrics)
+
+    for _ in range(3):
+        graphql_sync(schema, '{ metricsHello(name: "gql") metricsBroken }')
+
+    snapshot = metrics.snapshot()
+    assert snapshot['Query.metricsHello']['calls'] == 3
+    assert snapshot['Query.metricsHello']['errors'] == 0
+    assert snapshot['Query.metricsHello']['buckets']['+Inf'] == 3
+    assert snapshot['Query.metricsBroken']['errors'] == 3
+
+    text = metrics.to_prometheus()
+    assert 'graphql_resolver_calls_total{type="Query",field="metricsHello"} 3' in text
+    assert (
+        'graphql_resolver_duration_seconds_bucket{type="Query",field="metricsHello",le="+Inf"} 3'
+        in text
+    )
+
+
+def test_resolver_metrics_sampling():
+    metrics = ResolverMetrics(sample_rate=0.0)
+    schema = make_schema(type_defs, metrics=metrics)
+    graphql_sync(schema, '{ metricsHello(name: "gql") }')
+
+    snapshot = metrics.snapshot()
+    assert snapshot['Query.metricsHello']['calls'] == 1
+    assert snapshot['Query.metricsHello']['samples'] == 0
@@ -1,4 +1,6 @@
-from gql.parser import fake_info, parse_info
+import pytest
+
+from gql.parser import fake_info, field_meta_cache, get_document_selections, parse_info
 
 
 def test_inline_fragment():
@@ -26,4 +28,102 @@ query {
     info = fake_info(query)
     meta = parse_info(info)
     assert meta.name == 'search'
-    assert meta.sections == []
+    assert meta.sections == ()
+
+
+def test_named_fragments_are_cached():
+    query = """
+query {
+    hero {
+        ...HeroFields
+        friends {
+            ...HeroFields
+        }
+    }
+}
+
+fragment HeroFields on Character {
+    id
+    name
+}
+    """
+    info = fake_info(query)
+    meta = parse_info(info)
+    assert meta.name == 'hero'
+    assert meta.sections == ('id', 'name')
+    assert meta.get_sub_field('friends').sections == ('id', 'name')
+
+    # another request of the same document
+    assert parse_info(fake_info(query)) is meta
+
+
+def test_skip_and_include():
+    query = """
+query Hero($withFriends: Boolean!, $skipName: Boolean!) {
+    hero {
+        id
+        name @skip(if: $skipName)
+        height @include(if: false)
+        friends @include(if: $withFriends) {
+            id
+        }
+    }
+}
+    """
+    meta = parse_info(fake_info(query, {'withFriends': False, 'skipName': True}))
+    assert meta.sections == ('id',)
+    assert meta.get_sub_field('friends') is None
+
+    meta = parse_info(fake_info(query, {'withFriends': True, 'skipName': False}))
+    assert meta.sections == ('id', 'name')
+    assert meta.get_sub_field('friends').sections == ('id',)
+
+
+def test_shared_fragments_and_lazy_depth():
+    query = """
+query {
+    hero {
+        ...Friends
+        friends {
+            ...Friends
+        }
+    }
+}
+
+fragment Friends on Character {
+    name
+    friends {
+        id
+        friends {
+            name
+        }
+    }
+}
+    """
+    meta = parse_info(fake_info(query), depth=1)
+    assert meta.sections == ('name',)
+    assert meta.sub_fields == {}
+
+    meta = meta.expand()
+    friends = meta.get_sub_field('friends')
+    assert friends.sections == ('id', 'name')
+    assert friends.get_sub_field('friends').sections == ('name', 'id')
+    assert friends.get_sub_field('friends').get_sub_field('friends').sections == ('name',)
+
+    # The fragment used at two depths is expanded once and shared.
+    fragment_friends = friends.get_sub_field('friends').get_sub_field('friends')
+    assert fragment_friends.selection is friends.selection.children['friends'].children['friends']
+
+    with pytest.raises(AttributeError):
+        meta.sections = ()
+
+
+def test_document_selections_are_shared_by_requests():
+    query = '{ hero { id friends { name } } }'
+    meta = parse_info(fake_info(query))
+    for _ in range(100):
+        field_meta_cache.clear()
+        assert parse_info(fake_info(query)).selection is meta.selection
+
+    document = get_document_selections(fake_info(query))
+    assert len(document.selections) == 1
@@ -0,0 +1,29 @@
+import gc
+import os
+import sys
+
+import pytest
+from graphql import graphql_sync
+
+from gql import make_schema
+from gql.prefork import fork_workers, wait_workers
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork is not available')
+
+
+def test_fork_workers():
+    schema = make_schema('type Query { preforkValue: String }')
+
+    def target(index):
+        result = graphql_sync(schema, '{ preforkValue }', root_value={'preforkValue': 'v'})
+        assert result.data == {'preforkValue': 'v'}
+        assert gc.get_freeze_count() > 0
+        if index == 1:
+            sys.stderr = open(os.devnull, 'w')  # keep the traceback out of the test output
+            raise Exception('failed')
+
+    try:
+        pids = fork_workers(2, target, [schema])
+        assert sorted(wait_workers(pids).values()) == [0, 1]
+    finally:
+        gc.unfreeze()
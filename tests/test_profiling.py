@@ -0,0 +1,23 @@
+from graphql import graphql_sync
+
+from gql import ExecutionContext, make_schema
+from gql.profiling import OperationProfiler
+
+
+def test_operation_profiler(tmp_path):
+    schema = make_schema('type Query { value: Int }')
+    profiler = OperationProfiler(tmp_path, operation_names=['Value'], every=2, memory=True)
+    execution_context_class = ExecutionContext.with_profiler(profiler)
+
+    for _ in range(4):
+        result = graphql_sync(
+            schema,
+            'query Value { value }',
+            root_value={'value': 1},
+            execution_context_class=execution_context_class,
+        )
+        assert result.data == {'value': 1}
+    graphql_sync(schema, 'query Other { value }', execution_context_class=execution_context_class)
+
+    files = sorted(f.suffix for f in tmp_path.iterdir())
+    assert files == ['.collapsed', '.collapsed', '.pstats', '.pstats']
@@ -0,0 +1,79 @@
+from gql.parser import fake_info, parse_info
+from gql.projection import Projection, Relation
+
+user = Projection(columns=['id', 'name', 'email'], always=['id'])
+post = Projection(
+    columns={'id': 'id', 'title': 'title', 'created_at': 'created'},
+    computed={'summary': ['body', 'title']},
+    relations={'author': Relation('users', columns='author_id', projection=user)},
+    always=['id'],
+)
+
+
+def test_projection():
+    query = """
+query {
+    posts {
+        title
+        summary
+        createdAt
+        unknown
+    }
+}
+    """
+    result = post.project(fake_info(query))
+    assert result.columns == ('id', 'title', 'body', 'created')
+    assert result.joins == ()
+
+
+def test_projection_relation():
+    query = """
+query {
+    posts {
+        title
+        author {
+            name
+        }
+    }
+}
+    """
+    info = fake_info(query)
+    result = post.project(info)
+    assert result.columns == ('id', 'title', 'author_id')
+    assert result.joins == ('users',)
+    assert result.relations['author'].columns == ('id', 'name')
+
+    # cached per selection
+    assert post.project(parse_info(info)) is result
+
+
+def test_projection_inline_fragments():
+    query = """
+query {
+    posts {
+        ... on Post {
+            title
+            summary
+            author { name }
+        }
+        ... on Node {
+            author { email }
+        }
+        ... on Comment {
+            createdAt
+        }
+    }
+}
+    """
+    result = post.project(fake_info(query))
+    assert result.columns == ('id', 'title', 'body', 'author_id', 'created')
+    assert result.relations['author'].columns == ('id', 'name', 'email')
+
+    typed = Projection(
+        columns={'title': 'title', 'created_at': 'created'},
+        relations={'author': Relation('users', columns='author_id', projection=user)},
+        types=['Post', 'Node'],
+    )
+    result = typed.project(fake_info(query))
+    assert result.columns == ('title', 'author_id')
+    assert result.relations['author'].columns == ('id', 'name', 'email')
@@ -0,0 +1,65 @@
+from enum import Enum
+
+from graphql import build_schema, graphql_sync
+
+from gql import Registry, make_schema, query
+from gql.enum import register_enums
+from gql.resolver import register_field_resolvers
+from gql.scalar import Upload, register_scalars
+
+type_defs = """
+scalar Upload
+
+enum Color {
+    RED
+}
+
+type Query {
+    hello: String!
+    color: Color!
+}
+"""
+
+
+def make_registry(greeting: str) -> Registry:
+    registry = Registry()
+
+    @registry.query
+    def hello(parent, info):
+        return greeting
+
+    @registry.query('color')
+    def resolve_color(parent, info):
+        return 'red'
+
+    @registry.enum_type
+    class Color(Enum):
+        RED = 'red'
+
+    return registry
+
+
+def test_registries_are_independent():
+    first = make_schema(type_defs, registry=make_registry('first'))
+    second = make_schema(type_defs, registry=make_registry('second'))
+
+    assert graphql_sync(first, '{ hello color }').data == {'hello': 'first', 'color': 'RED'}
+    assert graphql_sync(second, '{ hello }').data == {'hello': 'second'}
+    # builtin scalars are in every registry
+    assert first.get_type('Upload').serialize is Upload.serialize
+
+
+def test_register_functions_use_default_registry():
+    @query('registryDefaultHello')
+    def registry_default_hello(parent, info):
+        return 'default'
+
+    schema = build_schema('type Query { registryDefaultHello: String! }')
+    register_scalars(schema)
+    register_enums(schema)
+    assert schema.query_type.fields['registryDefaultHello'].resolve is None
+
+    register_field_resolvers(schema)
+    assert graphql_sync(schema, '{ registryDefaultHello }').data == {
+        'registryDefaultHello': 'default'
+    }
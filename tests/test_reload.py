@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from gql.reload import SchemaManager
+from gql.schema_loader import SchemaLoadError
+
+
+def write(path, content):
+    path.write_text(content)
+    # make the change visible on file systems with a coarse mtime resolution
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_schema_manager(tmp_path):
+    query = tmp_path / 'query.graphql'
+    user = tmp_path / 'user.graphql'
+    write(query, 'type Query { version: String }')
+    write(user, 'type User { id: ID! }\nextend type Query { me: User }')
+
+    manager = SchemaManager(tmp_path)
+    schema = manager.schema
+    swapped = []
+    manager.add_listener(swapped.append)
+    assert set(schema.query_type.fields) == {'version', 'me'}
+    assert not manager.check()
+
+    # touched without change
+    write(user, user.read_text())
+    assert not manager.check()
+
+    user_document = manager.files[user].type_defs.document
+    write(query, 'type Query { version: String, reloaded: Boolean }')
+    assert manager.check()
+    assert manager.schema is not schema and swapped == [manager.schema]
+    assert set(manager.schema.query_type.fields) == {'version', 'reloaded', 'me'}
+    assert set(schema.query_type.fields) == {'version', 'me'}
+    assert manager.files[user].type_defs.document is user_document
+
+    write(query, 'type Query {')
+    assert not manager.check()
+    assert isinstance(manager.error, SchemaLoadError)
+    assert 'reloaded' in manager.schema.query_type.fields
+
+    user.unlink()
+    write(query, 'type Query { version: String }')
+    assert manager.check()
+    assert manager.error is None
+    assert set(manager.schema.query_type.fields) == {'version'}
+
+
+def test_schema_manager_invalid(tmp_path):
+    (tmp_path / 'query.graphql').write_text('extend type Query { me: String }')
+    with pytest.raises(TypeError):
+        SchemaManager(tmp_path)
@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from math import isnan
+
+from graphql import graphql_sync
+
+from gql import ExecutionContext, Registry, make_schema
+from gql.scalar import JSONString, Timestamp
+
+type_defs = """
+scalar Timestamp
+scalar JSONString
+
+type Query {
+    points(after: [Timestamp!]): [Timestamp!]!
+    optionalPoints: [Timestamp]
+    documents: [JSONString!]!
+}
+"""
+
+start = datetime(2021, 1, 1, tzinfo=timezone.utc)
+
+
+def make_points_schema(points):
+    registry = Registry()
+    arguments = []
+
+    @registry.query('points')
+    def resolve_points(parent, info, after=None):
+        arguments.append(after)
+        return points
+
+    registry.field_resolver('Query', 'optional_points')(lambda parent, info: points)
+    registry.field_resolver('Query', 'documents')(lambda parent, info: [{'a': 'é'}, '[]', 1])
+    return make_schema(type_defs, registry=registry), arguments
+
+
+def test_serialize_many():
+    schema, arguments = make_points_schema([start, 1609459200001, start])
+
+    result = graphql_sync(
+        schema,
+        'query Points($after: [Timestamp!]) { points(after: $after) documents }',
+        variable_values={'after': [1609459200000]},
+        execution_context_class=ExecutionContext,
+    )
+    assert result.data == {
+        'points': [1609459200000, 1609459200001, 1609459200000],
+        'documents': ['{"a":"é"}', '[]', '1'],
+    }
+    assert arguments == [[start]]
+    assert schema.get_type('Timestamp').serialize_many is Timestamp.serialize_many
+
+
+def test_serialize_many_falls_back_to_items():
+    schema, _ = make_points_schema([start, None])
+
+    result = graphql_sync(schema, '{ optionalPoints }', execution_context_class=ExecutionContext)
+    assert result.data == {'optionalPoints': [1609459200000, None]}
+
+    result = graphql_sync(schema, '{ points }', execution_context_class=ExecutionContext)
+    assert result.errors[0].path == ['points', 1]
+
+
+def test_json_string_values_beyond_the_codec():
+    assert JSONString.serialize({'a': 2 ** 70}) == '{"a":1180591620717411303424}'
+    assert isnan(JSONString.parse_value('{"a": NaN}')['a'])
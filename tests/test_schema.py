@@ -1,9 +1,74 @@
 from gql.schema import make_schema_from_path
+from gql.schema_loader import SchemaLoadError
 
 from pathlib import Path
 
+import pytest
+
 
 def test_make_schema_from_path():
     schema = make_schema_from_path(str(Path(__file__).parent / 'schema'))
     assert set(schema.query_type.fields.keys()) == {'me', 'addresses'}
     assert set(schema.mutation_type.fields.keys()) == {'createAddress'}
+
+
+def test_make_schema_from_path_with_cache(tmp_path):
+    path = str(Path(__file__).parent / 'hero.graphql')
+    schema = make_schema_from_path(path, federation=True, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.schema.pickle'))) == 1
+
+    cached = make_schema_from_path(path, federation=True, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.schema.pickle'))) == 1
+    assert set(cached.type_map) == set(schema.type_map)
+    assert cached.query_type.fields['_service'].resolve(None, None) == (
+        schema.query_type.fields['_service'].resolve(None, None)
+    )
+
+    make_schema_from_path(path, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.schema.pickle'))) == 2
+
+    for file in tmp_path.glob('*.schema.pickle'):
+        file.write_bytes(b'broken')
+    assert set(make_schema_from_path(path, cache_dir=tmp_path).type_map)
+
+
+def test_type_defs_are_parsed_once(monkeypatch):
+    from gql import gql, make_schema
+    from gql import utils
+
+    type_defs = [
+        gql('type Query { me: User }'),
+        gql('type User { id: ID! }'),
+        'extend type Query { version: String }',
+    ]
+    assert type_defs[0].document.definitions[0].name.value == 'Query'
+
+    calls = []
+    parse = utils.parse
+    monkeypatch.setattr(utils, 'parse', lambda *args: calls.append(args) or parse(*args))
+    schema = make_schema(type_defs, federation=True)
+    assert len(calls) == 1
+    assert set(schema.query_type.fields) == {'me', 'version', '_service'}
+
+
+def test_make_schema_from_path_recursive(tmp_path):
+    (tmp_path / 'users').mkdir()
+    (tmp_path / 'generated').mkdir()
+    (tmp_path / 'query.graphql').write_text('type Query { version: String }')
+    (tmp_path / 'users' / 'user.graphql').write_text('type User { id: ID! }')
+    (tmp_path / 'users' / 'query.graphql').write_text('extend type Query { me: User }')
+    (tmp_path / 'generated' / 'broken.graphql').write_text('type {')
+
+    schema = make_schema_from_path(
+        str(tmp_path), recursive=True, exclude=['generated/*'], workers=2
+    )
+    assert set(schema.query_type.fields) == {'version', 'me'}
+
+    (tmp_path / 'users' / 'broken.graphql').write_text('extend type {')
+    with pytest.raises(SchemaLoadError) as exc_info:
+        make_schema_from_path(str(tmp_path), recursive=True)
+    assert [Path(file).name for file, _ in exc_info.value.errors] == [
+        'broken.graphql',
+        'broken.graphql',
+    ]
+    assert 'generated' in exc_info.value.errors[0][0]
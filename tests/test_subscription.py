@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from gql import Registry, make_schema
+from gql.subscription import MemoryTransport, MessageType, SubscriptionServer
+
+type_defs = """
+type Query {
+    hello: String!
+}
+
+type Subscription {
+    count(to: Int!): Int!
+}
+"""
+
+closed = []
+
+
+async def count(parent, info, to):
+    try:
+        for i in range(to):
+            yield {'count': i}
+            await asyncio.sleep(0)
+    finally:
+        closed.append(to)
+
+
+registry = Registry()
+registry.subscribe('count')(count)
+schema = make_schema(type_defs, registry=registry)
+root_value = {'hello': 'world'}
+
+
+def run(test, **kwargs):
+    async def main():
+        server = SubscriptionServer(schema, root_value, **kwargs)
+        transport = MemoryTransport()
+        handler = asyncio.ensure_future(server.handle(transport.send, transport.receive))
+        try:
+            await asyncio.wait_for(test(transport), 1)
+        finally:
+            await transport.close()
+            await asyncio.wait_for(handler, 1)
+
+    asyncio.run(main())
+
+
+async def connect(transport, payload=None):
+    await transport.client_send(MessageType.GQL_CONNECTION_INIT, payload=payload)
+    assert await transport.client_receive() == {'type': 'connection_ack'}
+
+
+def test_query_and_subscription():
+    async def test(transport):
+        await connect(transport)
+        await transport.client_send(MessageType.GQL_START, '1', {'query': '{ hello }'})
+        assert await transport.client_receive() == {
+            'type': 'data',
+            'id': '1',
+            'payload': {'data': {'hello': 'world'}, 'errors': None},
+        }
+        assert await transport.client_receive() == {'type': 'complete', 'id': '1'}
+
+        query = 'subscription { count(to: 2) }'
+        await transport.client_send(MessageType.GQL_START, '2', {'query': query})
+        for i in range(2):
+            message = await transport.client_receive()
+            assert message['payload']['data'] == {'count': i}
+        assert await transport.client_receive() == {'type': 'complete', 'id': '2'}
+
+    run(test, keep_alive=None)
+
+
+def test_errors():
+    async def test(transport):
+        await transport.client_send(MessageType.GQL_START, '1', {'query': '{ hello }'})
+        message = await transport.client_receive()
+        assert message['type'] == 'error'
+
+        await connect(transport)
+        await transport.client_send(MessageType.GQL_START, '2', {'query': '{ nope }'})
+        message = await transport.client_receive()
+        assert message['type'] == 'error'
+        assert message['payload']['message'] == "Cannot query field 'nope' on type 'Query'."
+
+    run(test, keep_alive=None)
+
+
+def test_stop_and_disconnect_close_generators():
+    closed.clear()
+
+    async def test(transport):
+        await connect(transport)
+        for id_ in ('1', '2'):
+            query = 'subscription { count(to: %s) }' % (1000 + int(id_))
+            await transport.client_send(MessageType.GQL_START, id_, {'query': query})
+        await transport.client_receive()
+        await transport.client_send(MessageType.GQL_STOP, '1')
+        while 1001 not in closed:
+            await asyncio.sleep(0)
+
+    # two messages at most wait in the queue, the generators are suspended
+    run(test, keep_alive=None, queue_size=2)
+    assert sorted(closed) == [1001, 1002]
+
+
+def test_keep_alive_and_on_connect():
+    def on_connect(payload):
+        if payload.get('token') != 'secret':
+            raise Exception('Forbidden')
+        return {'token': payload['token']}
+
+    async def test(transport):
+        await transport.client_send(MessageType.GQL_CONNECTION_INIT, payload={'token': 'x'})
+        assert await transport.client_receive() == {
+            'type': 'connection_error',
+            'payload': {'message': 'Forbidden'},
+        }
+        await connect(transport, {'token': 'secret'})
+        assert await transport.client_receive() == {'type': 'ka'}
+        assert await transport.client_receive() == {'type': 'ka'}
+
+    run(test, keep_alive=0.01, on_connect=on_connect)
+
+
+def test_handle_raises_send_errors():
+    async def send(frame):
+        raise ConnectionError('closed')
+
+    async def main():
+        transport = MemoryTransport()
+        await transport.client_send(MessageType.GQL_CONNECTION_INIT)
+        await SubscriptionServer(schema).handle(send, transport.receive)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(main())
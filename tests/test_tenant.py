@@ -0,0 +1,95 @@
+from graphql import graphql_sync
+
+from gql import field_resolver, make_schema
+from gql.metrics import ResolverMetrics
+from gql.tenant import TenantSchemas, derive_schema
+
+type_defs = """
+type Query {
+    tenantHello: String!
+    tenantUser: TenantUser
+}
+
+type TenantUser {
+    id: ID!
+    tenantProfile: TenantProfile
+}
+
+type TenantProfile {
+    bio: String
+}
+
+type TenantOther {
+    name: String
+}
+"""
+
+
+@field_resolver('Query', 'tenant_hello')
+def tenant_hello(parent, info):
+    return 'hello'
+
+
+@field_resolver('Query', 'tenant_user')
+def tenant_user(parent, info):
+    return {'id': '1', 'tenantProfile': {'bio': 'bio'}}
+
+
+@field_resolver('Query', 'tenant_extra')
+def tenant_extra(parent, info):
+    return 'extra'
+
+
+@field_resolver('TenantProfile', 'website')
+def tenant_profile_website(parent, info):
+    return 'https://example.com'
+
+
+def test_derive_schema():
+    metrics = ResolverMetrics()
+    base = make_schema(type_defs, metrics=metrics)
+    base_hello = base.query_type.fields['tenantHello'].resolve
+
+    schema = derive_schema(
+        base,
+        [
+            'extend type TenantProfile { website: String }',
+            'extend type Query { tenantExtra: String }',
+        ],
+        metrics=metrics,
+    )
+    # unaffected types are shared, types referencing extended types are copied.
+    assert schema.get_type('TenantOther') is base.get_type('TenantOther')
+    assert schema.get_type('TenantProfile') is not base.get_type('TenantProfile')
+    assert schema.get_type('TenantUser') is not base.get_type('TenantUser')
+    assert schema.get_type('String') is base.get_type('String')
+    assert schema.query_type.fields['tenantHello'].resolve is base_hello
+    assert 'website' not in base.get_type('TenantProfile').fields
+
+    result = graphql_sync(
+        schema, '{ tenantHello tenantExtra tenantUser { tenantProfile { bio website } } }'
+    )
+    assert result.errors is None
+    assert result.data == {
+        'tenantHello': 'hello',
+        'tenantExtra': 'extra',
+        'tenantUser': {'tenantProfile': {'bio': 'bio', 'website': 'https://example.com'}},
+    }
+    assert metrics.get_stats('Query', 'tenantExtra').calls == 1
+
+    result = graphql_sync(base, '{ tenantHello }')
+    assert result.data == {'tenantHello': 'hello'}
+    assert metrics.get_stats('Query', 'tenantHello').calls == 2
+
+
+def test_tenant_schemas():
+    base = make_schema(type_defs)
+    tenants = TenantSchemas(base, {'a': 'type TenantExtra { id: ID }'})
+    assert tenants.get('b') is base
+    schema = tenants.get('a')
+    assert schema is tenants.get('a')
+    assert schema.get_type('TenantExtra') is not None
+    assert schema.query_type is base.query_type
+
+    tenants.invalidate('a')
+    assert tenants.get('a') is not schema